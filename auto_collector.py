@@ -8,7 +8,7 @@ import requests
 import json
 import time
 import schedule
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 
 # 로깅 설정
@@ -326,8 +326,8 @@ class AutoPaperCollector:
             "digital forensics": {"max_results": 5, "source": "arxiv"}
         }
     
-    def collect_papers_for_keyword(self, keyword, time_folder=None):
-        """특정 키워드로 논문 수집 및 PDF 다운로드"""
+    def collect_papers_for_keyword(self, keyword, time_folder=None, source=None):
+        """특정 키워드로 논문 수집 및 PDF 다운로드 (source: 설정 대신 검색할 소스)"""
         try:
             config = self.keyword_configs.get(keyword, {"max_results": 5, "source": "arxiv"})
             
@@ -336,48 +336,25 @@ class AutoPaperCollector:
             response = self.session.post(f"{self.server_url}/search_papers", json={
                 "query": keyword,
                 "max_results": config["max_results"],
-                "source": config["source"]
+                "source": source or config["source"],
+                "fields": ["url", "title", "source", "pdf_url"],  # 다운로드에 필요한 필드만 요청
+                "priority": "bulk",  # 자동 수집은 사용자 검색보다 뒤에 처리
+                "incremental": True  # 지난 수집 이후 새로 나온 논문만 요청
             }, timeout=60)
             
             if response.status_code == 200:
-                papers = response.json()
+                result = response.json()
+                papers = result['papers']
+                # 응답이 늦거나 실패한 소스 기록 (나머지 소스 결과는 그대로 사용)
+                for source_name, status in result['sources'].items():
+                    if status['status'] != 'ok':
+                        logging.warning(f"'{keyword}': {source_name} 검색 {status['status']} ({status.get('error', '')})")
+                    elif status.get('fetched'):
+                        logging.info(f"'{keyword}': {source_name} {status['fetched']}개 중 새 논문 {status['count']}개 "
+                                     f"(효율 {status['efficiency']:.0%})")
                 logging.info(f"'{keyword}': {len(papers)}개 논문 수집 완료")
                 
-                # 수집된 논문 정보 로깅 및 PDF 다운로드
-                downloaded_count = 0
-                skipped_long_papers = 0
-                
-                for i, paper in enumerate(papers, 1):
-                    logging.info(f"  {i}. {paper['title']} ({paper['source']})")
-                    
-                    # PDF 다운로드 시도
-                    if paper.get('pdf_url'):
-                        try:
-                            download_response = self.session.post(f"{self.server_url}/download_paper", 
-                                                                params={"paper_url": paper['url'], "time_folder": time_folder}, timeout=60)
-                            
-                            if download_response.status_code == 200:
-                                result = download_response.json()
-                                if result.get('success'):
-                                    logging.info(f"    📥 PDF 다운로드 완료: {result.get('filename', 'N/A')}")
-                                    downloaded_count += 1
-                                else:
-                                    error_msg = result.get('error', 'Unknown error')
-                                    if 'too long' in error_msg.lower():
-                                        logging.info(f"    ⏭️ 페이지 수 초과로 건너뜀: {error_msg}")
-                                        skipped_long_papers += 1
-                                    else:
-                                        logging.warning(f"    ❌ PDF 다운로드 실패: {error_msg}")
-                            else:
-                                logging.warning(f"    ❌ PDF 다운로드 요청 실패: {download_response.status_code}")
-                                
-                        except Exception as e:
-                            logging.warning(f"    ❌ PDF 다운로드 오류: {e}")
-                    
-                    # 다운로드 간 지연 (서버 부하 방지)
-                    time.sleep(1.5)
-                
-                logging.info(f"'{keyword}': {downloaded_count}개 PDF 다운로드 완료, {skipped_long_papers}개 페이지 수 초과로 건너뜀")
+                self.download_papers(keyword, papers, time_folder)
                 return papers
             else:
                 logging.error(f"'{keyword}' 검색 실패: {response.status_code}")
@@ -387,6 +364,98 @@ class AutoPaperCollector:
             logging.error(f"'{keyword}' 수집 중 오류: {e}")
             return []
     
+    def collect_arxiv_batch(self, keywords, time_folder=None):
+        """
+        여러 키워드의 arXiv 논문을 일괄 검색으로 수집 및 PDF 다운로드
+        - 키워드를 OR 검색어 몇 개로 묶어 요청하므로 키워드마다 검색하는 것보다 arXiv 요청이 훨씬 적음
+        - 반환: 키워드 -> 수집된 논문 목록 (실패하면 None)
+        """
+        try:
+            logging.info(f"arXiv 일괄 검색 시작: {len(keywords)}개 키워드...")
+            response = self.session.post(f"{self.server_url}/search_papers/batch", json={
+                "queries": {keyword: self.keyword_configs.get(keyword, {"max_results": 5})["max_results"] for keyword in keywords},
+                "source": "arxiv",
+                "fields": ["url", "title", "source", "pdf_url"],  # 다운로드에 필요한 필드만 요청
+                "priority": "bulk",
+                "incremental": True
+            }, timeout=1800)
+            
+            if response.status_code != 200:
+                logging.error(f"arXiv 일괄 검색 실패: {response.status_code} {response.text}")
+                return None
+            
+            result = response.json()
+            status = result['status']
+            logging.info(f"arXiv 일괄 검색 완료: 요청 {status['requests']}번, 결과 {status['fetched']}개 "
+                         f"(키워드 미분류 {status['unmatched']}개)")
+            
+            for keyword, papers in result['results'].items():
+                logging.info(f"'{keyword}': arXiv {len(papers)}개 논문 수집 완료")
+                self.download_papers(keyword, papers, time_folder)
+            return result['results']
+            
+        except Exception as e:
+            logging.error(f"arXiv 일괄 검색 중 오류: {e}")
+            return None
+    
+    def download_papers(self, keyword, papers, time_folder=None):
+        """수집된 논문 정보 로깅 및 PDF 다운로드"""
+        downloaded_count = 0
+        skipped_long_papers = 0
+        
+        for i, paper in enumerate(papers, 1):
+            logging.info(f"  {i}. {paper['title']} ({paper['source']})")
+            
+            # PDF 다운로드 시도
+            if paper.get('pdf_url'):
+                try:
+                    download_response = self.session.post(f"{self.server_url}/download_paper", 
+                                                        params={"paper_url": paper['url'], "time_folder": time_folder}, timeout=60)
+                    
+                    if download_response.status_code == 200:
+                        result = download_response.json()
+                        if result.get('success'):
+                            logging.info(f"    📥 PDF 다운로드 완료: {result.get('filename', 'N/A')}")
+                            downloaded_count += 1
+                        else:
+                            error_msg = result.get('error', 'Unknown error')
+                            if 'too long' in error_msg.lower():
+                                logging.info(f"    ⏭️ 페이지 수 초과로 건너뜀: {error_msg}")
+                                skipped_long_papers += 1
+                            else:
+                                logging.warning(f"    ❌ PDF 다운로드 실패: {error_msg}")
+                    else:
+                        logging.warning(f"    ❌ PDF 다운로드 요청 실패: {download_response.status_code}")
+                        
+                except Exception as e:
+                    logging.warning(f"    ❌ PDF 다운로드 오류: {e}")
+            
+            # 다운로드 간 지연 (서버 부하 방지)
+            time.sleep(1.5)
+        
+        logging.info(f"'{keyword}': {downloaded_count}개 PDF 다운로드 완료, {skipped_long_papers}개 페이지 수 초과로 건너뜀")
+    
+    def harvest_arxiv_categories(self):
+        """설정 파일의 arXiv 카테고리 전체 수집 (PDF는 다운로드하지 않음), 새 논문 수 반환"""
+        try:
+            logging.info("arXiv 카테고리 전체 수집 시작 (OAI-PMH)...")
+            response = self.session.post(f"{self.server_url}/harvest/arxiv", json={}, timeout=3600)
+            
+            if response.status_code != 200:
+                logging.error(f"arXiv 카테고리 수집 실패: {response.status_code} {response.text}")
+                return 0
+            
+            added = 0
+            for set_spec, result in response.json().items():
+                logging.info(f"  {set_spec}: {result['from']} ~ {result['until']}, "
+                             f"요청 {result['requests']}번, {result['matched']}개 중 새 논문 {result['added']}개")
+                added += result['added']
+            return added
+            
+        except Exception as e:
+            logging.error(f"arXiv 카테고리 수집 중 오류: {e}")
+            return 0
+    
     def daily_collection(self):
         """매일 실행할 논문 수집 작업"""
         # 실행 시간 기준 폴더 생성
@@ -412,13 +481,35 @@ class AutoPaperCollector:
         total_downloaded = 0
         total_skipped = 0
         
-        for i, keyword in enumerate(self.keywords, 1):
-            logging.info(f"진행률: {i}/{len(self.keywords)} - '{keyword}' 처리 중...")
-            papers = self.collect_papers_for_keyword(keyword, time_folder)
+        # 설정된 arXiv 카테고리는 OAI-PMH로 한 번에 수집 (지난 수집 이후 새 논문 전체)
+        total_collected += self.harvest_arxiv_categories()
+        
+        # arXiv는 키워드를 OR로 묶어 한꺼번에 검색 (키워드마다 요청하지 않음)
+        arxiv_keywords = [
+            keyword for keyword in self.keywords
+            if self.keyword_configs.get(keyword, {"source": "arxiv"})["source"] in ("arxiv", "all")
+        ]
+        batch_results = self.collect_arxiv_batch(arxiv_keywords, time_folder) if arxiv_keywords else {}
+        if batch_results is None:
+            batch_results = {}  # 일괄 검색 실패 시 키워드별 검색으로 대체
+        total_collected += len({paper['url'] for papers in batch_results.values() for paper in papers})
+        
+        # 나머지 소스(PubMed)는 키워드별로 검색
+        remaining = []
+        for keyword in self.keywords:
+            source = self.keyword_configs.get(keyword, {"source": "arxiv"})["source"]
+            if keyword not in batch_results:
+                remaining.append((keyword, None))
+            elif source == "all":
+                remaining.append((keyword, "pubmed"))
+        
+        for i, (keyword, source) in enumerate(remaining, 1):
+            logging.info(f"진행률: {i}/{len(remaining)} - '{keyword}' 처리 중...")
+            papers = self.collect_papers_for_keyword(keyword, time_folder, source)
             total_collected += len(papers)
             
             # 키워드 간 지연 시간 (서버 부하 방지)
-            if i < len(self.keywords):  # 마지막 키워드가 아니면 지연
+            if i < len(remaining):  # 마지막 키워드가 아니면 지연
                 time.sleep(3)
         
         logging.info("=" * 60)
@@ -434,76 +525,51 @@ class AutoPaperCollector:
             logging.info(f"주간 요약 생성 시작 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             logging.info("=" * 60)
             
-            response = self.session.get(f"{self.server_url}/papers?limit=200")
+            # 최근 7일 통계를 서버에서 SQL로 집계 (일별 집계 테이블 사용)
+            response = self.session.get(
+                f"{self.server_url}/stats",
+                params={'days': 7, 'title_terms': ','.join(self.keywords)}
+            )
             
             if response.status_code == 200:
-                papers = response.json()
-                
-                # 최근 7일간 수집된 논문 필터링
-                week_ago = datetime.now() - timedelta(days=7)
-                
-                recent_papers = []
-                for paper in papers:
-                    try:
-                        # 날짜 파싱 개선
-                        created_at = paper['created_at']
-                        logging.info(f"파싱 중인 날짜: {created_at}")
-                        
-                        # 다양한 날짜 형식 처리
-                        if 'T' in created_at:
-                            # ISO 형식: 2025-07-23T08:15:12
-                            paper_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        elif ' ' in created_at:
-                            # SQL 형식: 2025-07-23 08:15:12
-                            paper_date = datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S')
-                        else:
-                            # 날짜만: 2025-07-23
-                            paper_date = datetime.strptime(created_at, '%Y-%m-%d')
-                        
-                        logging.info(f"파싱된 날짜: {paper_date}, 기준일: {week_ago}")
-                        
-                        if paper_date > week_ago:
-                            recent_papers.append(paper)
-                            logging.info(f"최근 논문 추가: {paper['title'][:50]}...")
-                    except Exception as e:
-                        logging.error(f"날짜 파싱 오류: {paper.get('created_at', 'N/A')} - {e}")
-                        continue
+                stats = response.json()
                 
                 # 1. 기본 통계
-                logging.info(f"📊 주간 요약: 최근 7일간 {len(recent_papers)}개 논문 수집")
+                logging.info(f"📊 주간 요약: 최근 7일간 {stats['total']}개 논문 수집")
                 
                 # 2. 소스별 통계
-                source_stats = {}
-                for paper in recent_papers:
-                    source = paper['source']
-                    source_stats[source] = source_stats.get(source, 0) + 1
-                
                 logging.info("📈 소스별 통계:")
-                for source, count in source_stats.items():
-                    logging.info(f"  📚 {source}: {count}개")
+                for source, counts in stats['by_source'].items():
+                    logging.info(f"  📚 {source}: {counts['papers']}개")
                 
                 # 3. 키워드별 통계 (제목에서 키워드 매칭)
-                keyword_stats = {}
-                for paper in recent_papers:
-                    title_lower = paper['title'].lower()
-                    for keyword in self.keywords:
-                        if keyword.lower() in title_lower:
-                            keyword_stats[keyword] = keyword_stats.get(keyword, 0) + 1
+                keyword_stats = {keyword: count for keyword, count in stats['title_terms'].items() if count > 0}
                 
                 logging.info("🔍 키워드별 통계:")
                 for keyword, count in keyword_stats.items():
                     logging.info(f"  🏷️ {keyword}: {count}개")
                 
                 # 4. PDF 다운로드 통계
-                pdf_downloaded = sum(1 for paper in recent_papers if paper.get('file_path'))
-                pdf_total = len(recent_papers)
+                pdf_downloaded = stats['with_pdf']
+                pdf_total = stats['total']
                 pdf_rate = (pdf_downloaded / pdf_total * 100) if pdf_total > 0 else 0
                 
                 logging.info(f"📥 PDF 다운로드: {pdf_downloaded}/{pdf_total}개 ({pdf_rate:.1f}%)")
                 
                 # 5. 최근 논문 목록 (상위 10개)
+                recent_response = self.session.get(
+                    f"{self.server_url}/papers",
+                    params={'limit': 10, 'fields': 'title,authors,source,file_path,created_at'}
+                )
+                recent_papers = []
+                if recent_response.status_code == 200:
+                    recent_papers = [
+                        paper for paper in recent_response.json()['papers']
+                        if paper['created_at'][:10] >= stats['since']
+                    ]
+                
                 logging.info("📋 최근 수집된 논문 (상위 10개):")
-                for i, paper in enumerate(recent_papers[:10], 1):
+                for i, paper in enumerate(recent_papers, 1):
                     pdf_status = "✅" if paper.get('file_path') else "❌"
                     logging.info(f"  {i}. {pdf_status} {paper['title']}")
                     logging.info(f"     👥 저자: {', '.join(paper['authors'][:3])}{'...' if len(paper['authors']) > 3 else ''}")
@@ -512,15 +578,9 @@ class AutoPaperCollector:
                     logging.info("")
                 
                 # 6. 일별 수집 통계
-                daily_stats = {}
-                for paper in recent_papers:
-                    date = paper['created_at'][:10]  # YYYY-MM-DD
-                    daily_stats[date] = daily_stats.get(date, 0) + 1
-                
                 logging.info("📅 일별 수집 통계:")
-                for date in sorted(daily_stats.keys()):
-                    count = daily_stats[date]
-                    logging.info(f"  📆 {date}: {count}개")
+                for day in stats['by_day']:
+                    logging.info(f"  📆 {day['day']}: {day['papers']}개")
                 
                 # 7. 추천 키워드 (수집이 적은 키워드)
                 logging.info("💡 추천 사항:")
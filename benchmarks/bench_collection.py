@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+수집기 처리량/지연 벤치마크 (외부 네트워크 없이 가짜 외부 API 서버 사용)
+로컬 포트에 server/fake_upstream.py를 띄우고, 수집기의 검색을 동시에 실행해
+초당 검색 수와 검색 한 번의 지연 분위수(p50/p95/p99)를 측정합니다.
+
+--fixtures를 주면 기록해 둔 응답을 재생하고(config/settings.json의 http.upstream_mode를
+"record"로 두고 수집하면 기록됨), 주지 않으면 합성한 응답을 사용합니다.
+가짜 서버는 path 매칭으로 동작하므로 검색어가 기록과 달라도 같은 경로의 응답을 돌려줍니다.
+
+사용법: python benchmarks/bench_collection.py [--source arxiv] [--searches 200] [--concurrency 16]
+                                            [--latency-ms 100 --jitter-ms 50 --error-rate 0.02 --seed 1]
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import uvicorn
+
+from server.fake_upstream import create_app
+from tools.arxiv_collector import ArxivCollector
+from tools.pubmed_collector import PubMedCollector
+from tools.rate_limiter import PriorityRateLimiter
+from tools.upstream_fixtures import FixtureStore, RecordingTransport, UpstreamRedirectTransport
+
+
+def synthetic_upstream(papers: int):
+    """arXiv/PubMed 검색 응답을 흉내 내는 MockTransport 처리기 (응답마다 논문 papers개)"""
+    entries = ''.join(
+        f"<entry><id>http://arxiv.org/abs/2401.{i:05d}v1</id><title>Synthetic paper {i}</title>"
+        f"<summary>{'lorem ipsum ' * 80}</summary><published>2024-01-01T00:00:00Z</published>"
+        f"<author><name>Author {i}</name></author><link title=\"pdf\" href=\"http://arxiv.org/pdf/2401.{i:05d}v1\"/></entry>"
+        for i in range(papers)
+    )
+    feed = (f'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f'<opensearch:totalResults>{papers}</opensearch:totalResults>{entries}</feed>')
+    articles = ''.join(
+        f"<PubmedArticle><MedlineCitation><PMID>{30000000 + i}</PMID><Article><ArticleTitle>Synthetic paper {i}</ArticleTitle>"
+        f"<Abstract><AbstractText>{'lorem ipsum ' * 80}</AbstractText></Abstract></Article></MedlineCitation>"
+        f"<PubmedData><ArticleIdList><ArticleId IdType=\"pubmed\">{30000000 + i}</ArticleId>"
+        f"<ArticleId IdType=\"doi\">10.5555/synthetic.{i}</ArticleId></ArticleIdList></PubmedData></PubmedArticle>"
+        for i in range(papers)
+    )
+
+    def handler(request):
+        if 'esearch' in request.url.path:
+            return httpx.Response(200, text=f"<eSearchResult><Count>{papers}</Count><QueryKey>1</QueryKey><WebEnv>W</WebEnv></eSearchResult>")
+        if 'efetch' in request.url.path:
+            return httpx.Response(200, text=f"<PubmedArticleSet>{articles}</PubmedArticleSet>")
+        return httpx.Response(200, text=feed)
+    return handler
+
+
+async def record_synthetic_fixtures(directory: str, papers: int):
+    """합성 응답을 기록 계층으로 저장 (실제 기록과 같은 형식)"""
+    transport = RecordingTransport(httpx.MockTransport(synthetic_upstream(papers)), FixtureStore(directory))
+    async with httpx.AsyncClient(transport=transport) as client:
+        scheduler = PriorityRateLimiter("bench-record", rate=1000, burst=100)
+        await ArxivCollector(num_retries=0, client=client, scheduler=scheduler).search("synthetic", papers)
+        await PubMedCollector(client=client, scheduler=scheduler).search("synthetic", papers)
+
+
+def start_fake_server(app) -> tuple:
+    """가짜 서버를 빈 포트에서 백그라운드 스레드로 실행하고 (server, base_url) 반환"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='error'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_searches(collector, searches: int, concurrency: int, max_results: int):
+    """검색을 동시에 실행하고 (걸린 시간, 검색별 지연 목록, 받은 논문 수, 실패 수) 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    totals = {'papers': 0, 'failed': 0}
+
+    async def search(i):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                papers = await collector.search(f"benchmark query {i}", max_results)
+                totals['papers'] += len(papers)
+                if not papers:
+                    totals['failed'] += 1
+            except Exception:
+                totals['failed'] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(search(i) for i in range(searches)))
+    return time.perf_counter() - start, latencies, totals['papers'], totals['failed']
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default='arxiv', choices=['arxiv', 'pubmed'])
+    parser.add_argument('--fixtures', default=None, help="기록된 응답 디렉터리 (없으면 합성 응답)")
+    parser.add_argument('--searches', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--max-results', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate', type=float, default=None, help="가짜 서버의 호스트별 초당 요청 한도")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = args.fixtures
+        if fixtures is None:
+            fixtures = str(Path(tmp) / "fixtures")
+            await record_synthetic_fixtures(fixtures, args.max_results)
+
+        app = create_app(FixtureStore(fixtures, match='path'), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                         rate=args.rate, error_rate=args.error_rate, seed=args.seed)
+        server, base_url = start_fake_server(app)
+        try:
+            transport = UpstreamRedirectTransport(httpx.AsyncHTTPTransport(), base_url)
+            async with httpx.AsyncClient(transport=transport) as client:
+                # 요청 한도는 가짜 서버가 흉내 내므로 수집기 쪽 제한기는 사실상 끔
+                scheduler = PriorityRateLimiter("bench", rate=100000, burst=1000)
+                if args.source == 'arxiv':
+                    collector = ArxivCollector(num_retries=0, client=client, scheduler=scheduler)
+                else:
+                    collector = PubMedCollector(client=client, scheduler=scheduler)
+                elapsed, latencies, papers, failed = await run_searches(
+                    collector, args.searches, args.concurrency, args.max_results)
+            async with httpx.AsyncClient() as client:
+                stats = (await client.get(f"{base_url}/_fake/stats")).json()
+        finally:
+            server.should_exit = True
+
+    print(f"{args.source} 검색 {args.searches}회, 동시성 {args.concurrency}, "
+          f"가짜 서버 지연 {args.latency_ms:.0f}+0~{args.jitter_ms:.0f}ms, 오류율 {args.error_rate}")
+    print(f"  처리량 {args.searches / elapsed:8.1f} searches/s  ({papers / elapsed:.1f} papers/s, 실패 {failed}회)")
+    print(f"  지연   p50 {percentile(latencies, 0.5) * 1000:7.1f}ms  p95 {percentile(latencies, 0.95) * 1000:7.1f}ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:7.1f}ms  평균 {statistics.mean(latencies) * 1000:7.1f}ms")
+    print(f"  가짜 서버 {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
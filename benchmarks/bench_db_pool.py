@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+PaperDatabase 연결 풀 벤치마크
+요청마다 연결을 새로 여는 방식(이전)과 연결 풀 + WAL(이후)의
+/papers, /papers/{id} 초당 처리량을 비교합니다.
+
+사용법: python benchmarks/bench_db_pool.py [--papers 20000] [--requests 2000] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+import server.main as server_main
+from database.paper_db import PaperDatabase
+
+
+class PerCallConnectionDatabase(PaperDatabase):
+    """이전 동작 재현: 호출마다 기본 설정 연결을 열고 닫음"""
+
+    @contextmanager
+    def _write_conn(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _read_conn(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def make_papers(count: int):
+    """벤치마크용 가짜 논문 생성"""
+    return [
+        {
+            'title': f"Benchmark paper {i}",
+            'authors': [f"Author {i % 97}", f"Author {i % 89}"],
+            'abstract': "lorem ipsum " * 40,
+            'url': f"http://arxiv.org/abs/bench.{i:06d}",
+            'pdf_url': f"http://arxiv.org/pdf/bench.{i:06d}",
+            'published_date': '2024-01-01',
+            'keywords': [],
+            'source': 'arxiv'
+        }
+        for i in range(count)
+    ]
+
+
+async def run_requests(client: httpx.AsyncClient, paths, concurrency: int) -> float:
+    """경로 목록을 동시에 요청하고 초당 처리량 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(path):
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(path) for path in paths))
+    return len(paths) / (time.perf_counter() - start)
+
+
+async def bench(db: PaperDatabase, paper_count: int, request_count: int, concurrency: int):
+    """한 가지 데이터베이스 구현에 대한 엔드포인트별 처리량 측정"""
+    server_main.paper_db = db
+    transport = httpx.ASGITransport(app=server_main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        list_paths = [f"/papers?limit=50&offset={random.randrange(0, 500)}" for _ in range(request_count)]
+        detail_paths = [f"/papers/{random.randint(1, paper_count)}" for _ in range(request_count)]
+
+        return {
+            '/papers': await run_requests(client, list_paths, concurrency),
+            '/papers/{id}': await run_requests(client, detail_paths, concurrency),
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--papers', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+
+        pooled = PaperDatabase(db_path)
+        await pooled.add_papers(make_papers(args.papers))
+
+        results = {}
+        results['before'] = await bench(PerCallConnectionDatabase(db_path), args.papers, args.requests, args.concurrency)
+        results['after'] = await bench(pooled, args.papers, args.requests, args.concurrency)
+        pooled.close()
+
+    print(f"논문 {args.papers}개, 요청 {args.requests}개, 동시성 {args.concurrency}")
+    for endpoint in ('/papers', '/papers/{id}'):
+        before = results['before'][endpoint]
+        after = results['after'][endpoint]
+        print(f"  {endpoint:14s} 이전 {before:8.1f} req/s  이후 {after:8.1f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
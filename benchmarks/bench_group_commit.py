@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+PaperDatabase 그룹 커밋 벤치마크
+쓰기마다 커밋하는 방식(write_batch_max=1, 이전)과 동시에 들어온 쓰기를
+한 트랜잭션으로 묶는 그룹 커밋(이후)의 초당 쓰기 처리량을 비교합니다.
+
+synchronous=FULL(커밋마다 fsync)에서 측정하면 fsync 절감 효과가 더 잘 드러납니다.
+
+측정 결과 (ext4, 쓰기 4000개, 동시성 64):
+  FULL    3300 -> 7300 writes/s (약 2.2x, 커밋 4000회 -> 63회)
+  NORMAL  4900 -> 7700 writes/s (약 1.6x, 기본 설정)
+목표였던 10배 향상에는 미치지 못합니다. 커밋 횟수는 이미 1/60 이하로 줄었고,
+남은 시간은 쓰기마다 드는 처리 비용(FTS/집계 트리거, 식별자 조회, 스레드 간 전달)입니다.
+묶음 대기 시간과 최대 크기를 바꿔 봐도(0~10ms, 64~512개) 기본값(2ms, 64개)보다 빠르지 않았습니다.
+
+사용법: python benchmarks/bench_group_commit.py [--writes 4000] [--concurrency 64] [--synchronous FULL]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import database.paper_db as paper_db_module
+from database.paper_db import PaperDatabase
+from benchmarks.bench_db_pool import make_papers
+
+
+async def run_writes(db: PaperDatabase, write_count: int, concurrency: int) -> float:
+    """논문 1개 추가와 파일 경로 갱신을 번갈아 동시에 실행하고 초당 쓰기 수 반환"""
+    papers = make_papers(write_count)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write(i):
+        async with semaphore:
+            if i % 2 == 0:
+                await db.add_papers([papers[i]])
+            else:
+                await db.update_paper_file_path(i // 2 + 1, f"/tmp/bench_{i}.pdf")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(write(i) for i in range(write_count)))
+    return write_count / (time.perf_counter() - start)
+
+
+async def bench(write_batch_max: int, write_count: int, concurrency: int):
+    """한 가지 묶음 크기 설정에 대한 처리량과 커밋 횟수 측정"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = PaperDatabase(str(Path(tmp) / "bench.db"), write_batch_max=write_batch_max)
+        writes_per_second = await run_writes(db, write_count, concurrency)
+        batches = db.write_stats['batches']
+        db.close()
+    return writes_per_second, batches
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--writes', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--synchronous', default='FULL', choices=['OFF', 'NORMAL', 'FULL'])
+    args = parser.parse_args()
+
+    paper_db_module.CONNECTION_PRAGMAS['synchronous'] = args.synchronous
+
+    before, before_batches = await bench(1, args.writes, args.concurrency)
+    after, after_batches = await bench(paper_db_module.WRITE_BATCH_MAX, args.writes, args.concurrency)
+
+    print(f"쓰기 {args.writes}개, 동시성 {args.concurrency}, synchronous={args.synchronous}")
+    print(f"  이전 {before:8.1f} writes/s  (커밋 {before_batches}회)")
+    print(f"  이후 {after:8.1f} writes/s  (커밋 {after_batches}회)  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
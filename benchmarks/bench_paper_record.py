@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+PaperRecord 마이크로 벤치마크
+논문 정보를 dict로 다루던 방식(이전)과 PaperRecord(__slots__, 이후)의
+생성 시간, 메모리 사용량, SQLite 행 변환, JSON 직렬화 시간을 비교합니다.
+
+사용법: python benchmarks/bench_paper_record.py [--count 100000]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.paper_db import PAPER_FIELDS
+from database.paper_record import PaperRecord, papers_to_json
+
+
+def make_fields(i: int) -> dict:
+    """수집기가 만드는 것과 같은 모양의 논문 필드"""
+    return {
+        'title': f"Benchmark paper {i}",
+        'authors': [f"Author {i % 97}", f"Author {i % 89}"],
+        'abstract': "lorem ipsum " * 40,
+        'url': f"http://arxiv.org/abs/bench.{i:06d}",
+        'pdf_url': f"http://arxiv.org/pdf/bench.{i:06d}",
+        'published_date': '2024-01-01',
+        'keywords': [],
+        'source': 'arxiv',
+    }
+
+
+def make_record(i: int) -> PaperRecord:
+    """make_fields와 같은 논문을 PaperRecord로 직접 생성"""
+    return PaperRecord(
+        title=f"Benchmark paper {i}",
+        authors=[f"Author {i % 97}", f"Author {i % 89}"],
+        abstract="lorem ipsum " * 40,
+        url=f"http://arxiv.org/abs/bench.{i:06d}",
+        pdf_url=f"http://arxiv.org/pdf/bench.{i:06d}",
+        published_date='2024-01-01',
+        keywords=[],
+        source='arxiv',
+    )
+
+
+def make_rows(count: int):
+    """SELECT {PAPER_COLUMNS} 결과와 같은 모양의 행"""
+    return [
+        (i, f"Benchmark paper {i}", json.dumps([f"Author {i % 97}", f"Author {i % 89}"]), "lorem ipsum " * 40,
+         f"http://arxiv.org/abs/bench.{i:06d}", f"http://arxiv.org/pdf/bench.{i:06d}", '2024-01-01', '[]', 'arxiv',
+         None, '2024-01-02 00:00:00', f"bench.{i:06d}", None, None)
+        for i in range(count)
+    ]
+
+
+def measure(build):
+    """build() 실행 시간(초)과 결과가 차지하는 메모리(MB) 측정 (tracemalloc이 시간을 늘리므로 따로 실행)"""
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = build()
+    memory = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, memory
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def report(label: str, before: float, after: float, unit: str):
+    print(f"  {label:<14} 이전 {before:8.3f}{unit}  이후 {after:8.3f}{unit}  ({before / after:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.count)
+
+    # 수집기 결과 생성 (dict vs PaperRecord)
+    dicts, dict_time, dict_memory = measure(lambda: [make_fields(i) for i in range(args.count)])
+    records, record_time, record_memory = measure(lambda: [make_record(i) for i in range(args.count)])
+
+    # 데이터베이스 행 변환 (authors/keywords를 바로 디코딩하는 dict vs 지연 디코딩 PaperRecord)
+    def rows_to_dicts():
+        papers = []
+        for row in rows:
+            paper = dict(zip(PAPER_FIELDS, row))
+            paper['authors'] = json.loads(paper['authors'])
+            paper['keywords'] = json.loads(paper['keywords'])
+            papers.append(paper)
+        return papers
+
+    row_dicts, row_dict_time, row_dict_memory = measure(rows_to_dicts)
+    row_records, row_record_time, row_record_memory = measure(
+        lambda: [PaperRecord.from_row(PAPER_FIELDS, row) for row in rows])
+
+    # 행 → JSON 응답 (디코딩 후 json.dumps vs 저장된 JSON을 재사용하는 papers_to_json)
+    dumps_time = timed(lambda: json.dumps(rows_to_dicts(), ensure_ascii=False))
+    to_json_time = timed(lambda: papers_to_json([PaperRecord.from_row(PAPER_FIELDS, row) for row in rows]))
+
+    print(f"논문 {args.count}개")
+    report("생성 시간", dict_time, record_time, "s ")
+    report("생성 메모리", dict_memory, record_memory, "MB")
+    report("행 변환 시간", row_dict_time, row_record_time, "s ")
+    report("행 변환 메모리", row_dict_memory, row_record_memory, "MB")
+    report("행 → JSON", dumps_time, to_json_time, "s ")
+
+    del dicts, records, row_dicts, row_records
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,14 @@ async def check_database():
     db = PaperDatabase()
     
     try:
-        # 전체 논문 수 확인
-        papers = await db.get_papers(limit=1000)
-        print(f"총 저장된 논문 수: {len(papers)}")
+        # 전체 통계 (일별 집계 테이블에서 SQL로 집계)
+        stats = await db.get_stats()
+        print(f"총 저장된 논문 수: {stats['total']}")
         
-        if papers:
+        if stats['total']:
+            papers = await db.get_papers(limit=5)
             print("\n📄 최근 저장된 논문들:")
-            for i, paper in enumerate(papers[:5], 1):
+            for i, paper in enumerate(papers, 1):
                 print(f"  {i}. {paper['title']}")
                 print(f"     URL: {paper['url']}")
                 print(f"     소스: {paper['source']}")
@@ -34,14 +35,9 @@ async def check_database():
                 print()
             
             # 소스별 통계
-            source_stats = {}
-            for paper in papers:
-                source = paper['source']
-                source_stats[source] = source_stats.get(source, 0) + 1
-            
             print("📊 소스별 통계:")
-            for source, count in source_stats.items():
-                print(f"  {source}: {count}개")
+            for source, counts in stats['by_source'].items():
+                print(f"  {source}: {counts['papers']}개 (PDF {counts['with_pdf']}개)")
         else:
             print("❌ 데이터베이스에 논문이 없습니다.")
             
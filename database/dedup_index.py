@@ -0,0 +1,58 @@
+import threading
+import logging
+from typing import Dict, Iterable
+
+from database.identifiers import dedup_key
+
+logger = logging.getLogger(__name__)
+
+# 이미 저장된 논문을 메모리에 보관하는 중복 확인 인덱스
+class DedupIndex:
+    def __init__(self):
+        """
+        - 서버 시작 시 데이터베이스의 URL로 한 번 채움 (warm)
+        - 논문 추가/삭제 때마다 PaperDatabase가 갱신
+        - URL 대신 정규 키(arXiv ID, PMID)로 보관해서 버전/URL 형식이 달라도 같은 논문으로 취급
+        - arXiv는 저장된 버전을 함께 보관해서 더 새로운 버전만 새 논문으로 통과시킴
+          (버전 없이 저장된 논문, 예: OAI-PMH 대량 수집 결과는 모든 버전을 저장된 것으로 취급)
+        - 조회는 O(1) 딕셔너리 연산
+        """
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.warmed = False
+
+    def _update(self, urls: Iterable[str]):
+        for url in urls:
+            key, version = dedup_key(url)
+            if version >= self._versions.get(key, -1):
+                self._versions[key] = version
+
+    def warm(self, urls: Iterable[str]):
+        """데이터베이스의 전체 URL로 인덱스 채우기"""
+        with self._lock:
+            self._update(urls)
+            self.warmed = True
+        logger.info(f"Dedup index warmed with {len(self._versions)} papers")
+
+    def add(self, urls: Iterable[str]):
+        """새로 저장된(또는 새 버전으로 갱신된) 논문 URL 추가"""
+        with self._lock:
+            self._update(urls)
+
+    def discard(self, url: str):
+        """삭제된 논문 URL 제거"""
+        with self._lock:
+            self._versions.pop(dedup_key(url)[0], None)
+
+    def is_known(self, url: str) -> bool:
+        """이미 저장된 논문인지 확인 (수집기에 넘기는 멤버십 함수)"""
+        key, version = dedup_key(url)
+        stored = self._versions.get(key)
+        # 버전 0: 버전을 모르는 URL로 저장됨 (새 버전은 대량 수집의 갱신 레코드로 반영됨)
+        return stored is not None and (stored == 0 or stored >= version)
+
+    def __contains__(self, url: str) -> bool:
+        return self.is_known(url)
+
+    def __len__(self) -> int:
+        return len(self._versions)
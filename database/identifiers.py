@@ -0,0 +1,84 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# 논문 식별자(arXiv ID, PMID, DOI) 정규화 도구
+
+ARXIV_PREFIX_PATTERN = re.compile(r'^(?:https?://(?:export\.)?arxiv\.org/(?:abs|pdf)/|arxiv:)', re.IGNORECASE)
+ARXIV_ID_PATTERN = re.compile(r'(?P<id>\d{4}\.\d{4,5}|[a-z\-]+(?:\.[a-z]{2})?/\d{7})(?:v(?P<version>\d+))?', re.IGNORECASE)
+PMID_PREFIX_PATTERN = re.compile(r'^(?:https?://pubmed\.ncbi\.nlm\.nih\.gov/|pmid:\s*)', re.IGNORECASE)
+DOI_PREFIX_PATTERN = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+DOI_PATTERN = re.compile(r'10\.\d{4,9}/\S+')
+
+ARXIV_ABS_PREFIXES = ("http://arxiv.org/abs/", "https://arxiv.org/abs/")
+PUBMED_URL_FORMAT = "https://pubmed.ncbi.nlm.nih.gov/{}/"
+DOI_URL_FORMAT = "https://doi.org/{}"
+
+
+def normalize_arxiv_id(value: str) -> Optional[str]:
+    """arXiv ID 또는 URL에서 버전을 뺀 ID 추출 (예: 2401.01234v2 -> 2401.01234)"""
+    if not value:
+        return None
+    value = ARXIV_PREFIX_PATTERN.sub('', value.strip())
+    if value.lower().endswith('.pdf'):
+        value = value[:-4]
+    match = ARXIV_ID_PATTERN.fullmatch(value)
+    return match.group('id') if match else None
+
+
+def normalize_pmid(value: str) -> Optional[str]:
+    """PMID 또는 PubMed URL에서 숫자 PMID 추출"""
+    if not value:
+        return None
+    value = PMID_PREFIX_PATTERN.sub('', str(value).strip()).rstrip('/')
+    if not value.isdigit() or not value.lstrip('0'):
+        return None
+    return value.lstrip('0')
+
+
+def normalize_doi(value: str) -> Optional[str]:
+    """DOI 또는 doi.org URL에서 DOI 추출 (DOI는 대소문자를 구분하지 않으므로 소문자로 통일)"""
+    if not value:
+        return None
+    value = DOI_PREFIX_PATTERN.sub('', value.strip())
+    if not DOI_PATTERN.fullmatch(value):
+        return None
+    return value.rstrip('.').lower()
+
+
+def arxiv_abs_urls(arxiv_id: str) -> List[str]:
+    """버전 없는 arXiv ID에 해당하는 abs URL 접두어 목록"""
+    return [prefix + arxiv_id for prefix in ARXIV_ABS_PREFIXES]
+
+
+def arxiv_version(value: str) -> int:
+    """arXiv ID 또는 URL의 버전 번호 (버전이 없으면 0)"""
+    if not value:
+        return 0
+    value = ARXIV_PREFIX_PATTERN.sub('', value.strip())
+    if value.lower().endswith('.pdf'):
+        value = value[:-4]
+    match = ARXIV_ID_PATTERN.fullmatch(value)
+    return int(match.group('version')) if match and match.group('version') else 0
+
+
+def paper_identifiers(paper: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """논문 정보에서 정규화된 (arxiv_id, pmid, doi) 추출"""
+    url = paper.get('url')
+    doi = paper.get('doi') or paper.get('pdf_url')
+    return normalize_arxiv_id(url), normalize_pmid(url), normalize_doi(doi) if doi else None
+
+
+def dedup_key(url: str) -> Tuple[str, int]:
+    """
+    중복 확인용 (정규 키, 버전)
+    - arXiv: 'arxiv:<버전 없는 ID>'와 버전 번호
+    - PubMed: 'pmid:<PMID>'
+    - 그 외: URL 그대로
+    """
+    arxiv_id = normalize_arxiv_id(url)
+    if arxiv_id:
+        return f"arxiv:{arxiv_id}", arxiv_version(url)
+    pmid = normalize_pmid(url)
+    if pmid:
+        return f"pmid:{pmid}", 0
+    return url, 0
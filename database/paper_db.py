@@ -1,72 +1,671 @@
 import sqlite3
 import asyncio
+import base64
 import json
 import os
-from typing import List, Optional
-from datetime import datetime
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
 import logging
 
+from database.dedup_index import DedupIndex
+from database.paper_record import PaperRecord, papers_to_json
+from database.identifiers import (
+    arxiv_version, normalize_arxiv_id, normalize_doi, normalize_pmid, paper_identifiers
+)
+
 logger = logging.getLogger(__name__)
 
+# 논문 조회 시 읽는 컬럼
+PAPER_FIELDS = (
+    'id', 'title', 'authors', 'abstract', 'url', 'pdf_url', 'published_date', 'keywords', 'source', 'file_path', 'created_at',
+    'arxiv_id', 'pmid', 'doi'
+)
+PAPER_COLUMNS = ', '.join(PAPER_FIELDS)
+PAPER_COLUMNS_QUALIFIED = ', '.join(f"p.{field}" for field in PAPER_FIELDS)
+
+# 목록 조회 정렬 키 (created_at, id)와 필터 조합별 인덱스
+LISTING_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_papers_created ON papers(created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_papers_source_created ON papers(source, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_papers_published_date ON papers(published_date)",
+    "CREATE INDEX IF NOT EXISTS idx_papers_with_pdf_created ON papers(created_at, id) WHERE file_path IS NOT NULL",
+]
+
+# 저자/키워드 정규화 테이블 (papers.authors, papers.keywords JSON과 같은 내용)
+LINK_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS authors (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS paper_authors (
+        paper_id INTEGER NOT NULL,
+        author_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (paper_id, author_id)
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_paper_authors_author ON paper_authors(author_id, paper_id)",
+    '''
+    CREATE TABLE IF NOT EXISTS keywords (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS paper_keywords (
+        paper_id INTEGER NOT NULL,
+        keyword_id INTEGER NOT NULL,
+        PRIMARY KEY (paper_id, keyword_id)
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_paper_keywords_keyword ON paper_keywords(keyword_id, paper_id)",
+    # 논문 삭제 시 연결 행도 함께 삭제
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_links_delete AFTER DELETE ON papers BEGIN
+        DELETE FROM paper_authors WHERE paper_id = old.id;
+        DELETE FROM paper_keywords WHERE paper_id = old.id;
+    END
+    ''',
+]
+
+# 정규화된 논문 식별자 컬럼 (버전/소스가 달라도 같은 논문이면 하나만 저장)
+IDENTIFIER_COLUMNS = ('arxiv_id', 'pmid', 'doi')
+IDENTIFIER_INDEXES = [
+    f"CREATE UNIQUE INDEX IF NOT EXISTS idx_papers_{column} ON papers({column}) WHERE {column} IS NOT NULL"
+    for column in IDENTIFIER_COLUMNS
+]
+
+# 일별 집계 테이블 (날짜 x 소스별 논문 수, PDF 다운로드 수)
+# - 트리거로 논문 추가/삭제/수정 때마다 증분 갱신되므로 통계 조회는 날짜 수만큼의 행만 읽음
+ROLLUP_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS paper_daily_stats (
+        day TEXT NOT NULL,
+        source TEXT NOT NULL,
+        papers INTEGER NOT NULL DEFAULT 0,
+        with_pdf INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, source)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_stats_insert AFTER INSERT ON papers BEGIN
+        INSERT INTO paper_daily_stats(day, source, papers, with_pdf)
+        VALUES (date(new.created_at), new.source, 1, new.file_path IS NOT NULL)
+        ON CONFLICT(day, source) DO UPDATE SET
+            papers = papers + 1,
+            with_pdf = with_pdf + excluded.with_pdf;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_stats_delete AFTER DELETE ON papers BEGIN
+        UPDATE paper_daily_stats
+        SET papers = papers - 1, with_pdf = with_pdf - (old.file_path IS NOT NULL)
+        WHERE day = date(old.created_at) AND source = old.source;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_stats_update AFTER UPDATE OF file_path, source, created_at ON papers BEGIN
+        UPDATE paper_daily_stats
+        SET papers = papers - 1, with_pdf = with_pdf - (old.file_path IS NOT NULL)
+        WHERE day = date(old.created_at) AND source = old.source;
+        INSERT INTO paper_daily_stats(day, source, papers, with_pdf)
+        VALUES (date(new.created_at), new.source, 1, new.file_path IS NOT NULL)
+        ON CONFLICT(day, source) DO UPDATE SET
+            papers = papers + 1,
+            with_pdf = with_pdf + excluded.with_pdf;
+    END
+    ''',
+]
+
+# 대량 수집(OAI-PMH 등) 진행 상황
+# - resumption_token이 있으면 [from_date, until_date] 구간을 수집하는 중 (다음 페이지 토큰)
+# - 없으면 until_date까지 수집 완료, 다음 수집은 until_date부터 시작
+HARVEST_CHECKPOINT_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS harvest_checkpoints (
+        name TEXT PRIMARY KEY,
+        from_date TEXT,
+        until_date TEXT NOT NULL,
+        resumption_token TEXT,
+        records INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+HARVEST_CHECKPOINT_FIELDS = ('name', 'from_date', 'until_date', 'resumption_token', 'records', 'updated_at')
+
+# 검색어별 증분 수집 기준 (소스 x 정규화된 검색어)
+# - newest_date: 지금까지 본 가장 최신 발행/제출일, newest_id: 가장 큰 ID (PMID 등)
+# - updated_at: 기준이 마지막으로 전진한 수집 시각 (UTC)
+QUERY_WATERMARK_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS query_watermarks (
+        source TEXT NOT NULL,
+        query TEXT NOT NULL,
+        newest_date TEXT,
+        newest_id TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source, query)
+    ) WITHOUT ROWID
+'''
+
+# 검색어별 수집 효율 (소스 x 정규화된 검색어)
+# - fetched/kept: 누적 읽은 결과 수 / 그중 새 논문 수
+# - duplicate_ratio: 이미 저장된 논문 비율의 지수 이동 평균 (다음 검색의 요청 크기 결정에 사용)
+QUERY_FETCH_STATS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS query_fetch_stats (
+        source TEXT NOT NULL,
+        query TEXT NOT NULL,
+        searches INTEGER NOT NULL DEFAULT 0,
+        fetched INTEGER NOT NULL DEFAULT 0,
+        kept INTEGER NOT NULL DEFAULT 0,
+        duplicate_ratio REAL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source, query)
+    ) WITHOUT ROWID
+'''
+QUERY_FETCH_STATS_FIELDS = ('searches', 'fetched', 'kept', 'duplicate_ratio', 'updated_at')
+# 중복 비율 이동 평균에서 최근 검색의 가중치
+DUPLICATE_RATIO_SMOOTHING = 0.3
+
+ROLLUP_BACKFILL_SQL = '''
+    INSERT INTO paper_daily_stats(day, source, papers, with_pdf)
+    SELECT date(created_at), source, COUNT(*), COUNT(file_path)
+    FROM papers
+    GROUP BY date(created_at), source
+'''
+
+# {paper_filter}에 해당하는 논문의 JSON 배열을 정규화 테이블로 옮기는 SQL
+# 저자 이름은 앞뒤 공백만 제거, 키워드는 소문자로 통일
+LINK_AUTHORS_SQL = [
+    '''
+    INSERT INTO authors (name)
+    SELECT DISTINCT trim(j.value) FROM papers p, json_each(p.authors) j
+    WHERE {paper_filter} AND j.type = 'text' AND trim(j.value) != ''
+    ON CONFLICT DO NOTHING
+    ''',
+    '''
+    INSERT INTO paper_authors (paper_id, author_id, position)
+    SELECT p.id, a.id, MIN(j.key) FROM papers p, json_each(p.authors) j
+    JOIN authors a ON a.name = trim(j.value)
+    WHERE {paper_filter} AND j.type = 'text'
+    GROUP BY p.id, a.id
+    ON CONFLICT DO NOTHING
+    ''',
+    '''
+    INSERT INTO keywords (name)
+    SELECT DISTINCT lower(trim(j.value)) FROM papers p, json_each(p.keywords) j
+    WHERE {paper_filter} AND p.keywords IS NOT NULL AND j.type = 'text' AND trim(j.value) != ''
+    ON CONFLICT DO NOTHING
+    ''',
+    '''
+    INSERT INTO paper_keywords (paper_id, keyword_id)
+    SELECT DISTINCT p.id, k.id FROM papers p, json_each(p.keywords) j
+    JOIN keywords k ON k.name = lower(trim(j.value))
+    WHERE {paper_filter} AND p.keywords IS NOT NULL AND j.type = 'text'
+    ON CONFLICT DO NOTHING
+    ''',
+]
+
+# 저자/키워드 이름으로 논문 조회
+LINKED_BY_AUTHOR_SQL = f'''
+    SELECT {PAPER_COLUMNS_QUALIFIED}
+    FROM authors a
+    JOIN paper_authors pa ON pa.author_id = a.id
+    JOIN papers p ON p.id = pa.paper_id
+    WHERE a.name = ?
+    ORDER BY p.created_at DESC, p.id DESC
+    LIMIT ? OFFSET ?
+'''
+LINKED_BY_KEYWORD_SQL = f'''
+    SELECT {PAPER_COLUMNS_QUALIFIED}
+    FROM keywords k
+    JOIN paper_keywords pk ON pk.keyword_id = k.id
+    JOIN papers p ON p.id = pk.paper_id
+    WHERE k.name = ?
+    ORDER BY p.created_at DESC, p.id DESC
+    LIMIT ? OFFSET ?
+'''
+
+# 연결마다 적용할 PRAGMA (WAL 모드에서 읽기와 쓰기가 서로 막지 않도록)
+CONNECTION_PRAGMAS = {
+    'synchronous': 'NORMAL',      # WAL에서는 NORMAL로도 커밋 내구성이 충분함
+    'mmap_size': 268435456,       # 256MB 메모리 매핑 읽기
+    'cache_size': -65536,         # 64MB 페이지 캐시 (음수는 KiB 단위)
+    'busy_timeout': 5000,         # 잠금 대기 5초
+    'temp_store': 'MEMORY',
+}
+
+# 전문 검색 인덱스 (papers 테이블을 외부 콘텐츠로 사용하는 FTS5)
+FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+        title, abstract, authors, keywords,
+        content='papers', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    # papers 변경 시 인덱스를 자동으로 동기화하는 트리거
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, title, abstract, authors, keywords)
+        VALUES (new.id, new.title, new.abstract, new.authors, new.keywords);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors, keywords)
+        VALUES ('delete', old.id, old.title, old.abstract, old.authors, old.keywords);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF title, abstract, authors, keywords ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors, keywords)
+        VALUES ('delete', old.id, old.title, old.abstract, old.authors, old.keywords);
+        INSERT INTO papers_fts(rowid, title, abstract, authors, keywords)
+        VALUES (new.id, new.title, new.abstract, new.authors, new.keywords);
+    END
+    ''',
+]
+
+# BM25 컬럼 가중치 (title, abstract, authors, keywords)
+FTS_BM25_WEIGHTS = (10.0, 1.0, 3.0, 5.0)
+
+FTS_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 그룹 커밋 설정: 동시에 들어온 쓰기를 최대 WRITE_BATCH_MAX개까지 한 트랜잭션으로 묶음
+WRITE_BATCH_WINDOW_SECONDS = 0.002
+WRITE_BATCH_MAX = 64
+
+# add_papers 일괄 삽입 설정
+ADD_PAPERS_BATCH_SIZE = 500
+INSERT_COLUMN_COUNT = 11
+INSERT_ROW_PLACEHOLDER = '(' + ','.join('?' * INSERT_COLUMN_COUNT) + ')'
+
 # SQLite 데이터베이스로 논문 정보 관리
 class PaperDatabase:
-    def __init__(self, db_path: str = "papers.db"):
+    def __init__(self, db_path: str = "papers.db", reader_pool_size: int = 4,
+                 write_batch_window: float = WRITE_BATCH_WINDOW_SECONDS, write_batch_max: int = WRITE_BATCH_MAX):
+        """
+        - 쓰기 전용 연결 1개와 읽기 전용 연결 풀을 재사용
+        - 요청마다 연결을 열고 닫지 않음
+        - 모든 SQLite 호출은 전용 스레드에서 실행되어 이벤트 루프를 막지 않음
+        - 동시에 들어온 쓰기는 write_batch_window초 동안 최대 write_batch_max개까지
+          모아서 한 번에 커밋 (그룹 커밋)
+        """
         self.db_path = db_path
+        self.reader_pool_size = max(1, reader_pool_size)
+        self.write_batch_window = max(0.0, write_batch_window)
+        self.write_batch_max = max(1, write_batch_max)
+        self.write_stats = {'batches': 0, 'operations': 0}
+        self.fts_enabled = False
+        self.dedup_index = DedupIndex()
+        
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        
+        # 읽기는 풀 크기만큼 병렬 실행
+        self._read_executor = ThreadPoolExecutor(max_workers=self.reader_pool_size, thread_name_prefix="paper-db-read")
+        
         self.init_database()
+        
+        # 쓰기는 전용 스레드가 큐에서 꺼내 묶음 단위로 커밋
+        self._write_queue: "queue.Queue" = queue.Queue()
+        self._write_queue_lock = threading.Lock()
+        self._write_closed = False
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="paper-db-write", daemon=True)
+        self._writer_thread.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """PRAGMA가 적용된 새 연결 생성"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for name, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    @contextmanager
+    def _write_conn(self):
+        """
+        쓰기 연결 사용
+        - 하나의 쓰기 연결을 잠금으로 보호
+        - 시작할 때 쓰기 잠금을 잡고(BEGIN IMMEDIATE) 정상 종료 시 커밋, 예외 발생 시 롤백
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+                self._writer.execute("PRAGMA journal_mode = WAL")
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
+    
+    @contextmanager
+    def _read_conn(self):
+        """
+        읽기 연결 사용
+        - 풀에 남은 연결이 없으면 최대 reader_pool_size개까지 새로 생성
+        - 한도에 도달하면 반환될 때까지 대기
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = self._reader_count < self.reader_pool_size
+                if create:
+                    self._reader_count += 1
+            conn = self._connect() if create else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    async def _run_read(self, func, *args):
+        """읽기 작업을 읽기 스레드 풀에서 실행하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, func, *args)
+    
+    async def _run_write(self, func, *args):
+        """
+        쓰기 작업을 쓰기 큐에 넣고 결과를 기다림
+        - func(conn, *args)는 쓰기 스레드에서 다른 쓰기들과 같은 트랜잭션 안에서 실행
+        - 묶음이 커밋된 뒤에야 결과가 돌아옴
+        """
+        future = Future()
+        with self._write_queue_lock:
+            if self._write_closed:
+                raise RuntimeError("PaperDatabase is closed")
+            self._write_queue.put((func, args, future))
+        return await asyncio.wrap_future(future)
+    
+    def _writer_loop(self):
+        """쓰기 스레드: 큐에 쌓인 쓰기들을 묶어서 하나의 트랜잭션으로 커밋"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.write_batch_window
+            while len(batch) < self.write_batch_max:
+                try:
+                    # 이미 쌓여 있는 쓰기는 바로, 나머지는 남은 대기 시간 동안 기다림
+                    remaining = deadline - time.monotonic()
+                    item = self._write_queue.get(timeout=remaining) if remaining > 0 else self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            self._commit_write_batch(batch)
+            if stop:
+                return
+    
+    def _commit_write_batch(self, batch: list):
+        """
+        쓰기 묶음 실행
+        - 각 작업은 SAVEPOINT로 감싸서 하나가 실패해도 나머지는 커밋
+        - 커밋이 끝난 뒤 각 호출자에게 결과 전달
+        """
+        results = []
+        try:
+            with self._write_conn() as conn:
+                for func, args, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute("SAVEPOINT write_op")
+                    try:
+                        results.append((future, func(conn, *args), None))
+                        conn.execute("RELEASE write_op")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_op")
+                        conn.execute("RELEASE write_op")
+                        results.append((future, None, e))
+        except Exception as e:
+            logger.error(f"Write batch of {len(batch)} operations failed: {e}")
+            # BEGIN IMMEDIATE 실패(SQLITE_BUSY 등)처럼 아직 시작하지 않은 작업도 포함해 모든 호출자에게 전달
+            for _, _, future in batch:
+                if not future.done() and (future.running() or future.set_running_or_notify_cancel()):
+                    future.set_exception(e)
+            return
+        
+        self.write_stats['batches'] += 1
+        self.write_stats['operations'] += len(results)
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    def close(self):
+        """작업 스레드를 정리하고 풀에 있는 모든 연결 닫기 (이후의 쓰기는 RuntimeError)"""
+        with self._write_queue_lock:
+            if self._write_closed:
+                return
+            self._write_closed = True
+            self._write_queue.put(None)
+        self._writer_thread.join()
+        self._read_executor.shutdown(wait=True)
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._pool_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
     
     def init_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS papers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                authors TEXT NOT NULL,
-                abstract TEXT,
-                url TEXT UNIQUE NOT NULL,
-                pdf_url TEXT,
-                published_date TEXT,
-                keywords TEXT,
-                source TEXT NOT NULL,
-                file_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._write_conn() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS papers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    authors TEXT NOT NULL,
+                    abstract TEXT,
+                    url TEXT UNIQUE NOT NULL,
+                    pdf_url TEXT,
+                    published_date TEXT,
+                    keywords TEXT,
+                    source TEXT NOT NULL,
+                    file_path TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    arxiv_id TEXT,
+                    pmid TEXT,
+                    doi TEXT
+                )
+            ''')
+            
+            self._init_identifier_columns(cursor)
+            
+            # 목록 조회(keyset 페이지네이션)와 필터용 인덱스
+            for statement in LISTING_INDEXES:
+                cursor.execute(statement)
+            
+            self._init_link_tables(cursor)
+            
+            self._init_rollup_tables(cursor)
+            
+            cursor.execute(HARVEST_CHECKPOINT_SCHEMA)
+            cursor.execute(QUERY_WATERMARK_SCHEMA)
+            cursor.execute(QUERY_FETCH_STATS_SCHEMA)
+            
+            self._init_search_index(cursor)
+        
         logger.info("Database initialized successfully")
     
-    async def add_papers(self, papers: List[dict]) -> List[dict]:
+    def _init_search_index(self, cursor: sqlite3.Cursor):
+        """
+        전문 검색 인덱스 생성
+        - FTS5를 지원하지 않는 SQLite에서는 LIKE 검색으로 대체
+        - 인덱스를 처음 만들 때 기존 논문을 한 번에 색인 (backfill)
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'")
+        existed = cursor.fetchone() is not None
+        
+        try:
+            for statement in FTS_SCHEMA:
+                cursor.execute(statement)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+            return
+        
+        self.fts_enabled = True
+        if not existed:
+            cursor.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+            logger.info("Full-text search index built for existing papers")
+    
+    def _init_link_tables(self, cursor: sqlite3.Cursor):
+        """
+        저자/키워드 정규화 테이블 생성
+        - 처음 만들 때 기존 논문의 JSON 데이터를 옮김 (migration)
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'paper_authors'")
+        existed = cursor.fetchone() is not None
+        
+        for statement in LINK_SCHEMA:
+            cursor.execute(statement)
+        
+        if not existed:
+            self._link_authors_keywords(cursor, "1")
+            logger.info("Author and keyword tables populated from existing papers")
+    
+    def _init_identifier_columns(self, cursor: sqlite3.Cursor):
+        """
+        arxiv_id/pmid/doi 컬럼과 UNIQUE 인덱스 생성
+        - 컬럼이 없던 데이터베이스는 기존 URL/DOI에서 식별자를 채움 (migration)
+        - 이미 중복 저장된 논문은 가장 먼저 저장된 행에만 식별자를 남김
+        """
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(papers)")}
+        missing = [column for column in IDENTIFIER_COLUMNS if column not in existing]
+        for column in missing:
+            cursor.execute(f"ALTER TABLE papers ADD COLUMN {column} TEXT")
+        
+        if missing:
+            # DOI 조회용이던 pdf_url 인덱스는 doi 컬럼으로 대체
+            cursor.execute("DROP INDEX IF EXISTS idx_papers_pdf_url")
+            
+            seen = set()
+            updates = []
+            for paper_id, url, pdf_url in cursor.execute("SELECT id, url, pdf_url FROM papers ORDER BY id").fetchall():
+                identifiers = []
+                for column, value in zip(IDENTIFIER_COLUMNS, paper_identifiers({'url': url, 'pdf_url': pdf_url})):
+                    if value is not None and (column, value) in seen:
+                        value = None
+                    seen.add((column, value))
+                    identifiers.append(value)
+                if any(identifiers):
+                    updates.append((*identifiers, paper_id))
+            cursor.executemany("UPDATE papers SET arxiv_id = ?, pmid = ?, doi = ? WHERE id = ?", updates)
+            logger.info(f"Identifier columns populated for {len(updates)} existing papers")
+        
+        for statement in IDENTIFIER_INDEXES:
+            cursor.execute(statement)
+    
+    def _init_rollup_tables(self, cursor: sqlite3.Cursor):
+        """
+        일별 집계 테이블 생성
+        - 처음 만들 때 기존 논문을 GROUP BY로 한 번에 집계 (backfill)
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'paper_daily_stats'")
+        existed = cursor.fetchone() is not None
+        
+        for statement in ROLLUP_SCHEMA:
+            cursor.execute(statement)
+        
+        if not existed:
+            cursor.execute(ROLLUP_BACKFILL_SQL)
+            logger.info("Daily statistics populated from existing papers")
+    
+    @staticmethod
+    def _link_authors_keywords(cursor, paper_filter: str, params: tuple = ()):
+        """paper_filter 조건의 논문들에 대해 저자/키워드 연결 행 생성"""
+        for statement in LINK_AUTHORS_SQL:
+            cursor.execute(statement.format(paper_filter=paper_filter), params)
+    
+    async def rebuild_search_index(self):
+        """전문 검색 인덱스를 papers 테이블 기준으로 다시 생성"""
+        if not self.fts_enabled:
+            return
+        await self._run_write(self._rebuild_search_index)
+        logger.info("Full-text search index rebuilt")
+    
+    def _rebuild_search_index(self, conn: sqlite3.Connection):
+        conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+    
+    async def add_papers(self, papers: List[dict], batch_size: Optional[int] = None,
+                         checkpoint: Optional[Dict[str, Any]] = None) -> List[dict]:
         """
         논문들을 데이터베이스에 추가
         - 새 논문들을 데이터베이스에 저장
-        - 중복 제거: URL 기준으로 이미 있는 논문은 제외
+        - 중복 제거: URL 또는 arXiv ID/PMID/DOI가 같은 논문은 제외
+        - 이미 저장된 arXiv 논문의 새 버전은 기존 행을 갱신하고 새 논문처럼 반환
+          (중복 확인 인덱스가 새 버전을 새 논문으로 통과시키므로 수집기의 개수와 맞춤)
+        - 반환: 저장(또는 갱신)된 논문, 입력 순서 유지
         - JSON 형태로 저자, 키워드 저장
+        - batch_size개씩 묶어 한 번의 트랜잭션에서 일괄 삽입
+        - checkpoint: 대량 수집 진행 상황 (save_harvest_checkpoint 인자), 논문과 같은 트랜잭션에 저장
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        added_papers, updated_papers = await self._run_write(
+            self._add_papers, papers, batch_size or ADD_PAPERS_BATCH_SIZE, checkpoint
+        )
         
-        added_papers = []
+        # 커밋이 끝난 뒤 중복 확인 인덱스 갱신
+        self.dedup_index.add(paper['url'] for paper in added_papers + updated_papers)
         
+        if updated_papers:
+            logger.info(f"Updated {len(updated_papers)} papers to newer versions")
+            order = {id(paper): index for index, paper in enumerate(papers)}
+            added_papers = sorted(added_papers + updated_papers, key=lambda paper: order[id(paper)])
+        logger.info(f"Added {len(added_papers)} new papers")
+        return added_papers
+    
+    def _add_papers(self, conn: sqlite3.Connection, papers: List[dict], batch_size: int = ADD_PAPERS_BATCH_SIZE,
+                    checkpoint: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], List[dict]]:
+        added_papers, updated_papers = [], []
+        for start in range(0, len(papers), batch_size):
+            added, updated = self._insert_batch(conn, papers[start:start + batch_size])
+            added_papers.extend(added)
+            updated_papers.extend(updated)
+        if checkpoint is not None:
+            self._save_harvest_checkpoint(conn, **checkpoint)
+        return added_papers, updated_papers
+    
+    def _insert_batch(self, conn: sqlite3.Connection, papers: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        논문 묶음 삽입
+        - URL/식별자 IN (...) 한 번으로 기존 논문 확인
+        - 새 버전의 arXiv 논문은 기존 행 갱신
+        - 여러 행 INSERT ... ON CONFLICT DO NOTHING RETURNING으로 새 ID 수집
+        """
+        # 입력 순서를 유지하면서 묶음 내부 중복 제거 (URL 또는 식별자 기준)
+        candidates = {}
+        batch_identifiers = set()
         for paper in papers:
             try:
-                # 중복 체크
-                cursor.execute("SELECT id FROM papers WHERE url = ?", (paper['url'],))
-                existing = cursor.fetchone()
-                
-                if existing:
-                    logger.info(f"Paper already exists: {paper['title']}")
-                    continue
-                
-                # 새 논문 추가
-                cursor.execute('''
-                    INSERT INTO papers (title, authors, abstract, url, pdf_url, published_date, keywords, source)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                identifiers = paper_identifiers(paper)
+                row = (
                     paper['title'],
                     json.dumps(paper['authors']),
                     paper['abstract'],
@@ -74,86 +673,513 @@ class PaperDatabase:
                     paper.get('pdf_url'),
                     paper.get('published_date'),
                     json.dumps(paper.get('keywords', [])),
-                    paper['source']
-                ))
-                
-                paper_id = cursor.lastrowid
-                paper['id'] = paper_id
-                added_papers.append(paper)
-                
+                    paper['source'],
+                    *identifiers
+                )
+                if None in (row[0], row[3], row[7]):
+                    raise ValueError("title, url and source are required")
             except Exception as e:
-                logger.error(f"Error adding paper {paper['title']}: {e}")
+                logger.error(f"Error adding paper {paper.get('title')}: {e}")
+                continue
+            keys = {(column, value) for column, value in zip(IDENTIFIER_COLUMNS, identifiers) if value}
+            if paper['url'] in candidates or keys & batch_identifiers:
                 continue
+            batch_identifiers.update(keys)
+            candidates[paper['url']] = (paper, row)
         
-        conn.commit()
-        conn.close()
+        if not candidates:
+            return [], []
         
-        logger.info(f"Added {len(added_papers)} new papers")
-        return added_papers
-    
-    async def get_papers(self, limit: int = 50, offset: int = 0) -> List[dict]:
-        """저장된 논문 목록 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # 중복 체크 (url 및 식별자 UNIQUE 인덱스)
+        values = [json.dumps(list(candidates))] + [
+            json.dumps([identifier for identifier in column_values if identifier])
+            for column_values in zip(*(row[8:] for _, row in candidates.values()))
+        ]
+        existing_urls = set()
+        existing_identifiers = {}
+        for paper_id, url, *identifiers in conn.execute(f'''
+            SELECT id, url, {', '.join(IDENTIFIER_COLUMNS)} FROM papers
+            WHERE url IN (SELECT value FROM json_each(?))
+               OR arxiv_id IN (SELECT value FROM json_each(?))
+               OR pmid IN (SELECT value FROM json_each(?))
+               OR doi IN (SELECT value FROM json_each(?))
+        ''', values):
+            existing_urls.add(url)
+            for column, value in zip(IDENTIFIER_COLUMNS, identifiers):
+                if value:
+                    existing_identifiers[(column, value)] = (paper_id, url)
         
-        cursor.execute('''
-            SELECT id, title, authors, abstract, url, pdf_url, published_date, keywords, source, file_path, created_at
-            FROM papers
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        ''', (limit, offset))
+        versioned = []
+        for url, (paper, row) in list(candidates.items()):
+            if url in existing_urls:
+                logger.info(f"Paper already exists: {paper['title']}")
+                del candidates[url]
+                continue
+            
+            matches = [
+                (column, existing_identifiers[(column, value)])
+                for column, value in zip(IDENTIFIER_COLUMNS, row[8:])
+                if value and (column, value) in existing_identifiers
+            ]
+            if not matches:
+                continue
+            
+            del candidates[url]
+            column, (paper_id, existing_url) = matches[0]
+            if column == 'arxiv_id' and arxiv_version(url) > arxiv_version(existing_url):
+                versioned.append((paper_id, paper, row))
+            else:
+                logger.info(f"Paper already exists (same {column}): {paper['title']}")
         
-        rows = cursor.fetchall()
-        papers = []
+        # 새 버전: 기존 행의 URL과 내용을 갱신 (PDF 다운로드 경로와 저장일은 유지)
+        updated_papers = []
+        for paper_id, paper, row in versioned:
+            conn.execute('''
+                UPDATE papers
+                SET title = ?, authors = ?, abstract = ?, url = ?, pdf_url = ?, published_date = ?, keywords = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (*row[:7], paper_id))
+            paper['id'] = paper_id
+            updated_papers.append(paper)
+            logger.info(f"Updated paper to newer version: {paper['url']}")
+        
+        if updated_papers:
+            ids = json.dumps([paper['id'] for paper in updated_papers])
+            conn.execute("DELETE FROM paper_authors WHERE paper_id IN (SELECT value FROM json_each(?))", (ids,))
+            conn.execute("DELETE FROM paper_keywords WHERE paper_id IN (SELECT value FROM json_each(?))", (ids,))
+            self._link_authors_keywords(conn, "p.id IN (SELECT value FROM json_each(?))", (ids,))
+        
+        if not candidates:
+            return [], updated_papers
         
-        for row in rows:
-            paper = {
-                'id': row[0],
-                'title': row[1],
-                'authors': json.loads(row[2]),
-                'abstract': row[3],
-                'url': row[4],
-                'pdf_url': row[5],
-                'published_date': row[6],
-                'keywords': json.loads(row[7]) if row[7] else [],
-                'source': row[8],
-                'file_path': row[9],
-                'created_at': row[10]
-            }
-            papers.append(paper)
-        
-        conn.close()
+        # 새 논문 추가 (SQLite 변수 개수 제한 안에서 여러 행을 한 문장으로)
+        new_ids = {}
+        entries = list(candidates.values())
+        rows_per_statement = max(1, conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // INSERT_COLUMN_COUNT)
+        for start in range(0, len(entries), rows_per_statement):
+            chunk = entries[start:start + rows_per_statement]
+            values = ','.join([INSERT_ROW_PLACEHOLDER] * len(chunk))
+            params = [value for _, row in chunk for value in row]
+            try:
+                cursor = conn.execute(f'''
+                    INSERT INTO papers (title, authors, abstract, url, pdf_url, published_date, keywords, source, arxiv_id, pmid, doi)
+                    VALUES {values}
+                    ON CONFLICT DO NOTHING
+                    RETURNING id, url
+                ''', params)
+                new_ids.update((url, paper_id) for paper_id, url in cursor.fetchall())
+            except sqlite3.Error as e:
+                # 문장 단위로 롤백되므로 한 행씩 다시 시도해 문제 있는 논문만 제외
+                logger.warning(f"Bulk insert failed, retrying row by row: {e}")
+                for paper, row in chunk:
+                    try:
+                        cursor = conn.execute(f'''
+                            INSERT INTO papers (title, authors, abstract, url, pdf_url, published_date, keywords, source, arxiv_id, pmid, doi)
+                            VALUES {INSERT_ROW_PLACEHOLDER}
+                            ON CONFLICT DO NOTHING
+                            RETURNING id, url
+                        ''', row)
+                        new_ids.update((url, paper_id) for paper_id, url in cursor.fetchall())
+                    except sqlite3.Error as row_error:
+                        logger.error(f"Error adding paper {paper['title']}: {row_error}")
+        
+        added_papers = []
+        for url, (paper, _) in candidates.items():
+            if url in new_ids:
+                paper['id'] = new_ids[url]
+                added_papers.append(paper)
+        
+        # 새 논문의 저자/키워드를 정규화 테이블에 연결 (같은 트랜잭션)
+        if new_ids:
+            ids = list(new_ids.values())
+            self._link_authors_keywords(conn, "p.id IN (SELECT value FROM json_each(?))", (json.dumps(ids),))
+        
+        return added_papers, updated_papers
+    
+    async def get_harvest_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """대량 수집 진행 상황 조회 (없으면 None)"""
+        return await self._run_read(self._get_harvest_checkpoint, name)
+    
+    def _get_harvest_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._read_conn() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(HARVEST_CHECKPOINT_FIELDS)} FROM harvest_checkpoints WHERE name = ?", (name,)
+            ).fetchone()
+        return dict(zip(HARVEST_CHECKPOINT_FIELDS, row)) if row else None
+    
+    async def save_harvest_checkpoint(self, name: str, from_date: Optional[str], until_date: str,
+                                      resumption_token: Optional[str] = None, records: int = 0):
+        """
+        대량 수집 진행 상황 저장
+        - resumption_token: 다음 페이지 토큰 (None이면 until_date까지 수집 완료)
+        - 논문과 함께 저장하려면 add_papers(checkpoint=...) 사용
+        """
+        await self._run_write(self._save_harvest_checkpoint, name, from_date, until_date, resumption_token, records)
+    
+    def _save_harvest_checkpoint(self, conn: sqlite3.Connection, name: str, from_date: Optional[str], until_date: str,
+                                 resumption_token: Optional[str] = None, records: int = 0):
+        conn.execute('''
+            INSERT INTO harvest_checkpoints (name, from_date, until_date, resumption_token, records, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(name) DO UPDATE SET
+                from_date = excluded.from_date,
+                until_date = excluded.until_date,
+                resumption_token = excluded.resumption_token,
+                records = excluded.records,
+                updated_at = excluded.updated_at
+        ''', (name, from_date, until_date, resumption_token, records))
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """증분 수집 기준의 검색어 키 (대소문자, 공백 차이 무시)"""
+        return ' '.join(query.lower().split())
+    
+    async def get_query_watermarks(self, query: str) -> Dict[str, Dict[str, Any]]:
+        """검색어의 소스별 증분 수집 기준 {source: {'newest_date', 'newest_id', 'updated_at'}}"""
+        return await self._run_read(self._get_query_watermarks, self.normalize_query(query))
+    
+    def _get_query_watermarks(self, query: str) -> Dict[str, Dict[str, Any]]:
+        with self._read_conn() as conn:
+            rows = conn.execute(
+                "SELECT source, newest_date, newest_id, updated_at FROM query_watermarks WHERE query = ?", (query,)
+            ).fetchall()
+        return {
+            source: {'newest_date': newest_date, 'newest_id': newest_id, 'updated_at': updated_at}
+            for source, newest_date, newest_id, updated_at in rows
+        }
+    
+    async def save_query_watermarks(self, query: str, watermarks: Dict[str, Dict[str, Any]]):
+        """
+        검색어의 소스별 증분 수집 기준 저장
+        - updated_at은 저장 시각, 수집기가 기준을 유지하려고 updated_at을 남겨 두었으면 그 값을 유지
+        - 검색 결과 논문을 저장한 뒤 호출 (저장 전에 실패하면 다음 수집에서 같은 구간을 다시 읽음)
+        """
+        if watermarks:
+            await self._run_write(self._save_query_watermarks, self.normalize_query(query), watermarks)
+    
+    def _save_query_watermarks(self, conn: sqlite3.Connection, query: str, watermarks: Dict[str, Dict[str, Any]]):
+        conn.executemany('''
+            INSERT INTO query_watermarks (source, query, newest_date, newest_id, updated_at)
+            VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ON CONFLICT(source, query) DO UPDATE SET
+                newest_date = excluded.newest_date,
+                newest_id = excluded.newest_id,
+                updated_at = excluded.updated_at
+        ''', [
+            (source, query, watermark.get('newest_date'), watermark.get('newest_id'), watermark.get('updated_at'))
+            for source, watermark in watermarks.items()
+        ])
+    
+    async def get_query_fetch_stats(self, query: str) -> Dict[str, Dict[str, Any]]:
+        """검색어의 소스별 수집 효율 {source: {'searches', 'fetched', 'kept', 'duplicate_ratio', 'updated_at'}}"""
+        return await self._run_read(self._get_query_fetch_stats, self.normalize_query(query))
+    
+    def _get_query_fetch_stats(self, query: str) -> Dict[str, Dict[str, Any]]:
+        with self._read_conn() as conn:
+            rows = conn.execute(
+                f"SELECT source, {', '.join(QUERY_FETCH_STATS_FIELDS)} FROM query_fetch_stats WHERE query = ?", (query,)
+            ).fetchall()
+        return {source: dict(zip(QUERY_FETCH_STATS_FIELDS, values)) for source, *values in rows}
+    
+    async def record_query_fetch_stats(self, query: str, results: Dict[str, Tuple[int, int]]):
+        """
+        검색 한 번의 소스별 (읽은 결과 수, 새 논문 수) 누적
+        - 중복 비율은 지수 이동 평균으로 갱신 (검색어가 오래될수록 높아지는 추세를 따라감)
+        - 읽은 결과가 없는 소스는 기록하지 않음
+        """
+        rows = [
+            (source, self.normalize_query(query), fetched, kept, (fetched - kept) / fetched)
+            for source, (fetched, kept) in results.items() if fetched > 0
+        ]
+        if rows:
+            await self._run_write(self._record_query_fetch_stats, rows)
+    
+    def _record_query_fetch_stats(self, conn: sqlite3.Connection, rows: List[tuple]):
+        conn.executemany(f'''
+            INSERT INTO query_fetch_stats (source, query, searches, fetched, kept, duplicate_ratio, updated_at)
+            VALUES (?, ?, 1, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(source, query) DO UPDATE SET
+                searches = searches + 1,
+                fetched = fetched + excluded.fetched,
+                kept = kept + excluded.kept,
+                duplicate_ratio = coalesce(
+                    duplicate_ratio + (excluded.duplicate_ratio - duplicate_ratio) * {DUPLICATE_RATIO_SMOOTHING},
+                    excluded.duplicate_ratio
+                ),
+                updated_at = excluded.updated_at
+        ''', rows)
+    
+    async def warm_dedup_index(self):
+        """저장된 모든 논문 URL로 중복 확인 인덱스 채우기 (서버 시작 시 한 번)"""
+        await self._run_read(self._warm_dedup_index)
+    
+    def _warm_dedup_index(self):
+        with self._read_conn() as conn:
+            self.dedup_index.warm(url for (url,) in conn.execute("SELECT url FROM papers"))
+    
+    async def get_papers(self, limit: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                         source: Optional[str] = None, published_from: Optional[str] = None,
+                         published_to: Optional[str] = None, has_pdf: Optional[bool] = None,
+                         fields: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        저장된 논문 목록 조회
+        - 최신순 (created_at, id) 정렬
+        - cursor를 주면 해당 위치 다음부터 조회 (keyset 페이지네이션)
+        - source, 발행일 범위, PDF 보유 여부로 필터링
+        - fields를 주면 해당 컬럼만 읽음 (id는 항상 포함)
+        """
+        papers, _ = await self._run_read(
+            self._get_papers, limit, offset, cursor, source, published_from, published_to, has_pdf, fields
+        )
         return papers
     
+    async def get_papers_page(self, limit: int = 50, cursor: Optional[str] = None,
+                              source: Optional[str] = None, published_from: Optional[str] = None,
+                              published_to: Optional[str] = None, has_pdf: Optional[bool] = None,
+                              offset: int = 0, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        논문 목록 한 페이지와 다음 페이지 cursor 반환
+        - next_cursor가 None이면 마지막 페이지
+        """
+        papers, next_cursor = await self._run_read(
+            self._get_papers, limit, offset, cursor, source, published_from, published_to, has_pdf, fields
+        )
+        return {'papers': papers, 'next_cursor': next_cursor}
+    
+    @staticmethod
+    def select_fields(fields: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+        """요청한 필드를 검증해 읽을 컬럼 목록 반환, 모르는 필드가 있으면 ValueError"""
+        if not fields:
+            return PAPER_FIELDS
+        fields = set(fields)
+        unknown = fields - set(PAPER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(field for field in PAPER_FIELDS if field == 'id' or field in fields)
+    
+    @staticmethod
+    def encode_cursor(created_at: str, paper_id: int) -> str:
+        """정렬 키를 불투명한 cursor 문자열로 변환"""
+        raw = json.dumps([created_at, paper_id], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """cursor 문자열을 (created_at, id)로 복원, 잘못된 값이면 ValueError"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            created_at, paper_id = json.loads(raw)
+            return str(created_at), int(paper_id)
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+    
+    def _get_papers(self, limit: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                    source: Optional[str] = None, published_from: Optional[str] = None,
+                    published_to: Optional[str] = None, has_pdf: Optional[bool] = None,
+                    fields: Optional[Iterable[str]] = None) -> Tuple[List[dict], Optional[str]]:
+        columns = self.select_fields(fields)
+        conditions = []
+        params = []
+        
+        if cursor:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(self.decode_cursor(cursor))
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if published_from:
+            conditions.append("published_date >= ?")
+            params.append(published_from)
+        if published_to:
+            conditions.append("published_date <= ?")
+            params.append(published_to)
+        if has_pdf is not None:
+            conditions.append("file_path IS NOT NULL" if has_pdf else "file_path IS NULL")
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        # 다음 페이지 존재 여부를 알기 위해 한 행 더 읽음
+        # 마지막 두 컬럼(created_at, id)은 cursor 계산용
+        with self._read_conn() as conn:
+            rows = conn.execute(f'''
+                SELECT {', '.join(columns)}, created_at, id
+                FROM papers
+                {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?
+            ''', (*params, limit + 1, offset)).fetchall()
+        
+        papers = self._rows_to_papers(rows[:limit], columns)
+        next_cursor = None
+        if len(rows) > limit and papers:
+            last = rows[limit - 1]
+            next_cursor = self.encode_cursor(last[-2], last[-1])
+        
+        return papers, next_cursor
+    
     async def get_paper_by_id(self, paper_id: int) -> Optional[dict]:
         """ID로 특정 논문 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return await self._run_read(self._get_paper_by_id, paper_id)
+    
+    def _get_paper_by_id(self, paper_id: int) -> Optional[dict]:
+        with self._read_conn() as conn:
+            row = conn.execute(f"SELECT {PAPER_COLUMNS} FROM papers WHERE id = ?", (paper_id,)).fetchone()
         
-        cursor.execute('''
-            SELECT id, title, authors, abstract, url, pdf_url, published_date, keywords, source, file_path, created_at
-            FROM papers
-            WHERE id = ?
-        ''', (paper_id,))
+        return self._row_to_paper(row) if row else None
+    
+    async def get_paper_by_url(self, url: str) -> Optional[dict]:
+        """URL로 특정 논문 조회 (url UNIQUE 인덱스 사용)"""
+        papers = await self._run_read(self._get_papers_by_urls, [url])
+        return papers[0] if papers else None
+    
+    async def get_papers_by_urls(self, urls: List[str]) -> List[dict]:
+        """여러 URL에 해당하는 논문 일괄 조회"""
+        return await self._run_read(self._get_papers_by_urls, list(urls))
+    
+    def _get_papers_by_urls(self, urls: List[str]) -> List[dict]:
+        papers = []
+        with self._read_conn() as conn:
+            chunk_size = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+            for start in range(0, len(urls), chunk_size):
+                chunk = urls[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"SELECT {PAPER_COLUMNS} FROM papers WHERE url IN ({placeholders})", chunk)
+                papers.extend(self._row_to_paper(row) for row in rows)
+        return papers
+    
+    async def get_paper_by_arxiv_id(self, arxiv_id: str) -> Optional[dict]:
+        """
+        arXiv ID로 논문 조회
+        - 버전(v1, v2...)이 달라도 같은 논문으로 취급 (arxiv_id 인덱스)
+        """
+        arxiv_id = normalize_arxiv_id(arxiv_id)
+        if not arxiv_id:
+            return None
+        return await self._run_read(self._get_paper_by_identifier, 'arxiv_id', arxiv_id)
+    
+    async def get_paper_by_pmid(self, pmid: str) -> Optional[dict]:
+        """PMID로 PubMed 논문 조회 (pmid 인덱스)"""
+        pmid = normalize_pmid(pmid)
+        if not pmid:
+            return None
+        return await self._run_read(self._get_paper_by_identifier, 'pmid', pmid)
+    
+    async def get_paper_by_doi(self, doi: str) -> Optional[dict]:
+        """DOI로 논문 조회 (대소문자 무시, doi 인덱스)"""
+        doi = normalize_doi(doi)
+        if not doi:
+            return None
+        return await self._run_read(self._get_paper_by_identifier, 'doi', doi)
+    
+    def _get_paper_by_identifier(self, column: str, value: str) -> Optional[dict]:
+        with self._read_conn() as conn:
+            row = conn.execute(f"SELECT {PAPER_COLUMNS} FROM papers WHERE {column} = ?", (value,)).fetchone()
+        return self._row_to_paper(row) if row else None
+    
+    @staticmethod
+    def _row_to_paper(row) -> PaperRecord:
+        """PAPER_COLUMNS 순서의 행을 논문 객체로 변환 (저자/키워드 JSON은 접근할 때 디코딩)"""
+        return PaperRecord.from_row(PAPER_FIELDS, row)
+    
+    @staticmethod
+    def _rows_to_papers(rows, columns: Tuple[str, ...]) -> List[PaperRecord]:
+        """columns 순서로 시작하는 행들을 논문 객체로 변환 (뒤에 붙은 컬럼은 무시)"""
+        return [PaperRecord.from_row(columns, row) for row in rows]
+    
+    async def get_papers_by_author(self, name: str, limit: int = 50, offset: int = 0) -> List[PaperRecord]:
+        """저자 이름이 정확히 일치하는 논문 목록 (authors 인덱스 사용, 최신순)"""
+        return await self._run_read(self._get_papers_by_link, LINKED_BY_AUTHOR_SQL, name.strip(), limit, offset)
+    
+    async def get_papers_by_keyword(self, keyword: str, limit: int = 50, offset: int = 0) -> List[PaperRecord]:
+        """키워드가 일치하는 논문 목록 (대소문자 무시, keywords 인덱스 사용, 최신순)"""
+        return await self._run_read(self._get_papers_by_link, LINKED_BY_KEYWORD_SQL, keyword.strip().lower(), limit, offset)
+    
+    def _get_papers_by_link(self, sql: str, name: str, limit: int, offset: int) -> List[PaperRecord]:
+        with self._read_conn() as conn:
+            rows = conn.execute(sql, (name, limit, offset)).fetchall()
+        return [self._row_to_paper(row) for row in rows]
+    
+    async def get_stats(self, days: Optional[int] = None, since: Optional[str] = None, until: Optional[str] = None,
+                        top_keywords: int = 10, title_terms: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        수집 통계 (SQL 집계)
+        - days: 오늘(UTC)을 포함한 최근 N일, since/until: 'YYYY-MM-DD' 기간 (모두 없으면 전체 기간)
+        - 소스별/일별/PDF 통계는 일별 집계 테이블에서 읽음
+        - top_keywords: 기간 내 가장 많이 붙은 키워드 수
+        - title_terms: 기간 내 제목에 각 단어가 포함된 논문 수
+        """
+        if days is not None:
+            if days < 1:
+                raise ValueError("days must be at least 1")
+            since = (datetime.utcnow().date() - timedelta(days=days - 1)).isoformat()
+        for value in (since, until):
+            if value is not None:
+                datetime.strptime(value, '%Y-%m-%d')
+        return await self._run_read(self._get_stats, since, until, top_keywords, title_terms or [])
+    
+    def _get_stats(self, since: Optional[str], until: Optional[str], top_keywords: int,
+                   title_terms: List[str]) -> Dict[str, Any]:
+        day_conditions, day_params = [], []
+        created_conditions, created_params = [], []
+        if since:
+            day_conditions.append("day >= ?")
+            day_params.append(since)
+            created_conditions.append("p.created_at >= ?")
+            created_params.append(since)
+        if until:
+            day_conditions.append("day <= ?")
+            day_params.append(until)
+            created_conditions.append("p.created_at < date(?, '+1 day')")
+            created_params.append(until)
+        day_where = f"WHERE {' AND '.join(day_conditions)}" if day_conditions else ""
+        created_where = f"WHERE {' AND '.join(created_conditions)}" if created_conditions else ""
         
-        row = cursor.fetchone()
-        conn.close()
+        with self._read_conn() as conn:
+            rows = conn.execute(f'''
+                SELECT day, source, papers, with_pdf FROM paper_daily_stats
+                {day_where}
+                ORDER BY day
+            ''', day_params).fetchall()
+            
+            keyword_rows = conn.execute(f'''
+                SELECT k.name, COUNT(*) AS papers
+                FROM papers p
+                JOIN paper_keywords pk ON pk.paper_id = p.id
+                JOIN keywords k ON k.id = pk.keyword_id
+                {created_where}
+                GROUP BY k.id
+                ORDER BY papers DESC, k.name
+                LIMIT ?
+            ''', created_params + [top_keywords]).fetchall() if top_keywords > 0 else []
+            
+            term_counts = {}
+            for term in title_terms:
+                term_where = created_where + (" AND " if created_where else "WHERE ") + "p.title LIKE ?"
+                term_counts[term] = conn.execute(
+                    f"SELECT COUNT(*) FROM papers p {term_where}", created_params + [f"%{term}%"]
+                ).fetchone()[0]
         
-        if row:
-            return {
-                'id': row[0],
-                'title': row[1],
-                'authors': json.loads(row[2]),
-                'abstract': row[3],
-                'url': row[4],
-                'pdf_url': row[5],
-                'published_date': row[6],
-                'keywords': json.loads(row[7]) if row[7] else [],
-                'source': row[8],
-                'file_path': row[9],
-                'created_at': row[10]
-            }
-        return None
+        by_source: Dict[str, Dict[str, int]] = {}
+        by_day: Dict[str, Dict[str, int]] = {}
+        for day, source, papers, with_pdf in rows:
+            if papers <= 0:
+                continue
+            for bucket in (by_source.setdefault(source, {'papers': 0, 'with_pdf': 0}),
+                           by_day.setdefault(day, {'papers': 0, 'with_pdf': 0})):
+                bucket['papers'] += papers
+                bucket['with_pdf'] += with_pdf
+        
+        return {
+            'since': since,
+            'until': until,
+            'total': sum(bucket['papers'] for bucket in by_source.values()),
+            'with_pdf': sum(bucket['with_pdf'] for bucket in by_source.values()),
+            'by_source': by_source,
+            'by_day': [{'day': day, **bucket} for day, bucket in by_day.items()],
+            'top_keywords': [{'keyword': name, 'papers': papers} for name, papers in keyword_rows],
+            'title_terms': term_counts,
+        }
     
     async def update_paper_file_path(self, paper_id: int, file_path: str):
         """
@@ -161,80 +1187,98 @@ class PaperDatabase:
         - PDF 다운로드 후 로컬 파일 경로 저장
         - 나중에 파일 접근 시 사용
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        await self._run_write(self._update_paper_file_path, paper_id, file_path)
+    
+    def _update_paper_file_path(self, conn: sqlite3.Connection, paper_id: int, file_path: str):
+        conn.execute('''
             UPDATE papers
             SET file_path = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         ''', (file_path, paper_id))
-        
-        conn.commit()
-        conn.close()
     
     async def delete_paper(self, paper_id: int):
         """
         논문 삭제
         - 데이터베이스에서 논문 정보 삭제
-        - 파일도 함께 삭제: 로컬 PDF 파일도 자동 삭제
+        - 파일도 함께 삭제: 로컬 PDF 파일도 자동 삭제 (삭제가 커밋된 뒤)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        row = await self._run_write(self._delete_paper, paper_id)
         
-        # 파일 경로 확인
-        cursor.execute("SELECT file_path FROM papers WHERE id = ?", (paper_id,))
-        row = cursor.fetchone()
+        if row:
+            file_path, url = row
+            self.dedup_index.discard(url)
+            
+            if file_path:
+                # 파일 삭제
+                try:
+                    os.remove(file_path)
+                    logger.info(f"Deleted file: {file_path}")
+                except FileNotFoundError:
+                    logger.warning(f"File not found: {file_path}")
         
-        if row and row[0]:
-            # 파일 삭제
-            try:
-                os.remove(row[0])
-                logger.info(f"Deleted file: {row[0]}")
-            except FileNotFoundError:
-                logger.warning(f"File not found: {row[0]}")
+        logger.info(f"Deleted paper with ID: {paper_id}")
+    
+    def _delete_paper(self, conn: sqlite3.Connection, paper_id: int):
+        # 파일 경로 확인
+        row = conn.execute("SELECT file_path, url FROM papers WHERE id = ?", (paper_id,)).fetchone()
         
         # 데이터베이스에서 삭제
-        cursor.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
-        conn.commit()
-        conn.close()
-        
-        logger.info(f"Deleted paper with ID: {paper_id}")
+        conn.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
+        return row
     
-    async def search_papers(self, query: str) -> List[dict]:
+    async def search_papers(self, query: str, limit: int = 50, offset: int = 0,
+                            snippets: bool = False, fields: Optional[Iterable[str]] = None) -> List[dict]:
         """
         논문 검색
-        - 제목, 초록, 저자에서 키워드 검색
-        - 부분 일치 검색 지원
+        - 제목, 초록, 저자, 키워드 전문 검색 (FTS5)
+        - BM25 점수 순으로 정렬, limit/offset으로 페이지 단위 조회
+        - snippets=True이면 일치 부분을 강조한 요약 포함
+        - fields를 주면 해당 컬럼만 읽음
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return await self._run_read(self._search_papers, query, limit, offset, snippets, fields)
+    
+    @staticmethod
+    def _build_match_query(query: str) -> str:
+        """사용자 입력을 FTS5 MATCH 식으로 변환 (모든 단어 포함, 특수 문법 무시)"""
+        tokens = FTS_TOKEN_PATTERN.findall(query)
+        return ' '.join(f'"{token}"' for token in tokens)
+    
+    def _search_papers(self, query: str, limit: int = 50, offset: int = 0,
+                       snippets: bool = False, fields: Optional[Iterable[str]] = None) -> List[dict]:
+        columns = self.select_fields(fields)
         
-        cursor.execute('''
-            SELECT id, title, authors, abstract, url, pdf_url, published_date, keywords, source, file_path, created_at
-            FROM papers
-            WHERE title LIKE ? OR abstract LIKE ? OR authors LIKE ?
-            ORDER BY created_at DESC
-        ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
+        if self.fts_enabled:
+            match_query = self._build_match_query(query)
+            if not match_query:
+                return []
+            
+            snippet_column = "snippet(papers_fts, -1, '<b>', '</b>', '...', 16)" if snippets else "NULL"
+            with self._read_conn() as conn:
+                rows = conn.execute(f'''
+                    SELECT {', '.join(f"p.{column}" for column in columns)},
+                           bm25(papers_fts, ?, ?, ?, ?) AS score, {snippet_column}
+                    FROM papers_fts
+                    JOIN papers p ON p.id = papers_fts.rowid
+                    WHERE papers_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ? OFFSET ?
+                ''', (*FTS_BM25_WEIGHTS, match_query, limit, offset)).fetchall()
+        else:
+            with self._read_conn() as conn:
+                rows = conn.execute(f'''
+                    SELECT {', '.join(columns)}, NULL, NULL
+                    FROM papers
+                    WHERE title LIKE ? OR abstract LIKE ? OR authors LIKE ?
+                    ORDER BY created_at DESC
+                    LIMIT ? OFFSET ?
+                ''', (f'%{query}%', f'%{query}%', f'%{query}%', limit, offset)).fetchall()
         
-        rows = cursor.fetchall()
-        papers = []
+        papers = self._rows_to_papers(rows, columns)
+        score_index = len(columns)
         
-        for row in rows:
-            paper = {
-                'id': row[0],
-                'title': row[1],
-                'authors': json.loads(row[2]),
-                'abstract': row[3],
-                'url': row[4],
-                'pdf_url': row[5],
-                'published_date': row[6],
-                'keywords': json.loads(row[7]) if row[7] else [],
-                'source': row[8],
-                'file_path': row[9],
-                'created_at': row[10]
-            }
-            papers.append(paper)
-        
-        conn.close()
-        return papers 
\ No newline at end of file
+        for paper, row in zip(papers, rows):
+            paper['score'] = row[score_index]
+            if snippets:
+                paper['snippet'] = row[score_index + 1]
+        
+        return papers
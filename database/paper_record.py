@@ -0,0 +1,122 @@
+import json
+from functools import lru_cache
+from collections.abc import MutableMapping
+from typing import Any, Iterable, Iterator, Sequence
+
+# json.dumps(..., ensure_ascii=False)는 호출마다 인코더를 새로 만들므로 하나를 재사용
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_MISSING = object()
+
+# 수집기, 데이터베이스, API 응답이 함께 쓰는 논문 정보 타입
+# - __slots__로 필드를 저장하므로 논문마다 dict를 둘 때보다 메모리가 적음
+# - 데이터베이스 행은 authors/keywords JSON을 필요할 때만 디코딩
+# - Mapping 인터페이스(paper['url'], paper.get(...), dict(paper))를 그대로 지원
+# - 값이 없는 필드는 없는 키로 취급 (조회할 컬럼만 읽은 행, 소스마다 다른 필드)
+
+class PaperRecord(MutableMapping):
+    """
+    - 수집기: PaperRecord(title=..., authors=[...], ...) 로 생성
+    - 데이터베이스 행: from_row(columns, row), authors/keywords JSON은 처음 접근할 때 디코딩
+    - 직렬화: to_json()은 아직 디코딩하지 않은 JSON을 그대로 붙여 다시 인코딩하지 않음
+    """
+    FIELDS = (
+        'id', 'title', 'authors', 'abstract', 'url', 'pdf_url', 'published_date', 'keywords', 'source',
+        'file_path', 'created_at', 'arxiv_id', 'pmid', 'doi',
+        'categories',        # arXiv OAI-PMH 카테고리 (저장하지 않음)
+        'score', 'snippet',  # 전문 검색 결과
+    )
+    JSON_FIELDS = ('authors', 'keywords')
+
+    __slots__ = FIELDS + ('_raw',)
+
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, **fields: Any):
+        self._raw = ()  # 아직 JSON 문자열인 필드
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def from_row(cls, columns: Sequence[str], row: Sequence[Any]) -> "PaperRecord":
+        """SQLite 행을 columns 순서로 변환 (row가 더 길면 뒤의 값은 무시)"""
+        record = cls.__new__(cls)
+        for key, value in zip(columns, row):
+            setattr(record, key, value)
+        record._raw = _json_columns(tuple(columns))
+        return record
+
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        try:
+            value = getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+        if key in self._raw:
+            value = json.loads(value) if value else []
+            setattr(self, key, value)
+            self._raw = tuple(field for field in self._raw if field != key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(f"Unknown paper field: {key}")
+        setattr(self, key, value)
+        if key in self._raw:
+            self._raw = tuple(field for field in self._raw if field != key)
+
+    def __delitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+        if key in self._raw:
+            self._raw = tuple(field for field in self._raw if field != key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._FIELD_SET and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self.FIELDS if getattr(self, field, _MISSING) is not _MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"PaperRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """모든 필드를 디코딩한 일반 dict로 변환"""
+        return {key: self[key] for key in self}
+
+    def to_json(self) -> str:
+        """
+        JSON 문자열로 직렬화
+        - 아직 디코딩하지 않은 authors/keywords는 저장된 JSON을 그대로 붙임
+        """
+        raw = self._raw
+        plain = {
+            field: value for field in self.FIELDS
+            if field not in raw and (value := getattr(self, field, _MISSING)) is not _MISSING
+        }
+        body = _encode(plain)
+        if not raw:
+            return body
+        extra = ','.join(f'"{key}":{getattr(self, key) or "[]"}' for key in raw)
+        return f"{body[:-1]},{extra}}}" if plain else f"{{{extra}}}"
+
+
+@lru_cache(maxsize=64)
+def _json_columns(columns: tuple) -> tuple:
+    """조회 컬럼 중 JSON 문자열로 저장된 필드 (같은 컬럼 목록이 반복되므로 캐시)"""
+    return tuple(field for field in PaperRecord.JSON_FIELDS if field in columns)
+
+
+def papers_to_json(papers: Iterable[Any]) -> str:
+    """논문 목록을 JSON 배열 문자열로 직렬화 (PaperRecord는 저장된 JSON을 재사용)"""
+    return '[' + ','.join(
+        paper.to_json() if isinstance(paper, PaperRecord) else _encode(dict(paper))
+        for paper in papers
+    ) + ']'
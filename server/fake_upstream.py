@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+기록된 응답을 재생하는 로컬 가짜 arXiv/PubMed 서버
+- 요청 경로는 /{원래 host}/{원래 path} (tools/upstream_fixtures.py의 UpstreamRedirectTransport)
+- 지연, 호스트별 요청 한도(429/503 + Retry-After), 오류 주입으로 외부 API 상황을 흉내 냄
+
+사용법: python -m server.fake_upstream --fixtures fixtures/upstream --port 8900 [--latency-ms 200 --rate 3 --error-rate 0.05]
+수집 서버 쪽은 config/settings.json의 http.upstream_base_url을 "http://127.0.0.1:8900"으로 설정
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request, Response
+
+# 프로젝트 루트를 Python 경로에 추가
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from tools.upstream_fixtures import FixtureStore
+
+# 요청 한도를 넘었을 때 응답 상태 (arXiv는 503 + Retry-After, NCBI는 429)
+THROTTLE_STATUS = {'export.arxiv.org': 503, 'oaipmh.arxiv.org': 503}
+DEFAULT_THROTTLE_STATUS = 429
+
+class HostThrottle:
+    """호스트별 토큰 버킷 (rate: 초당 요청 수, burst: 한 번에 허용하는 요청 수)"""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, list] = {}
+    
+    def retry_after(self, host: str) -> float:
+        """요청을 받을 수 있으면 0, 아니면 기다려야 하는 초"""
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(host, [float(self.burst), now])
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+def create_app(store: FixtureStore, latency_ms: float = 0, jitter_ms: float = 0, rate: Optional[float] = None,
+               burst: int = 1, error_rate: float = 0.0, seed: Optional[int] = None) -> FastAPI:
+    """
+    가짜 서버 앱 생성
+    - latency_ms + 0~jitter_ms 만큼 늦게 응답
+    - rate: 호스트별 초당 요청 한도 (None이면 제한 없음)
+    - error_rate: 이 비율만큼 500 응답
+    - seed: 지연/오류 난수 고정 (재현 가능한 벤치마크)
+    """
+    app = FastAPI(title="가짜 외부 API 서버")
+    rng = random.Random(seed)
+    throttle = HostThrottle(rate, burst) if rate else None
+    stats = {'requests': 0, 'served': 0, 'missing': 0, 'throttled': 0, 'errors': 0}
+    
+    @app.get("/_fake/stats")
+    async def get_stats():
+        """받은 요청 수와 결과별 횟수"""
+        return dict(stats, fixtures=len(store))
+    
+    @app.api_route("/{host}/{path:path}", methods=["GET", "POST", "HEAD"])
+    async def replay(host: str, path: str, request: Request):
+        stats['requests'] += 1
+        
+        if throttle is not None:
+            wait = throttle.retry_after(host)
+            if wait > 0:
+                stats['throttled'] += 1
+                return Response(status_code=THROTTLE_STATUS.get(host, DEFAULT_THROTTLE_STATUS),
+                                headers={'Retry-After': str(max(1, round(wait)))})
+        
+        delay = (latency_ms + rng.uniform(0, jitter_ms)) / 1000
+        fail = rng.random() < error_rate
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if fail:
+            stats['errors'] += 1
+            return Response(status_code=500, content=b"Injected upstream error")
+        
+        query = request.url.query
+        url = httpx.URL(f"https://{host}/{path}" + (f"?{query}" if query else ''))
+        recorded = store.lookup(request.method, url, await request.body(), request.headers.get('content-type', ''))
+        if recorded is None:
+            stats['missing'] += 1
+            return Response(status_code=404, headers={'X-Fixture-Missing': '1'},
+                            content=f"No recorded fixture for {request.method} {url}".encode('utf-8'))
+        
+        stats['served'] += 1
+        status_code, headers, content = recorded
+        return Response(status_code=status_code, headers=headers, content=content)
+    
+    return app
+
+def main():
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default='fixtures/upstream', help="기록된 응답 디렉터리")
+    parser.add_argument('--match', default='exact', choices=['exact', 'path'],
+                        help="path: 같은 요청이 없으면 같은 경로의 기록을 돌아가며 사용")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--rate', type=float, default=None, help="호스트별 초당 요청 한도")
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    
+    app = create_app(
+        FixtureStore(args.fixtures, match=args.match), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate=args.rate, burst=args.burst, error_rate=args.error_rate, seed=args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
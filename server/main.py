@@ -3,11 +3,14 @@
 논문 수집 MCP 서버 메인 파일
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 import asyncio
+import json
 import logging
+import time
 
 # 프로젝트 루트를 Python 경로에 추가
 import sys
@@ -16,28 +19,94 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from tools.arxiv_collector import ArxivCollector
+from tools.arxiv_harvester import DEFAULT_WINDOW_DAYS, ArxivHarvester
 from tools.pubmed_collector import PubMedCollector
 from tools.pdf_processor import PDFProcessor
-from database.paper_db import PaperDatabase
+from tools.collector_registry import CollectorRegistry
+from tools.rate_limiter import PRIORITIES, rate_limiter_metrics
+from tools.http_client import close_http_client, configure_http_client
+from tools.resilience import configure_resilience, upstream_health
+from database.paper_db import PaperDatabase, papers_to_json
+from server.settings import load_settings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 자원 관리"""
+    # 데이터베이스는 서버가 시작될 때 생성 (모듈을 가져오기만 해서는 파일을 만들지 않음)
+    global paper_db, arxiv_harvester
+    if paper_db is None:
+        paper_db = PaperDatabase(settings.get('database', {}).get('path', 'papers.db'))
+    arxiv_harvester = ArxivHarvester(
+        arxiv_collector, paper_db, source_settings.get('arxiv', {}).get('harvest_days', DEFAULT_WINDOW_DAYS)
+    )
+    # 중복 확인 인덱스를 미리 채워 검색 요청마다 DB를 읽지 않도록 함
+    await paper_db.warm_dedup_index()
+    yield
+    # 외부 API HTTP 연결 정리
+    await close_http_client()
+    # 데이터베이스 작업 스레드와 연결 정리
+    paper_db.close()
 
 # FastAPI 앱 생성
-app = FastAPI(title="논문 수집 MCP 서버", version="1.0.0")
+app = FastAPI(title="논문 수집 MCP 서버", version="1.0.0", lifespan=lifespan)
 
 # 수집기 및 데이터베이스 초기화
+settings = load_settings()
+source_settings = settings.get('sources', {})
+configure_http_client(**settings.get('http', {}))
+configure_resilience(**settings.get('resilience', {}))
 arxiv_collector = ArxivCollector()
-pubmed_collector = PubMedCollector()
+pubmed_collector = PubMedCollector(api_key=source_settings.get('pubmed', {}).get('api_key'))
+
+# 논문 소스 등록 (새 소스는 여기에 추가하면 /search_papers에서 동시에 검색됨)
+collectors = CollectorRegistry()
+for name, collector in (("arxiv", arxiv_collector), ("pubmed", pubmed_collector)):
+    if source_settings.get(name, {}).get('enabled', True):
+        collectors.register(name, collector, source_settings.get(name, {}).get('timeout_seconds'))
+
 pdf_processor = PDFProcessor()  # 기본 PDF 프로세서 (시간별 폴더 없음)
-paper_db = PaperDatabase()
+paper_db: Optional[PaperDatabase] = None  # lifespan에서 생성
+arxiv_harvester: Optional[ArxivHarvester] = None
 
 # 요청 모델
 class SearchRequest(BaseModel):
     query: str
     max_results: int = 10
-    source: str = "arxiv"  # "arxiv", "pubmed", "all"
+    source: str = "arxiv"  # 등록된 소스 이름 ("arxiv", "pubmed") 또는 "all"
+    fields: Optional[List[str]] = None  # 응답에 포함할 필드 (없으면 전체)
+    priority: str = "interactive"  # "interactive" (사용자 검색) 또는 "bulk" (자동 수집, 외부 API 요청 순서가 뒤로 밀림)
+    incremental: bool = False  # True면 같은 검색어로 지난번 수집한 이후의 새 논문만 요청 (자동 수집용)
+
+class BatchSearchRequest(BaseModel):
+    queries: Dict[str, int]  # 키워드 -> 찾을 새 논문 수
+    source: str = "arxiv"  # 일괄 검색을 지원하는 소스 (현재 arxiv)
+    fields: Optional[List[str]] = None  # 응답에 포함할 필드 (없으면 전체)
+    priority: str = "bulk"
+    incremental: bool = False  # True면 키워드별로 지난번 수집한 이후의 새 논문만 요청
+
+class HarvestRequest(BaseModel):
+    categories: Optional[List[str]] = None  # 없으면 설정 파일의 arXiv 카테고리
+    from_date: Optional[str] = None  # 'YYYY-MM-DD' (없으면 체크포인트부터 증분 수집, 체크포인트가 없으면 최근 harvest_days일)
+    until_date: Optional[str] = None  # 'YYYY-MM-DD' (없으면 오늘)
 
 class DownloadRequest(BaseModel):
     paper_url: str
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """쉼표로 구분된 fields 파라미터를 검증된 필드 목록으로 변환"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    try:
+        PaperDatabase.select_fields(requested)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return requested
+
+def json_response(content: str) -> Response:
+    """이미 직렬화된 JSON 문자열을 그대로 응답 (FastAPI의 행별 변환 생략)"""
+    return Response(content=content, media_type="application/json")
+
 # 기본 엔드포인트
 @app.get("/")
 async def root():
@@ -46,46 +115,206 @@ async def root():
 # 논문 검색 엔드포인트
 @app.post("/search_papers")
 async def search_papers(request: SearchRequest):
+    """
+    선택한 소스들을 동시에 검색하고 새 논문을 저장
+    - 응답: {"papers": 저장된 새 논문, "sources": 소스별 상태 (ok/timeout/error, 개수, 읽은 결과 수와 효율, 소요 시간)}
+    - 검색어마다 소스별 중복 비율을 기록해 다음 검색의 요청 크기를 조정
+    - 일부 소스가 느리거나 실패해도 나머지 소스 결과는 저장하고 반환
+    """
+    try:
+        columns = PaperDatabase.select_fields(request.fields) if request.fields else None
+        collectors.resolve(request.source)
+        if request.priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {request.priority} (available: {', '.join(PRIORITIES)})")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        papers = []
+        # 메모리 중복 확인 인덱스로 이미 저장된 논문 제외
+        is_known = paper_db.dedup_index.is_known
         
-        # 기존 논문 URL들을 가져와서 중복 제거에 사용
-        existing_papers = await paper_db.get_papers(limit=10000)  # 충분히 많은 기존 논문들
-        existing_urls = [paper['url'] for paper in existing_papers]
+        # 증분 수집: 검색어별로 지난번에 본 가장 최신 논문 기준
+        watermarks = await paper_db.get_query_watermarks(request.query) if request.incremental else None
+        # 검색어별 과거 중복 비율 (소스별 요청 크기 결정)
+        fetch_stats = await paper_db.get_query_fetch_stats(request.query)
         
-        logging.info(f"Found {len(existing_urls)} existing papers for duplicate checking")
+        # 모든 소스를 동시에 검색 (중복 제거 포함, 소스별 제한 시간 적용)
+        papers, sources = await collectors.search(
+            request.query, request.max_results, request.source, is_known, PRIORITIES[request.priority],
+            watermarks, fetch_stats
+        )
         
-        # arXiv에서 검색 (중복 제거 포함)
-        if request.source in ["arxiv", "all"]:
-            arxiv_papers = await arxiv_collector.search(request.query, request.max_results, existing_urls)
-            papers.extend(arxiv_papers)
+        # 데이터베이스에 저장
+        saved_papers = await paper_db.add_papers(papers) if papers else []
         
-        # PubMed에서 검색 (중복 제거 포함)
-        if request.source in ["pubmed", "all"]:
-            pubmed_papers = await pubmed_collector.search(request.query, request.max_results, existing_urls)
-            papers.extend(pubmed_papers)
+        # 성공한 소스의 읽은 결과 수 / 새 논문 수 누적 (다음 검색의 요청 크기에 반영)
+        await paper_db.record_query_fetch_stats(request.query, {
+            name: (status['fetched'], status['count'])
+            for name, status in sources.items() if status['status'] == 'ok' and 'fetched' in status
+        })
         
-        # 데이터베이스에 저장
-        if papers:
-            saved_papers = await paper_db.add_papers(papers)
-            return saved_papers
+        # 논문 저장 후 성공한 소스의 기준 갱신
+        if request.incremental:
+            await paper_db.save_query_watermarks(request.query, {
+                name: status.pop('watermark') for name, status in sources.items() if 'watermark' in status
+            })
+        if columns:
+            saved_papers = [{key: paper[key] for key in columns if key in paper} for paper in saved_papers]
         
-        return []
+        return {"papers": saved_papers, "sources": sources}
         
     except Exception as e:
         logging.error(f"논문 검색 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# 여러 키워드 일괄 검색 엔드포인트
+@app.post("/search_papers/batch")
+async def search_papers_batch(request: BatchSearchRequest):
+    """
+    여러 키워드를 OR 검색어 몇 개로 묶어 검색하고 새 논문을 저장
+    - 결과는 제목/초록에 들어 있는 키워드로 분류되고 키워드별 개수(queries 값)를 넘지 않음
+    - 응답: {"results": 키워드 -> 저장된 새 논문, "status": {'requests', 'fetched', 'unmatched', 'elapsed_ms'}}
+    """
+    try:
+        columns = PaperDatabase.select_fields(request.fields) if request.fields else None
+        collectors.resolve(request.source)
+        collector = collectors.get(request.source)
+        if not hasattr(collector, 'search_many'):
+            raise ValueError(f"Batch search is not supported for source: {request.source}")
+        if request.priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {request.priority} (available: {', '.join(PRIORITIES)})")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        start = time.perf_counter()
+        
+        # 증분 수집: 키워드별 기준 (/search_papers와 같은 테이블)
+        watermarks = None
+        if request.incremental:
+            watermarks = {}
+            for query in request.queries:
+                watermark = (await paper_db.get_query_watermarks(query)).get(request.source)
+                if watermark:
+                    watermarks[query] = watermark
+        
+        status = {}
+        results = await collector.search_many(
+            request.queries, paper_db.dedup_index.is_known, PRIORITIES[request.priority], watermarks, status
+        )
+        
+        # 여러 키워드에 분류된 논문은 한 번만 저장
+        unique_papers = list({paper['url']: paper for papers in results.values() for paper in papers}.values())
+        saved_urls = {paper['url'] for paper in await paper_db.add_papers(unique_papers)} if unique_papers else set()
+        
+        if request.incremental:
+            for query, watermark in watermarks.items():
+                await paper_db.save_query_watermarks(query, {request.source: watermark})
+        
+        response = {}
+        for query, papers in results.items():
+            saved = [paper for paper in papers if paper['url'] in saved_urls]
+            if columns:
+                saved = [{key: paper[key] for key in columns if key in paper} for paper in saved]
+            response[query] = saved
+        
+        status['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return {"results": response, "status": status}
+        
+    except Exception as e:
+        logging.error(f"일괄 검색 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# arXiv 카테고리 전체 수집 (OAI-PMH)
+@app.post("/harvest/arxiv")
+async def harvest_arxiv(request: Optional[HarvestRequest] = None):
+    """
+    설정된 arXiv 카테고리의 새 논문을 OAI-PMH로 모두 수집해 저장
+    - set(아카이브)마다 페이지 단위로 요청하므로 카테고리당 키워드 검색 수백 번 대신 요청 몇 번
+    - 체크포인트 이후 구간만 수집하고, 중단된 수집은 저장된 위치부터 재개
+    - 처음 수집하는 set은 최근 harvest_days일만 수집 (과거 데이터 전체는 from_date 지정)
+    - 응답: set별 {'from', 'until', 'resumed', 'requests', 'records', 'matched', 'added'}
+    """
+    request = request or HarvestRequest()
+    categories = request.categories or source_settings.get('arxiv', {}).get('categories', [])
+    try:
+        return await arxiv_harvester.harvest(categories, request.from_date, request.until_date)
+    except ValueError as e:
+        # 잘못된 날짜/카테고리, OAI-PMH 오류 응답
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"arXiv 대량 수집 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # 저장된 논문 목록 조회
 @app.get("/papers")
-async def get_papers(limit: int = 50, offset: int = 0):
+async def get_papers(limit: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                     source: Optional[str] = None, published_from: Optional[str] = None,
+                     published_to: Optional[str] = None, has_pdf: Optional[bool] = None,
+                     fields: Optional[str] = None):
+    """
+    최신순 논문 목록
+    - 응답의 next_cursor를 다음 요청의 cursor로 넘기면 다음 페이지 조회
+    - fields=url,title,file_path 처럼 필요한 필드만 요청 가능
+    """
     try:
-        papers = await paper_db.get_papers(limit, offset)
-        return papers
+        page = await paper_db.get_papers_page(
+            limit, cursor, source, published_from, published_to, has_pdf, offset, parse_fields(fields)
+        )
+        return json_response(
+            f'{{"papers":{papers_to_json(page["papers"])},"next_cursor":{json.dumps(page["next_cursor"])}}}'
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"논문 목록 조회 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# 저자별 논문 목록 (이름 정확히 일치)
+@app.get("/papers/by_author")
+async def get_papers_by_author(name: str, limit: int = 50, offset: int = 0):
+    try:
+        return await paper_db.get_papers_by_author(name, limit, offset)
+    except Exception as e:
+        logging.error(f"저자별 논문 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 키워드별 논문 목록 (대소문자 무시)
+@app.get("/papers/by_keyword")
+async def get_papers_by_keyword(keyword: str, limit: int = 50, offset: int = 0):
+    try:
+        return await paper_db.get_papers_by_keyword(keyword, limit, offset)
+    except Exception as e:
+        logging.error(f"키워드별 논문 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# URL 또는 식별자(arXiv ID, PMID, DOI)로 논문 조회
+@app.get("/papers/lookup")
+async def lookup_paper(url: Optional[str] = None, arxiv_id: Optional[str] = None,
+                       pmid: Optional[str] = None, doi: Optional[str] = None):
+    try:
+        if url:
+            paper = await paper_db.get_paper_by_url(url)
+        elif arxiv_id:
+            paper = await paper_db.get_paper_by_arxiv_id(arxiv_id)
+        elif pmid:
+            paper = await paper_db.get_paper_by_pmid(pmid)
+        elif doi:
+            paper = await paper_db.get_paper_by_doi(doi)
+        else:
+            raise HTTPException(status_code=400, detail="url, arxiv_id, pmid, doi 중 하나가 필요합니다")
+        
+        if paper:
+            return paper
+        raise HTTPException(status_code=404, detail="논문을 찾을 수 없습니다")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"논문 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # 특정 논문 조회
 @app.get("/papers/{paper_id}")
 async def get_paper(paper_id: int):
@@ -112,13 +341,11 @@ async def download_paper(paper_url: str, time_folder: str = None):
             result = await pdf_processor.download_and_process(paper_url)
         
         if result['success']:
-            # 데이터베이스에서 해당 논문 찾기
-            papers = await paper_db.get_papers(limit=1000)
-            for paper in papers:
-                if paper['url'] == paper_url:
-                    # 파일 경로 업데이트
-                    await paper_db.update_paper_file_path(paper['id'], result['file_path'])
-                    break
+            # 데이터베이스에서 해당 논문 찾기 (url 인덱스 조회)
+            paper = await paper_db.get_paper_by_url(paper_url)
+            if paper:
+                # 파일 경로 업데이트
+                await paper_db.update_paper_file_path(paper['id'], result['file_path'])
             
             return {
                 "success": True,
@@ -127,10 +354,14 @@ async def download_paper(paper_url: str, time_folder: str = None):
                 "message": "PDF 다운로드 완료"
             }
         else:
-            return {
+            response = {
                 "success": False,
                 "error": result['error']
             }
+            if 'retry_after_seconds' in result:
+                # 외부 호스트 차단 중 (이 시간이 지나기 전에는 다시 요청해도 바로 실패)
+                response["retry_after_seconds"] = result['retry_after_seconds']
+            return response
             
     except Exception as e:
         logging.error(f"PDF 다운로드 중 오류: {e}")
@@ -151,14 +382,40 @@ async def delete_paper(paper_id: int):
 
 # 논문 검색 (저장된 논문에서)
 @app.get("/search")
-async def search_papers(query: str):
+async def search_papers(query: str, limit: int = 50, offset: int = 0, snippets: bool = False,
+                        fields: Optional[str] = None):
     try:
-        papers = await paper_db.search_papers(query)
-        return papers
+        papers = await paper_db.search_papers(query, limit, offset, snippets, parse_fields(fields))
+        return json_response(papers_to_json(papers))
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"논문 검색 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# 수집 통계 (일별 집계 테이블 기반, days 또는 since/until 기간)
+@app.get("/stats")
+async def get_stats(days: Optional[int] = None, since: Optional[str] = None, until: Optional[str] = None,
+                    top_keywords: int = 10, title_terms: Optional[str] = None):
+    terms = [term.strip() for term in title_terms.split(',') if term.strip()] if title_terms else None
+    try:
+        return await paper_db.get_stats(days, since, until, top_keywords, terms)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"통계 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 외부 API 요청 스케줄러 상태 (큐 길이, 우선순위별 대기 시간)
+@app.get("/upstreams")
+async def get_upstreams():
+    return rate_limiter_metrics()
+
+# 외부 API 호스트별 차단기 상태와 재시도 예산
+@app.get("/upstreams/breakers")
+async def get_upstream_breakers():
+    return upstream_health()
+
 # 서버 상태 확인
 @app.get("/health")
 async def health_check():
@@ -0,0 +1,20 @@
+"""
+서버 설정 파일(config/settings.json) 로드
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+project_root = Path(__file__).parent.parent
+SETTINGS_PATH = project_root / "config" / "settings.json"
+
+def load_settings(path: Path = SETTINGS_PATH) -> Dict[str, Any]:
+    """설정 파일 로드 (파일이 없거나 읽을 수 없으면 빈 설정)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"설정 파일을 읽을 수 없어 기본값을 사용합니다: {path} ({e})")
+        return {}
@@ -119,11 +119,18 @@ def collect_papers():
             response = session.post(f"{server_url}/search_papers", json={
                 "query": keyword,
                 "max_results": 8,  # 각 키워드당 8개씩
-                "source": source  # 키워드별 소스 설정
+                "source": source,  # 키워드별 소스 설정
+                "fields": ["url", "pdf_url"],  # 다운로드에 필요한 필드만 요청
+                "priority": "bulk"  # 자동 수집은 사용자 검색보다 뒤에 처리
             }, timeout=60)
             
             if response.status_code == 200:
-                papers = response.json()
+                result = response.json()
+                papers = result['papers']
+                # 응답이 늦거나 실패한 소스 기록 (나머지 소스 결과는 그대로 사용)
+                for source_name, status in result['sources'].items():
+                    if status['status'] != 'ok':
+                        logging.warning(f"'{keyword}': {source_name} 검색 {status['status']} ({status.get('error', '')})")
                 logging.info(f"'{keyword}': {len(papers)}개 논문 수집")
                 total_collected += len(papers)
                 
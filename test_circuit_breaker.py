@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+외부 API 호스트별 차단기와 재시도 예산 테스트 (가짜 외부 API 서버 사용, 외부 네트워크 불필요)
+- pytest test_circuit_breaker.py 또는 python test_circuit_breaker.py 로 실행
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+import tools.resilience as resilience
+from server.fake_upstream import create_app
+from tools.arxiv_collector import ArxivCollector
+from tools.collector_registry import CollectorRegistry
+from tools.rate_limiter import PriorityRateLimiter
+from tools.resilience import (CircuitBreakerTransport, CircuitOpenError, RetryBudget, configure_resilience,
+                              send_with_retries, upstream_health)
+from tools.upstream_fixtures import FixtureStore, UpstreamRedirectTransport
+
+def reset_resilience(**settings):
+    """테스트마다 공유 차단기와 재시도 예산을 새로 만듦"""
+    configure_resilience(**dict(resilience.DEFAULT_RESILIENCE_SETTINGS, retry_backoff_base_seconds=0.001, **settings))
+    resilience._breakers.clear()
+    resilience._retry_budget = None
+
+def failing_client(fixtures_dir: str) -> httpx.AsyncClient:
+    """항상 500을 반환하는 가짜 서버로 보내는 클라이언트 (차단기 포함)"""
+    app = create_app(FixtureStore(fixtures_dir), error_rate=1.0)
+    return httpx.AsyncClient(transport=CircuitBreakerTransport(UpstreamRedirectTransport(httpx.ASGITransport(app=app), "http://fake")))
+
+def test_breaker_opens_and_fails_fast(tmp_path):
+    """연속 실패 후 차단되면 스케줄러에서 기다리지 않고 바로 실패, 검색 상태는 unavailable"""
+    reset_resilience(breaker_failure_threshold=3)
+    
+    async def run():
+        async with failing_client(str(tmp_path)) as client:
+            collector = ArxivCollector(num_retries=5, client=client, scheduler=PriorityRateLimiter("test", rate=1000, burst=100))
+            try:
+                await collector.search("graph neural", 3)
+                assert False, "search should fail"
+            except CircuitOpenError as e:
+                assert e.host == 'export.arxiv.org'
+            
+            breaker = upstream_health()['breakers']['export.arxiv.org']
+            assert breaker['state'] == 'open'
+            assert breaker['failures'] == 3
+            assert breaker['retry_in_seconds'] > 0
+            
+            # 느린 스케줄러(10초에 1건)에서도 차례를 기다리지 않고 바로 실패
+            collector.scheduler = PriorityRateLimiter("slow", rate=0.1, burst=1)
+            await collector.scheduler.acquire()
+            registry = CollectorRegistry()
+            registry.register('arxiv', collector)
+            start = time.perf_counter()
+            papers, status = await registry.search("graph neural", 3)
+            assert time.perf_counter() - start < 1
+            assert papers == []
+            assert status['arxiv']['status'] == 'unavailable'
+            assert status['arxiv']['retry_after_seconds'] > 0
+    asyncio.run(run())
+
+def test_breaker_half_open_probe_closes_on_success():
+    """차단 시간이 지나면 요청 하나로 확인하고, 성공하면 다시 정상"""
+    reset_resilience(breaker_failure_threshold=2, breaker_reset_seconds=0.05)
+    responses = iter([500, 500, 200, 200])
+    transport = CircuitBreakerTransport(httpx.MockTransport(lambda request: httpx.Response(next(responses))))
+    
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                assert (await client.get("https://eutils.ncbi.nlm.nih.gov/x")).status_code == 500
+            try:
+                await client.get("https://eutils.ncbi.nlm.nih.gov/x")
+                assert False, "request should be rejected while open"
+            except CircuitOpenError:
+                pass
+            
+            # 다른 호스트는 영향 없음
+            assert 'doi.org' not in upstream_health()['breakers']
+            
+            await asyncio.sleep(0.06)
+            assert (await client.get("https://eutils.ncbi.nlm.nih.gov/x")).status_code == 200
+            breaker = upstream_health()['breakers']['eutils.ncbi.nlm.nih.gov']
+            assert (breaker['state'], breaker['opened'], breaker['rejected']) == ('closed', 1, 1)
+    asyncio.run(run())
+
+def test_retry_budget_limits_retries():
+    """재시도 예산이 바닥나면 남은 재시도 횟수와 관계없이 바로 실패"""
+    reset_resilience()
+    resilience._retry_budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2)
+    calls = []
+    
+    async def send():
+        calls.append(1)
+        request = httpx.Request('GET', "https://export.arxiv.org/api/query")
+        raise httpx.HTTPStatusError("503", request=request, response=httpx.Response(503, request=request))
+    
+    async def run():
+        for expected_calls in (3, 1):
+            calls.clear()
+            try:
+                await send_with_retries(send, "https://export.arxiv.org/api/query", 5, "test")
+                assert False, "should raise"
+            except httpx.HTTPStatusError:
+                pass
+            assert len(calls) == expected_calls
+    asyncio.run(run())
+    
+    budget = upstream_health()['retry_budget']
+    assert (budget['retries'], budget['exhausted']) == (2, 2)
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        test_breaker_opens_and_fails_fast(Path(directory))
+        print("✅ test_breaker_opens_and_fails_fast")
+    for test in (test_breaker_half_open_probe_closes_on_success, test_retry_budget_limits_retries):
+        test()
+        print(f"✅ {test.__name__}")
@@ -12,10 +12,10 @@ def test_download_existing_papers():
     
     try:
         # 저장된 논문 목록 가져오기
-        response = requests.get("http://localhost:8001/papers?limit=5")
+        response = requests.get("http://localhost:8001/papers?limit=5&fields=title,url,pdf_url")
         
         if response.status_code == 200:
-            papers = response.json()
+            papers = response.json()['papers']
             print(f"📁 저장된 논문: {len(papers)}개")
             
             downloaded_count = 0
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+검색어별 증분 수집 기준(watermark) 테스트 (가짜 arXiv 응답 사용, 외부 네트워크 불필요)
+- pytest test_incremental.py 또는 python test_incremental.py 로 실행
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from tools.arxiv_collector import ArxivCollector
+from tools.rate_limiter import PriorityRateLimiter
+
+def entry(arxiv_id, published, title=None):
+    return (f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id><title>{title or f'Paper {arxiv_id}'}</title>"
+            f"<summary>Abstract of {arxiv_id}</summary><published>{published}T00:00:00Z</published>"
+            f"<author><name>Kim</name></author></entry>")
+
+class FakeArxiv:
+    """제출일 최신순 결과를 start/max_results로 잘라 주는 arXiv API 흉내"""
+    def __init__(self, papers):
+        self.papers = sorted(papers, key=lambda paper: paper[1], reverse=True)
+        self.requests = 0
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        params = {key: values[0] for key, values in parse_qs(request.url.query.decode()).items()}
+        start, count = int(params['start']), int(params['max_results'])
+        entries = ''.join(entry(*paper) for paper in self.papers[start:start + count])
+        return httpx.Response(200, text=(
+            f'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f'<opensearch:totalResults>{len(self.papers)}</opensearch:totalResults>{entries}</feed>'
+        ))
+
+async def run_search(fake, watermark, known, max_results=3):
+    """수집 한 번 (서버처럼 찾은 논문을 저장한 것으로 표시하고 기준 저장)"""
+    async with httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)) as client:
+        collector = ArxivCollector(num_retries=0, client=client, scheduler=PriorityRateLimiter("test", rate=1000, burst=100))
+        papers = await collector.search("graph", max_results, known.__contains__, watermark=watermark)
+    known.update(paper['url'] for paper in papers)
+    return papers
+
+def test_watermark_holds_until_backlog_is_read():
+    """max_results개를 채워 중간에 멈추면 기준을 유지하고, 다음 수집에서 남은 논문을 이어서 읽음"""
+    old = [(f"2312.{i:05d}", f"2023-12-{i:02d}") for i in range(1, 4)]
+    new = [(f"2401.{i:05d}", f"2024-01-{i:02d}") for i in range(1, 11)]
+    fake = FakeArxiv(old + new)
+    known = {f"http://arxiv.org/abs/{arxiv_id}v1" for arxiv_id, _ in old}
+    watermark = {'newest_date': '2023-12-03', 'updated_at': '2023-12-03 10:00:00'}
+    
+    collected = []
+    for _ in range(4):
+        stored = dict(watermark)
+        collected += [paper['url'] for paper in asyncio.run(run_search(fake, watermark, known))]
+        if len(collected) < len(new):
+            assert watermark == stored, "watermark must not skip unread papers"
+    
+    assert sorted(collected) == sorted(f"http://arxiv.org/abs/{arxiv_id}v1" for arxiv_id, _ in new)
+    assert watermark == {'newest_date': '2024-01-10'}  # updated_at은 저장 시각으로 갱신
+    
+    # 따라잡은 뒤에는 새 논문이 없고 기준 날짜에서 바로 중단
+    assert asyncio.run(run_search(fake, watermark, known)) == []
+    assert watermark['newest_date'] == '2024-01-10'
+
+def test_paper_stored_by_other_query_is_skipped():
+    """다른 검색어로 먼저 저장된 최신 논문에서 멈추지 않고 이 검색어의 새 논문을 계속 찾음"""
+    fake = FakeArxiv([(f"2401.{i:05d}", f"2024-01-{i:02d}") for i in range(1, 6)])
+    known = {"http://arxiv.org/abs/2401.00005v1"}
+    watermark = {'newest_date': '2024-01-01'}
+    
+    papers = asyncio.run(run_search(fake, watermark, known, max_results=10))
+    assert [paper['url'] for paper in papers] == [f"http://arxiv.org/abs/2401.{i:05d}v1" for i in (4, 3, 2, 1)]
+    assert watermark['newest_date'] == '2024-01-05'
+
+def test_batch_watermark_holds_for_filled_keyword():
+    """일괄 검색에서 개수가 차서 논문을 남긴 키워드는 기준을 유지하고, 끝까지 읽은 키워드만 전진"""
+    fake = FakeArxiv(
+        [(f"2401.{i:05d}", f"2024-01-{i:02d}", f"Graph study {i}") for i in range(1, 7)]
+        + [(f"2401.{i:05d}", f"2024-01-{i:02d}", f"Neural study {i}") for i in (7, 8)]
+        + [("2312.00001", "2023-12-01", "Graph and neural survey")]
+    )
+    known = {"http://arxiv.org/abs/2312.00001v1"}
+    watermarks = {keyword: {'newest_date': '2023-12-31', 'updated_at': '2023-12-31 10:00:00'}
+                  for keyword in ('graph', 'neural')}
+    
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)) as client:
+            collector = ArxivCollector(num_retries=0, client=client, scheduler=PriorityRateLimiter("test", rate=1000, burst=100))
+            results = await collector.search_many({'graph': 2, 'neural': 5}, known.__contains__, watermarks=watermarks)
+        known.update(paper['url'] for papers in results.values() for paper in papers)
+        return {keyword: len(papers) for keyword, papers in results.items()}
+    
+    assert asyncio.run(run()) == {'graph': 2, 'neural': 2}
+    assert watermarks['graph'] == {'newest_date': '2023-12-31', 'updated_at': '2023-12-31 10:00:00'}
+    assert watermarks['neural'] == {'newest_date': '2024-01-08'}
+    
+    assert asyncio.run(run()) == {'graph': 2, 'neural': 0}
+    assert watermarks['graph']['newest_date'] == '2023-12-31'
+    assert asyncio.run(run()) == {'graph': 2, 'neural': 0}
+    assert watermarks['graph'] == {'newest_date': '2024-01-06'}
+
+if __name__ == "__main__":
+    for test in (test_watermark_holds_until_backlog_is_read, test_paper_stored_by_other_query_is_skipped,
+                 test_batch_watermark_holds_for_filled_keyword):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+일괄 검색 결과 분류용 키워드 매처 테스트
+- pytest test_keyword_matcher.py 또는 python test_keyword_matcher.py 로 실행
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from tools.keyword_matcher import KeywordMatcher
+
+def test_keywords_starting_at_same_position():
+    """같은 위치에서 시작하는 키워드를 순서와 관계없이 모두 찾음"""
+    text = "A machine learning security study"
+    assert KeywordMatcher(['machine learning', 'machine learning security']).match(text) == {
+        'machine learning', 'machine learning security'}
+    assert KeywordMatcher(['machine learning security', 'machine learning']).match(text) == {
+        'machine learning', 'machine learning security'}
+
+def test_overlapping_and_plural_keywords():
+    """다른 키워드 안의 키워드, 하이픈/복수형 차이, 단어 경계"""
+    matcher = KeywordMatcher(['deep learning', 'learning', 'neural networks', 'graph'])
+    assert matcher.match("Deep-learning for neural network pruning") == {'deep learning', 'learning', 'neural networks'}
+    assert matcher.match("Paragraphs about graphs") == {'graph'}
+    assert matcher.match("No match here") == set()
+
+if __name__ == "__main__":
+    for test in (test_keywords_starting_at_same_position, test_overlapping_and_plural_keywords):
+        test()
+        print(f"✅ {test.__name__}")
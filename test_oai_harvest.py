@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+arXiv OAI-PMH 대량 수집 테스트 (로컬 픽스처 서버 사용, 외부 네트워크 불필요)
+- pytest test_oai_harvest.py 또는 python test_oai_harvest.py 로 실행
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from database.paper_db import PaperDatabase
+from tools.arxiv_collector import ArxivCollector
+from tools.arxiv_harvester import DEFAULT_WINDOW_DAYS, ArxivHarvester
+from tools.rate_limiter import PriorityRateLimiter
+
+OAI_HEADER = '<?xml version="1.0" encoding="UTF-8"?><OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+
+def record(arxiv_id, categories, deleted=False):
+    """arXiv 메타데이터 형식의 OAI 레코드"""
+    if deleted:
+        return f'<record><header status="deleted"><identifier>oai:arXiv.org:{arxiv_id}</identifier></header></record>'
+    return f'''
+    <record>
+      <header><identifier>oai:arXiv.org:{arxiv_id}</identifier><datestamp>2024-01-10</datestamp><setSpec>cs</setSpec></header>
+      <metadata>
+        <arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+          <id>{arxiv_id}</id>
+          <created>2024-01-09</created>
+          <authors>
+            <author><keyname>Kim</keyname><forenames>Minsu</forenames></author>
+            <author><keyname>Lee</keyname><forenames>Jiwoo</forenames></author>
+          </authors>
+          <title>Paper {arxiv_id}:
+            a   test</title>
+          <categories>{categories}</categories>
+          <doi>10.1000/{arxiv_id}</doi>
+          <abstract>  Abstract of {arxiv_id}.  </abstract>
+        </arXiv>
+      </metadata>
+    </record>'''
+
+# 페이지 3개: 마지막 페이지는 빈 resumptionToken
+PAGES = {
+    None: ([record('2401.00001', 'cs.AI'), record('2401.00002', 'cs.CR'), record('2401.00003', 'cs.LG stat.ML')], 'token-2'),
+    'token-2': ([record('2401.00004', 'cs.AI cs.CL'), record('2401.00005', 'cs.AI', deleted=True)], 'token-3'),
+    'token-3': ([record('2401.00006', 'cs.LG')], ''),
+}
+
+class FixtureServer:
+    """OAI-PMH ListRecords를 흉내 내는 로컬 HTTP 서버"""
+    def __init__(self):
+        self.requests = []     # 받은 요청의 쿼리 파라미터
+        self.fail_tokens = set()  # 이 토큰으로 요청하면 500 응답 (한 번만)
+        self.expired_tokens = set()  # 이 토큰으로 요청하면 badResumptionToken
+        self.empty = False  # True면 noRecordsMatch
+        
+        fixture = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                fixture.requests.append(params)
+                token = params.get('resumptionToken')
+                
+                if token in fixture.fail_tokens:
+                    fixture.fail_tokens.discard(token)
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                
+                if token in fixture.expired_tokens:
+                    body = '<error code="badResumptionToken">expired</error>'
+                elif fixture.empty:
+                    body = '<error code="noRecordsMatch">no records</error>'
+                else:
+                    records, next_token = PAGES[token]
+                    body = f"<ListRecords>{''.join(records)}<resumptionToken>{next_token}</resumptionToken></ListRecords>"
+                
+                content = (OAI_HEADER + body + '</OAI-PMH>').encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/xml')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/oai"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+async def run_harvest(fixture, paper_db, default_days=DEFAULT_WINDOW_DAYS, **kwargs):
+    """픽스처 서버를 바라보는 수집기로 cs.AI, cs.LG 수집"""
+    async with httpx.AsyncClient() as client:
+        collector = ArxivCollector(
+            num_retries=0, client=client, oai_url=fixture.url,
+            scheduler=PriorityRateLimiter("test", rate=1000, burst=100),
+        )
+        harvester = ArxivHarvester(collector, paper_db, default_days)
+        return await harvester.harvest(['cs.AI', 'cs.LG'], **kwargs)
+
+def with_fixture(test):
+    """테스트마다 새 픽스처 서버와 임시 데이터베이스 준비"""
+    def wrapper():
+        fixture = FixtureServer()
+        with tempfile.TemporaryDirectory() as directory:
+            paper_db = PaperDatabase(str(Path(directory) / "papers.db"))
+            try:
+                asyncio.run(test(fixture, paper_db))
+            finally:
+                paper_db.close()
+                fixture.close()
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+@with_fixture
+async def test_harvest_follows_resumption_tokens(fixture, paper_db):
+    """토큰을 따라 모든 페이지를 받고, 설정된 카테고리 논문만 저장"""
+    summary = await run_harvest(fixture, paper_db, until_date='2024-01-31')
+    
+    assert list(summary) == ['cs']
+    assert summary['cs']['requests'] == 3
+    assert summary['cs']['records'] == 5       # 삭제된 레코드 제외
+    assert summary['cs']['added'] == 4         # cs.CR 논문 제외
+    assert [request.get('resumptionToken') for request in fixture.requests] == [None, 'token-2', 'token-3']
+    assert fixture.requests[0] == {'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': 'cs',
+                                   'from': '2024-01-24', 'until': '2024-01-31'}
+    
+    paper = await paper_db.get_paper_by_arxiv_id('2401.00003')
+    assert paper['title'] == 'Paper 2401.00003: a test'
+    assert paper['authors'] == ['Minsu Kim', 'Jiwoo Lee']
+    assert paper['doi'] == '10.1000/2401.00003'
+    assert paper['published_date'] == '2024-01-09'
+    assert await paper_db.get_paper_by_arxiv_id('2401.00002') is None
+    
+    checkpoint = await paper_db.get_harvest_checkpoint('arxiv-oai:cs')
+    assert checkpoint['resumption_token'] is None
+    assert checkpoint['until_date'] == '2024-01-31'
+    assert checkpoint['records'] == 5
+
+@with_fixture
+async def test_harvest_resumes_from_checkpoint(fixture, paper_db):
+    """중간 페이지에서 실패하면 저장된 토큰부터 재개"""
+    fixture.fail_tokens.add('token-3')
+    try:
+        await run_harvest(fixture, paper_db, until_date='2024-01-31')
+        assert False, "harvest should fail on token-3"
+    except httpx.HTTPStatusError:
+        pass
+    
+    # 실패 전 페이지까지는 저장되고 체크포인트는 실패한 페이지를 가리킴
+    checkpoint = await paper_db.get_harvest_checkpoint('arxiv-oai:cs')
+    assert checkpoint['resumption_token'] == 'token-3'
+    assert await paper_db.get_paper_by_arxiv_id('2401.00004') is not None
+    
+    fixture.requests.clear()
+    summary = await run_harvest(fixture, paper_db)
+    assert summary['cs']['resumed'] is True
+    assert summary['cs']['until'] == '2024-01-31'
+    assert fixture.requests == [{'verb': 'ListRecords', 'resumptionToken': 'token-3'}]
+    assert await paper_db.get_paper_by_arxiv_id('2401.00006') is not None
+    assert (await paper_db.get_harvest_checkpoint('arxiv-oai:cs'))['records'] == 5
+
+@with_fixture
+async def test_harvest_restarts_window_when_token_expired(fixture, paper_db):
+    """저장된 토큰이 만료되었으면 같은 구간을 처음부터 다시 수집"""
+    await paper_db.save_harvest_checkpoint('arxiv-oai:cs', '2024-01-01', '2024-01-31', 'token-old', 2)
+    fixture.expired_tokens.add('token-old')
+    
+    summary = await run_harvest(fixture, paper_db)
+    assert fixture.requests[1] == {'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': 'cs',
+                                   'from': '2024-01-01', 'until': '2024-01-31'}
+    assert summary['cs']['added'] == 4
+    assert (await paper_db.get_harvest_checkpoint('arxiv-oai:cs'))['resumption_token'] is None
+
+@with_fixture
+async def test_incremental_harvest_starts_at_last_until(fixture, paper_db):
+    """완료된 구간 다음 수집은 마지막 until 날짜부터, 레코드가 없어도 체크포인트 전진"""
+    await run_harvest(fixture, paper_db, until_date='2024-01-31')
+    fixture.requests.clear()
+    fixture.empty = True
+    
+    summary = await run_harvest(fixture, paper_db, until_date='2024-02-29')
+    assert fixture.requests == [{'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': 'cs',
+                                 'from': '2024-01-31', 'until': '2024-02-29'}]
+    assert summary['cs']['added'] == 0
+    checkpoint = await paper_db.get_harvest_checkpoint('arxiv-oai:cs')
+    assert (checkpoint['from_date'], checkpoint['until_date']) == ('2024-01-31', '2024-02-29')
+
+@with_fixture
+async def test_first_harvest_is_bounded_to_recent_window(fixture, paper_db):
+    """체크포인트가 없으면 set 전체가 아니라 최근 기간만, 과거 데이터 전체는 from_date를 지정해야 수집"""
+    today = datetime.utcnow().date()
+    summary = await run_harvest(fixture, paper_db, default_days=3)
+    assert fixture.requests[0] == {'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': 'cs',
+                                   'from': (today - timedelta(days=3)).isoformat(), 'until': today.isoformat()}
+    assert summary['cs']['from'] == (today - timedelta(days=3)).isoformat()
+    
+    fixture.requests.clear()
+    await run_harvest(fixture, paper_db, from_date='1990-01-01', until_date='2024-01-31')
+    assert fixture.requests[0] == {'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': 'cs',
+                                   'from': '1990-01-01', 'until': '2024-01-31'}
+
+def api_feed(request):
+    """arXiv API 검색 응답: 대량 수집으로 이미 저장된 논문(버전 있는 URL) 2개와 새 논문 1개"""
+    entries = ''.join(
+        f"<entry><id>http://arxiv.org/abs/{arxiv_id}</id><title>Paper {arxiv_id}</title><summary>Abstract</summary>"
+        f"<published>2024-01-09T00:00:00Z</published><author><name>Kim</name></author></entry>"
+        for arxiv_id in ('2401.00001v1', '2401.00003v2', '2401.00099v1')
+    )
+    return httpx.Response(200, text=(
+        f'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+        f'<opensearch:totalResults>3</opensearch:totalResults>{entries}</feed>'
+    ))
+
+@with_fixture
+async def test_api_search_skips_harvested_papers(fixture, paper_db):
+    """대량 수집으로 버전 없이 저장된 논문은 API 검색에서 새 논문으로 세지 않음"""
+    await run_harvest(fixture, paper_db, until_date='2024-01-31')
+    assert paper_db.dedup_index.is_known('http://arxiv.org/abs/2401.00001v1')
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(api_feed)) as client:
+        collector = ArxivCollector(num_retries=0, client=client, scheduler=PriorityRateLimiter("test", rate=1000, burst=100))
+        papers = await collector.search("test", 2, paper_db.dedup_index.is_known)
+    assert [paper['url'] for paper in papers] == ['http://arxiv.org/abs/2401.00099v1']
+    assert len(await paper_db.add_papers(papers)) == 1
+
+if __name__ == "__main__":
+    for test in (test_harvest_follows_resumption_tokens, test_harvest_resumes_from_checkpoint,
+                 test_harvest_restarts_window_when_token_expired, test_incremental_harvest_starts_at_last_until,
+                 test_first_harvest_is_bounded_to_recent_window, test_api_search_skips_harvested_papers):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+논문 데이터베이스 테스트 (임시 데이터베이스 사용)
+- pytest test_paper_db.py 또는 python test_paper_db.py 로 실행
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from database.paper_db import PaperDatabase
+
+def paper(i):
+    return {'title': f"Paper {i}", 'url': f"https://example.org/paper/{i}", 'source': 'test', 'abstract': '', 'authors': ['Kim']}
+
+def with_database(test):
+    """테스트마다 임시 데이터베이스 준비"""
+    def wrapper():
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = str(Path(directory) / "papers.db")
+            paper_db = PaperDatabase(db_path)
+            try:
+                asyncio.run(test(paper_db, db_path))
+            finally:
+                paper_db.close()
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+@with_database
+async def test_write_batch_failure_resolves_all_callers(paper_db, db_path):
+    """다른 연결이 쓰기 잠금을 잡고 있어 BEGIN IMMEDIATE가 실패해도 모든 호출자가 오류를 받음"""
+    paper_db._writer.execute("PRAGMA busy_timeout = 200")
+    blocker = sqlite3.connect(db_path)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(paper_db.add_papers([paper(i)]) for i in range(3)), return_exceptions=True), timeout=5
+        )
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert all(isinstance(result, sqlite3.OperationalError) for result in results), results
+    assert 'locked' in str(results[0])
+    
+    # 잠금이 풀리면 다시 정상적으로 쓰기
+    assert len(await paper_db.add_papers([paper(1), paper(2)])) == 2
+
+@with_database
+async def test_write_after_close_raises(paper_db, db_path):
+    """닫힌 뒤의 쓰기는 기다리지 않고 바로 오류"""
+    paper_db.close()
+    try:
+        await asyncio.wait_for(paper_db.add_papers([paper(1)]), timeout=5)
+        assert False, "write should fail after close"
+    except RuntimeError:
+        pass
+
+BASELINE_SCHEMA = '''
+    CREATE TABLE papers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        authors TEXT NOT NULL,
+        abstract TEXT,
+        url TEXT UNIQUE NOT NULL,
+        pdf_url TEXT,
+        published_date TEXT,
+        keywords TEXT,
+        source TEXT NOT NULL,
+        file_path TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+def test_identifier_migration_from_baseline_database():
+    """식별자 컬럼이 없던 데이터베이스: 식별자를 채우고, 이미 중복 저장된 논문은 첫 행에만 남김"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = str(Path(directory) / "papers.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(BASELINE_SCHEMA)
+        conn.executemany(
+            "INSERT INTO papers (title, authors, abstract, url, pdf_url, keywords, source) VALUES (?, '[]', '', ?, ?, '[]', ?)",
+            [
+                ("Paper v1", "http://arxiv.org/abs/2401.00001v1", "http://arxiv.org/pdf/2401.00001v1", 'arxiv'),
+                ("Paper v2", "http://arxiv.org/abs/2401.00001v2", "http://arxiv.org/pdf/2401.00001v2", 'arxiv'),
+                ("PubMed", "https://pubmed.ncbi.nlm.nih.gov/38000001/", "https://doi.org/10.1000/ABC", 'pubmed'),
+                ("Same DOI", "https://pubmed.ncbi.nlm.nih.gov/38000002/", "https://doi.org/10.1000/abc", 'pubmed'),
+            ],
+        )
+        conn.commit()
+        conn.close()
+        
+        paper_db = PaperDatabase(db_path)
+        try:
+            rows = [paper_db._row_to_paper(row) for row in sqlite3.connect(db_path).execute(
+                "SELECT id, title, authors, abstract, url, pdf_url, published_date, keywords, source, file_path, "
+                "created_at, arxiv_id, pmid, doi FROM papers ORDER BY id")]
+            assert [(row['arxiv_id'], row['pmid'], row['doi']) for row in rows] == [
+                ('2401.00001', None, None),
+                (None, None, None),
+                (None, '38000001', '10.1000/abc'),
+                (None, '38000002', None),
+            ]
+            index_names = {name for (name,) in sqlite3.connect(db_path).execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert {'idx_papers_arxiv_id', 'idx_papers_pmid', 'idx_papers_doi'} <= index_names
+            
+            # 같은 DOI나 arXiv ID로는 새로 저장되지 않음
+            assert asyncio.run(paper_db.add_papers([
+                dict(paper(9), url="https://pubmed.ncbi.nlm.nih.gov/38000009/", doi="10.1000/abc"),
+            ])) == []
+        finally:
+            paper_db.close()
+
+@with_database
+async def test_newer_arxiv_version_updates_existing_row(paper_db, db_path):
+    """이미 저장된 arXiv 논문의 새 버전은 기존 행을 갱신하고 새 논문처럼 반환"""
+    [first] = await paper_db.add_papers([dict(paper(1), url="http://arxiv.org/abs/2401.00001v1", source='arxiv')])
+    
+    newer = dict(paper(1), title="Paper 1 (revised)", url="http://arxiv.org/abs/2401.00001v2", source='arxiv')
+    saved = await paper_db.add_papers([paper(2), newer, paper(3)])
+    assert [item['url'] for item in saved] == [paper(2)['url'], newer['url'], paper(3)['url']]
+    assert saved[1]['id'] == first['id']
+    
+    stored = await paper_db.get_paper_by_arxiv_id('2401.00001')
+    assert (stored['id'], stored['title'], stored['url']) == (first['id'], "Paper 1 (revised)", newer['url'])
+    assert paper_db.dedup_index.is_known("http://arxiv.org/abs/2401.00001v2")
+    assert not paper_db.dedup_index.is_known("http://arxiv.org/abs/2401.00001v3")
+    
+    # 같은 버전이나 이전 버전은 무시
+    assert await paper_db.add_papers([dict(newer), dict(newer, url="http://arxiv.org/abs/2401.00001v1")]) == []
+    assert (await paper_db.get_paper_by_arxiv_id('2401.00001'))['url'] == newer['url']
+
+@with_database
+async def test_cross_source_doi_collision_is_skipped(paper_db, db_path):
+    """다른 소스에서 같은 DOI로 들어온 논문은 저장하지 않음 (DOI는 대소문자/URL 형식 무시)"""
+    await paper_db.add_papers([dict(paper(1), url="http://arxiv.org/abs/2401.00001v1", source='arxiv',
+                                    doi="10.1000/Shared.1")])
+    saved = await paper_db.add_papers([
+        dict(paper(2), url="https://pubmed.ncbi.nlm.nih.gov/38000001/", source='pubmed',
+             pdf_url="https://doi.org/10.1000/shared.1"),
+        dict(paper(3), url="https://pubmed.ncbi.nlm.nih.gov/38000002/", source='pubmed', doi="10.1000/other"),
+    ])
+    assert [item['url'] for item in saved] == ["https://pubmed.ncbi.nlm.nih.gov/38000002/"]
+    assert (await paper_db.get_paper_by_doi('10.1000/SHARED.1'))['source'] == 'arxiv'
+    assert await paper_db.get_paper_by_pmid('38000001') is None
+
+def fts_integrity_check(db_path):
+    """전문 검색 인덱스가 papers 테이블 내용과 일치하는지 확인 (어긋나면 sqlite3.DatabaseError)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("INSERT INTO papers_fts(papers_fts, rank) VALUES ('integrity-check', 1)")
+    finally:
+        conn.close()
+
+@with_database
+async def test_search_index_follows_insert_update_delete(paper_db, db_path):
+    """논문 추가/새 버전 갱신/삭제가 트리거로 전문 검색 인덱스에 반영됨"""
+    assert paper_db.fts_enabled
+    [first] = await paper_db.add_papers([dict(paper(1), title="Quantum annealing", url="http://arxiv.org/abs/2401.00001v1")])
+    await paper_db.add_papers([dict(paper(2), title="Protein folding")])
+    fts_integrity_check(db_path)
+    assert [item['id'] for item in await paper_db.search_papers("annealing")] == [first['id']]
+    
+    await paper_db.add_papers([dict(paper(1), title="Quantum tunneling", url="http://arxiv.org/abs/2401.00001v2")])
+    fts_integrity_check(db_path)
+    assert await paper_db.search_papers("annealing") == []
+    assert [item['id'] for item in await paper_db.search_papers("tunneling")] == [first['id']]
+    
+    await paper_db.delete_paper(first['id'])
+    fts_integrity_check(db_path)
+    assert await paper_db.search_papers("quantum") == []
+    assert [item['title'] for item in await paper_db.search_papers("protein")] == ["Protein folding"]
+
+@with_database
+async def test_search_ranks_title_match_above_abstract_match(paper_db, db_path):
+    """BM25 가중치: 제목에 나온 논문이 초록에만 나온 논문보다 앞에 옴"""
+    await paper_db.add_papers([
+        dict(paper(1), title="Survey of graph methods", abstract="We review transformers for vision."),
+        dict(paper(2), title="Transformers for vision", abstract="We review a survey of graph methods."),
+        dict(paper(3), title="Unrelated work", abstract="Nothing to see here."),
+    ])
+    results = await paper_db.search_papers("transformers")
+    assert [item['title'] for item in results] == ["Transformers for vision", "Survey of graph methods"]
+    assert results[0]['score'] < results[1]['score']  # bm25는 낮을수록 관련도 높음
+    
+    results = await paper_db.search_papers("graph survey")
+    assert [item['title'] for item in results] == ["Survey of graph methods", "Transformers for vision"]
+
+@with_database
+async def test_insert_batch_returns_ids_in_input_order(paper_db, db_path):
+    """여러 행 INSERT ... RETURNING의 ID를 입력 순서대로 돌려주고, 묶음 내부 중복과 이미 저장된 논문은 제외"""
+    await paper_db.add_papers([paper(2)])
+    
+    for batch_size in (None, 2):
+        offset = 0 if batch_size is None else 10
+        papers = [paper(offset + 5), paper(offset + 3), paper(2), paper(offset + 3), paper(offset + 4)]
+        saved = await paper_db.add_papers(papers, batch_size=batch_size)
+        assert [item['url'] for item in saved] == [paper(offset + i)['url'] for i in (5, 3, 4)]
+        assert saved == [papers[0], papers[1], papers[4]]
+        assert 'id' not in papers[3]
+        
+        for item in saved:
+            assert (await paper_db.get_paper_by_url(item['url']))['id'] == item['id']
+        assert [item['id'] for item in saved] == sorted(item['id'] for item in saved)
+    
+    assert len(await paper_db.get_papers(limit=100)) == 7
+
+def daily_stats_from_papers(db_path):
+    """papers 테이블을 직접 GROUP BY로 집계한 결과 (트리거로 유지되는 집계와 비교용)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('''
+            SELECT date(created_at), source, COUNT(*), SUM(file_path IS NOT NULL)
+            FROM papers GROUP BY 1, 2 ORDER BY 1, 2
+        ''').fetchall()
+    finally:
+        conn.close()
+
+@with_database
+async def test_daily_stats_follow_insert_update_delete(paper_db, db_path):
+    """일별 집계가 논문 추가, PDF 경로 갱신(has_pdf 전환), 삭제를 따라감"""
+    saved = await paper_db.add_papers([paper(1), paper(2), dict(paper(3), source='pubmed')])
+    stats = await paper_db.get_stats(days=1)
+    assert stats['by_source'] == {'test': {'papers': 2, 'with_pdf': 0}, 'pubmed': {'papers': 1, 'with_pdf': 0}}
+    assert [(day['papers'], day['with_pdf']) for day in stats['by_day']] == [(3, 0)]
+    
+    # PDF 없음 -> 있음, 다른 경로로 다시 갱신해도 한 번만 셈
+    pdf_path = str(Path(db_path).parent / "paper1.pdf")
+    Path(pdf_path).write_bytes(b"%PDF")
+    await paper_db.update_paper_file_path(saved[0]['id'], pdf_path)
+    await paper_db.update_paper_file_path(saved[0]['id'], pdf_path)
+    await paper_db.update_paper_file_path(saved[2]['id'], "/tmp/missing.pdf")
+    stats = await paper_db.get_stats()
+    assert (stats['total'], stats['with_pdf']) == (3, 2)
+    assert stats['by_source']['test'] == {'papers': 2, 'with_pdf': 1}
+    
+    # PDF가 있는 논문 삭제는 두 값 모두에서 빠짐
+    await paper_db.delete_paper(saved[0]['id'])
+    assert not Path(pdf_path).exists()
+    stats = await paper_db.get_stats()
+    assert stats['by_source'] == {'test': {'papers': 1, 'with_pdf': 0}, 'pubmed': {'papers': 1, 'with_pdf': 1}}
+    
+    conn = sqlite3.connect(db_path)
+    rollup = conn.execute("SELECT day, source, papers, with_pdf FROM paper_daily_stats WHERE papers > 0 ORDER BY 1, 2").fetchall()
+    conn.close()
+    assert rollup == daily_stats_from_papers(db_path)
+
+if __name__ == "__main__":
+    for test in (test_write_batch_failure_resolves_all_callers, test_write_after_close_raises,
+                 test_identifier_migration_from_baseline_database, test_newer_arxiv_version_updates_existing_row,
+                 test_cross_source_doi_collision_is_skipped, test_search_index_follows_insert_update_delete,
+                 test_search_ranks_title_match_above_abstract_match, test_insert_batch_returns_ids_in_input_order,
+                 test_daily_stats_follow_insert_update_delete):
+        test()
+        print(f"✅ {test.__name__}")
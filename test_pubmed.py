@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+PubMed 수집기 테스트 (실제 efetch 응답 형식의 픽스처 사용, 외부 네트워크 불필요)
+- pytest test_pubmed.py 또는 python test_pubmed.py 로 실행
+"""
+
+import asyncio
+import sys
+from contextlib import aclosing
+from pathlib import Path
+from urllib.parse import parse_qsl
+import xml.etree.ElementTree as ET
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from tools.pubmed_collector import INCREMENTAL_SORT, PubMedCollector
+from tools.rate_limiter import PriorityRateLimiter
+
+def pubmed_article(pmid, doi=None, elocation_doi=None, title=None):
+    """실제 efetch(retmode=xml) 응답과 같은 구조의 PubmedArticle (ArticleIdList는 PubmedData 아래)"""
+    elocation = f'<ELocationID EIdType="doi" ValidYN="Y">{elocation_doi}</ELocationID>' if elocation_doi else ''
+    doi_id = f'<ArticleId IdType="doi">{doi}</ArticleId>' if doi else ''
+    return f'''
+    <PubmedArticle>
+      <MedlineCitation Status="MEDLINE" Owner="NLM">
+        <PMID Version="1">{pmid}</PMID>
+        <Article PubModel="Print-Electronic">
+          <Journal><JournalIssue CitedMedium="Internet"><PubDate><Year>2024</Year><Month>3</Month></PubDate></JournalIssue></Journal>
+          <ArticleTitle>{title or f'Paper {pmid}'}</ArticleTitle>
+          {elocation}
+          <Abstract><AbstractText>Abstract of {pmid}.</AbstractText></Abstract>
+          <AuthorList CompleteYN="Y">
+            <Author ValidYN="Y"><LastName>Kim</LastName><ForeName>Minsu</ForeName></Author>
+          </AuthorList>
+        </Article>
+        <KeywordList Owner="NOTNLM"><Keyword MajorTopicYN="N">genomics</Keyword></KeywordList>
+      </MedlineCitation>
+      <PubmedData>
+        <History><PubMedPubDate PubStatus="entrez"><Year>2024</Year><Month>3</Month><Day>2</Day></PubMedPubDate></History>
+        <PublicationStatus>ppublish</PublicationStatus>
+        <ArticleIdList>
+          <ArticleId IdType="pubmed">{pmid}</ArticleId>
+          {doi_id}
+          <ArticleId IdType="pmc">PMC{pmid}</ArticleId>
+        </ArticleIdList>
+      </PubmedData>
+    </PubmedArticle>'''
+
+def collector(client=None):
+    return PubMedCollector(client=client, scheduler=PriorityRateLimiter("test", rate=1000, burst=100))
+
+def test_parse_article_reads_doi_from_pubmed_data():
+    """DOI는 PubmedData의 ArticleIdList에서, 없으면 Article의 ELocationID에서 읽음"""
+    paper = collector()._parse_article(ET.fromstring(pubmed_article(38000001, doi='10.1000/abc.1')))
+    assert paper['doi'] == '10.1000/abc.1'
+    assert paper['pdf_url'] == 'https://doi.org/10.1000/abc.1'
+    assert paper['url'] == 'https://pubmed.ncbi.nlm.nih.gov/38000001/'
+    assert paper['authors'] == ['Minsu Kim']
+    assert paper['keywords'] == ['genomics']
+    assert paper['published_date'] == '2024-03-01'
+    
+    paper = collector()._parse_article(ET.fromstring(pubmed_article(38000002, elocation_doi='10.1000/abc.2')))
+    assert paper['doi'] == '10.1000/abc.2'
+    
+    paper = collector()._parse_article(ET.fromstring(pubmed_article(38000003)))
+    assert paper['doi'] is None and paper['pdf_url'] is None
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """응답 본문을 chunk_size 바이트씩 나눠 보내는 스트림 (태그/UTF-8 문자 중간에서 끊김)"""
+    def __init__(self, body, chunk_size):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.chunks = 0
+    
+    async def __aiter__(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            self.chunks += 1
+            yield self.body[start:start + self.chunk_size]
+
+class FakePubMed:
+    """esearch(히스토리 서버)와 retstart/retmax로 페이지를 주는 efetch 흉내"""
+    def __init__(self, pmids, chunk_size=4096, titles=None):
+        self.pmids = pmids
+        self.chunk_size = chunk_size
+        self.titles = titles or {}
+        self.searches = []  # esearch 쿼리 파라미터
+        self.fetches = []   # efetch POST 본문 파라미터
+        self.streams = []
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if 'esearch' in request.url.path:
+            self.searches.append(dict(request.url.params))
+            return httpx.Response(200, text=(
+                f"<eSearchResult><Count>{len(self.pmids)}</Count><QueryKey>1</QueryKey>"
+                f"<WebEnv>W</WebEnv></eSearchResult>"
+            ))
+        
+        params = dict(parse_qsl(request.content.decode()))
+        self.fetches.append(params)
+        if 'id' in params:
+            pmids = [int(pmid) for pmid in params['id'].split(',')]
+        else:
+            start = int(params['retstart'])
+            pmids = self.pmids[start:start + int(params['retmax'])]
+        body = ('<?xml version="1.0" encoding="UTF-8"?><PubmedArticleSet>'
+                + ''.join(pubmed_article(pmid, doi=f'10.1000/{pmid}', title=self.titles.get(pmid)) for pmid in pmids)
+                + '</PubmedArticleSet>')
+        stream = ChunkedStream(body.encode('utf-8'), self.chunk_size)
+        self.streams.append(stream)
+        return httpx.Response(200, stream=stream)
+
+def run_with_fake(fake, coroutine):
+    """가짜 PubMed를 바라보는 수집기로 coroutine(collector) 실행"""
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)) as client:
+            return await coroutine(collector(client))
+    return asyncio.run(run())
+
+def test_efetch_stream_parses_articles_split_across_chunks():
+    """efetch 응답이 태그나 UTF-8 문자 중간에서 끊겨 와도 논문을 빠짐없이 같은 내용으로 파싱"""
+    pmids = [38000001, 38000002, 38000003]
+    titles = {38000002: 'Naïve Bayes für Genomik — 유전체 분석'}
+    
+    async def details(collector):
+        return await collector._fetch_paper_details([str(pmid) for pmid in pmids])
+    
+    expected = run_with_fake(FakePubMed(pmids, titles=titles), details)
+    assert [paper['title'] for paper in expected] == ['Paper 38000001', titles[38000002], 'Paper 38000003']
+    assert [paper['doi'] for paper in expected] == [f'10.1000/{pmid}' for pmid in pmids]
+    
+    for chunk_size in (1, 7, 64):
+        fake = FakePubMed(pmids, chunk_size=chunk_size, titles=titles)
+        assert run_with_fake(fake, details) == expected
+        assert fake.streams[0].chunks > len(pmids)
+
+def test_paging_stops_at_max_results():
+    """새 논문이 max_results개 모이면 다음 페이지를 요청하지 않고, 모두 중복이면 최대치(limit)까지만 읽음"""
+    pmids = list(range(38000100, 38000000, -1))
+    known = {f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in pmids[:8]}
+    
+    # max_results=2: 첫 요청 6개(3배)가 모두 중복이라 두 번째 페이지에서 2개를 찾고 중단
+    fake = FakePubMed(pmids)
+    papers = run_with_fake(fake, lambda collector: collector.search("crispr", 2, known.__contains__))
+    assert [paper['url'] for paper in papers] == [f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in pmids[8:10]]
+    assert [(fetch['retstart'], fetch['retmax']) for fetch in fake.fetches] == [('0', '6'), ('6', '6')]
+    
+    # 모두 중복: max_results의 MAX_OVERFETCH_FACTOR배(40개)까지만 읽고 중단
+    fake = FakePubMed(pmids)
+    assert run_with_fake(fake, lambda collector: collector.search("crispr", 2, lambda url: True)) == []
+    assert [int(fetch['retstart']) for fetch in fake.fetches] == list(range(0, 40, 6))
+    assert sum(int(fetch['retmax']) for fetch in fake.fetches) == 40
+    
+    # iter_search도 limit이 없으면 max_results 기준으로 제한
+    async def iterate(collector):
+        async with aclosing(collector.iter_search("crispr", 1, lambda url: True, batch_size=10, prefetch=1)) as papers:
+            return [paper async for paper in papers]
+    
+    fake = FakePubMed(pmids)
+    assert run_with_fake(fake, iterate) == []
+    assert [(fetch['retstart'], fetch['retmax']) for fetch in fake.fetches] == [('0', '10'), ('10', '10')]
+
+def test_incremental_search_does_not_depend_on_result_order():
+    """증분 수집은 esearch 정렬을 명시하고, 결과 순서와 관계없이 지난번에 본 PMID 이하만 건너뜀"""
+    fake = FakePubMed([38000003, 38000007, 38000001, 38000009, 38000005])
+    watermark = {'newest_id': '38000005', 'updated_at': '2024-03-01 10:00:00'}
+    papers = run_with_fake(fake, lambda collector: collector.search("crispr", 10, watermark=watermark))
+    
+    assert fake.searches[0]['sort'] == INCREMENTAL_SORT
+    assert (fake.searches[0]['datetype'], fake.searches[0]['mindate']) == ('edat', '2024/03/01')
+    assert [paper['url'] for paper in papers] == [f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in (38000007, 38000009)]
+    assert watermark == {'newest_id': '38000009'}  # 결과 끝까지 읽었으므로 전진 (updated_at은 저장 시각으로 갱신)
+
+if __name__ == "__main__":
+    for test in (test_parse_article_reads_doi_from_pubmed_data, test_efetch_stream_parses_articles_split_across_chunks,
+                 test_paging_stops_at_max_results, test_incremental_search_does_not_depend_on_result_order):
+        test()
+        print(f"✅ {test.__name__}")
@@ -32,7 +32,10 @@ def test_search():
         print(f"검색 응답 상태: {response.status_code}")
         
         if response.status_code == 200:
-            papers = response.json()
+            result = response.json()
+            papers = result['papers']
+            for source, status in result['sources'].items():
+                print(f"소스 {source}: {status['status']} ({status['count']}개, {status['elapsed_ms']}ms)")
             print(f"수집된 논문 수: {len(papers)}")
             
             if papers:
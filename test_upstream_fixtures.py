@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+외부 API 응답 기록/재생과 가짜 외부 API 서버 테스트 (외부 네트워크 불필요)
+- pytest test_upstream_fixtures.py 또는 python test_upstream_fixtures.py 로 실행
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from server.fake_upstream import create_app
+from tools.arxiv_collector import ArxivCollector
+from tools.pdf_processor import PDFProcessor
+from tools.pubmed_collector import PubMedCollector
+from tools.rate_limiter import PriorityRateLimiter
+from tools.upstream_fixtures import FixtureStore, RecordingTransport, ReplayTransport, UpstreamRedirectTransport
+
+def atom_feed(count):
+    """arXiv API 검색 결과 (논문 count개)"""
+    entries = ''.join(
+        f"<entry><id>http://arxiv.org/abs/2401.{i:05d}v1</id><title>Paper {i}</title><summary>Abstract {i}</summary>"
+        f"<published>2024-01-{i:02d}T00:00:00Z</published><author><name>Author {i}</name></author></entry>"
+        for i in range(count, 0, -1)
+    )
+    return (f'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f'<opensearch:totalResults>{count}</opensearch:totalResults>{entries}</feed>')
+
+def pubmed_upstream(request):
+    """E-utilities esearch/efetch 응답"""
+    if 'esearch' in request.url.path:
+        return httpx.Response(200, text="<eSearchResult><Count>2</Count><QueryKey>1</QueryKey><WebEnv>W</WebEnv></eSearchResult>")
+    articles = ''.join(
+        f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article><ArticleTitle>Title {pmid}</ArticleTitle>"
+        f"</Article></MedlineCitation></PubmedArticle>"
+        for pmid in (102, 101)
+    )
+    return httpx.Response(200, text=f"<PubmedArticleSet>{articles}</PubmedArticleSet>")
+
+def scheduler():
+    return PriorityRateLimiter("test", rate=1000, burst=100)
+
+class CountingUpstream:
+    """MockTransport 처리기, 받은 요청 수를 셈"""
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = 0
+    
+    def __call__(self, request):
+        self.calls += 1
+        return self.handler(request)
+
+def test_record_then_replay_arxiv_search():
+    """기록한 응답만으로 같은 검색 결과를 재현"""
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            upstream = CountingUpstream(lambda request: httpx.Response(200, text=atom_feed(5)))
+            transport = RecordingTransport(httpx.MockTransport(upstream), FixtureStore(directory))
+            async with httpx.AsyncClient(transport=transport) as client:
+                recorded = await ArxivCollector(num_retries=0, client=client, scheduler=scheduler()).search("graph neural", 3)
+            assert upstream.calls == 1
+            
+            async with httpx.AsyncClient(transport=ReplayTransport(FixtureStore(directory))) as client:
+                collector = ArxivCollector(num_retries=0, client=client, scheduler=scheduler())
+                replayed = await collector.search("graph neural", 3)
+                assert [paper.to_dict() for paper in replayed] == [paper.to_dict() for paper in recorded]
+                assert [paper['title'] for paper in replayed] == ['Paper 5', 'Paper 4', 'Paper 3']
+                
+                # 기록에 없는 요청은 404
+                response = await client.get("https://export.arxiv.org/api/query", params={'search_query': 'other'})
+                assert response.status_code == 404
+                assert response.headers['x-fixture-missing'] == '1'
+            assert upstream.calls == 1
+    asyncio.run(run())
+
+def test_credentials_are_not_recorded():
+    """API 키는 fixture에 저장하지 않고, 키 없이 재생해도 같은 요청으로 찾음"""
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            transport = RecordingTransport(httpx.MockTransport(pubmed_upstream), FixtureStore(directory))
+            async with httpx.AsyncClient(transport=transport) as client:
+                collector = PubMedCollector(api_key="secret-key", client=client, scheduler=scheduler())
+                recorded = await collector.search("crispr", 2)
+            
+            files = list(Path(directory).rglob('*'))
+            assert any(path.suffix == '.json' for path in files)
+            assert not any(b'secret-key' in path.read_bytes() for path in files if path.is_file())
+            
+            async with httpx.AsyncClient(transport=ReplayTransport(FixtureStore(directory))) as client:
+                replayed = await PubMedCollector(client=client, scheduler=scheduler()).search("crispr", 2)
+            assert [paper['url'] for paper in replayed] == [paper['url'] for paper in recorded]
+            assert len(replayed) == 2
+    asyncio.run(run())
+
+def test_fake_server_latency_throttle_and_errors():
+    """가짜 서버: 지연 후 기록된 응답, 호스트별 요청 한도, 오류 주입"""
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            transport = RecordingTransport(httpx.MockTransport(lambda request: httpx.Response(200, text=atom_feed(2))),
+                                           FixtureStore(directory))
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get("https://export.arxiv.org/api/query", params={'search_query': 'a'})
+            
+            app = create_app(FixtureStore(directory), latency_ms=20, rate=1, burst=1, seed=1)
+            redirect = UpstreamRedirectTransport(httpx.ASGITransport(app=app), "http://fake")
+            async with httpx.AsyncClient(transport=redirect) as client:
+                start = asyncio.get_running_loop().time()
+                response = await client.get("https://export.arxiv.org/api/query", params={'search_query': 'a'})
+                assert response.status_code == 200
+                assert asyncio.get_running_loop().time() - start >= 0.02
+                assert 'Paper 2' in response.text
+                assert str(response.url) == "https://export.arxiv.org/api/query?search_query=a"
+                
+                # 초당 1건 한도를 넘으면 arXiv처럼 503 + Retry-After
+                throttled = await client.get("https://export.arxiv.org/api/query", params={'search_query': 'a'})
+                assert throttled.status_code == 503
+                assert int(throttled.headers['retry-after']) >= 1
+            
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake") as client:
+                stats = (await client.get("/_fake/stats")).json()
+                assert (stats['requests'], stats['served'], stats['throttled'], stats['fixtures']) == (2, 1, 1, 1)
+            
+            failing = UpstreamRedirectTransport(httpx.ASGITransport(app=create_app(FixtureStore(directory), error_rate=1.0)),
+                                                "http://fake")
+            async with httpx.AsyncClient(transport=failing) as client:
+                response = await client.get("https://export.arxiv.org/api/query", params={'search_query': 'a'})
+                assert response.status_code == 500
+    asyncio.run(run())
+
+def test_pdf_download_replay():
+    """PDFProcessor도 공용 클라이언트 경로로 기록/재생"""
+    pdf = b"%PDF-1.4\n% fixture\n%%EOF\n"
+    
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            transport = RecordingTransport(
+                httpx.MockTransport(lambda request: httpx.Response(200, headers={'content-type': 'application/pdf'}, content=pdf)),
+                FixtureStore(str(Path(directory) / "fixtures")),
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                processor = PDFProcessor(download_dir=str(Path(directory) / "recorded"), client=client)
+                assert (await processor.download_and_process("http://arxiv.org/abs/2401.00001v1"))['success']
+            
+            async with httpx.AsyncClient(transport=ReplayTransport(FixtureStore(str(Path(directory) / "fixtures")))) as client:
+                processor = PDFProcessor(download_dir=str(Path(directory) / "replayed"), client=client)
+                result = await processor.download_and_process("http://arxiv.org/abs/2401.00001v1")
+            assert result['success']
+            assert Path(result['file_path']).read_bytes() == pdf
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    for test in (test_record_then_replay_arxiv_search, test_credentials_are_not_recorded,
+                 test_fake_server_latency_throttle_and_errors, test_pdf_download_replay):
+        test()
+        print(f"✅ {test.__name__}")
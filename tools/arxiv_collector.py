@@ -1,54 +1,309 @@
-import arxiv
-import asyncio
 import logging
-from typing import List, Dict, Any
-from datetime import datetime
+import math
+import re
+import xml.etree.ElementTree as ET
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from database.paper_record import PaperRecord
+from tools.http_client import get_http_client
+from tools.keyword_matcher import KeywordMatcher
+from tools.overfetch import MAX_OVERFETCH_FACTOR, plan_fetch
+from tools.rate_limiter import PRIORITY_BULK, PRIORITY_INTERACTIVE, PriorityRateLimiter, get_rate_limiter
+from tools.resilience import send_with_retries
 
 logger = logging.getLogger(__name__)
 
+# arXiv API (Atom 피드) 설정
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_MAX_PAGE_SIZE = 2000  # API가 한 번에 반환하는 최대 결과 수
+
+# 여러 키워드 일괄 검색 설정: 키워드 BATCH_GROUP_SIZE개를 OR로 묶은 검색어 하나당
+# BATCH_PAGE_SIZE개씩 최대 BATCH_MAX_RESULTS개까지 읽음 (검색어 하나에 요청 2번 이하)
+BATCH_GROUP_SIZE = 15
+BATCH_PAGE_SIZE = 1000
+BATCH_MAX_RESULTS = 2000
+ATOM_NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'opensearch': 'http://a9.com/-/spec/opensearch/1.1/',
+}
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# arXiv OAI-PMH (카테고리 전체 대량 수집용) 설정
+ARXIV_OAI_URL = "https://oaipmh.arxiv.org/oai"
+OAI_NAMESPACES = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'arxiv': 'http://arxiv.org/OAI/arXiv/',
+}
+OAI_METADATA_PREFIX = "arXiv"
+# OAI set은 아카이브 단위 (cs.AI -> cs), 그 외 물리 아카이브는 physics:<아카이브> (hep-th -> physics:hep-th)
+OAI_ARCHIVE_SETS = ('cs', 'econ', 'eess', 'math', 'physics', 'q-bio', 'q-fin', 'stat')
+
+def oai_set_for_category(category: str) -> str:
+    """arXiv 카테고리를 포함하는 OAI set 이름"""
+    archive = category.split('.', 1)[0]
+    return archive if archive in OAI_ARCHIVE_SETS else f"physics:{archive}"
+
+class OaiPmhError(ValueError):
+    """OAI-PMH 응답의 <error> (code: noRecordsMatch, badResumptionToken 등)"""
+    def __init__(self, code: str, message: str):
+        super().__init__(f"OAI-PMH error {code}: {message}")
+        self.code = code
+
 class ArxivCollector:
-    def __init__(self):
-        self.client = arxiv.Client(
-            page_size=100,
-            delay_seconds=3,
-            num_retries=3
+    def __init__(self, page_size: int = 100, delay_seconds: float = 3.0, num_retries: int = 3,
+                 client: Optional[httpx.AsyncClient] = None, scheduler: Optional[PriorityRateLimiter] = None,
+                 oai_url: str = ARXIV_OAI_URL):
+        """
+        - arXiv API를 공용 비동기 HTTP 클라이언트로 직접 호출 (이벤트 루프를 막지 않음)
+        - 모든 요청은 프로세스 전체가 공유하는 arXiv 스케줄러를 거침
+          (delay_seconds마다 1건, 사용자 검색이 대량 수집보다 먼저 처리)
+        - 결과는 iter_results()로 한 건씩 받을 수 있음
+        - 카테고리 전체 수집은 OAI-PMH(iter_oai_pages)로 요청 한 번에 수백~천 건씩 받음
+        """
+        self.page_size = page_size
+        self.num_retries = num_retries
+        self.scheduler = scheduler or get_rate_limiter("arxiv", rate=1 / delay_seconds)
+        self.oai_url = oai_url
+        self._client = client
+    
+    async def iter_results(self, query: str, max_results: int = 10, sort_by: str = "submittedDate",
+                           sort_order: str = "descending", priority: int = PRIORITY_INTERACTIVE,
+                           page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        검색 결과를 한 건씩 반환하는 비동기 제너레이터
+        - page_size개씩(없으면 self.page_size) 페이지를 요청하고, 페이지 요청 순서는 공유 스케줄러가 정함 (priority)
+        - 필요한 만큼만 읽고 중단하면 다음 페이지는 요청하지 않음
+        """
+        page_size = min(page_size or self.page_size, ARXIV_MAX_PAGE_SIZE)
+        start = 0
+        while start < max_results:
+            entries, total_results = await self._fetch_page({
+                'search_query': query,
+                'start': start,
+                'max_results': min(page_size, max_results - start),
+                'sortBy': sort_by,
+                'sortOrder': sort_order,
+            }, priority)
+            
+            for entry in entries:
+                yield self._parse_entry(entry)
+            
+            start += len(entries)
+            if not entries or start >= total_results:
+                break
+    
+    async def _fetch_page(self, params: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE):
+        """결과 페이지 하나 요청 및 파싱"""
+        return self._parse_feed(await self._request(ARXIV_API_URL, params, priority))
+    
+    async def _request(self, url: str, params: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE) -> bytes:
+        """
+        arXiv 요청 하나 (응답 본문 반환)
+        - arXiv 권장 간격을 지키도록 공유 스케줄러에서 차례를 기다림 (재시도도 포함)
+        - 네트워크 오류나 5xx/429 응답은 num_retries번까지 jitter를 둔 백오프 후 재시도 (공유 재시도 예산 안에서)
+        - 503의 Retry-After(OAI-PMH 흐름 제어)는 그 시간만큼 기다렸다가 재시도
+        - arXiv 호스트가 차단 중이면 스케줄러에서 기다리지 않고 바로 CircuitOpenError
+        """
+        async def send() -> bytes:
+            await self.scheduler.acquire(priority)
+            response = await (self._client or get_http_client()).get(url, params=params)
+            response.raise_for_status()
+            return response.content
+        
+        return await send_with_retries(send, url, self.num_retries, "arXiv")
+    
+    @staticmethod
+    def _parse_feed(content: bytes):
+        """Atom 피드에서 (entry 목록, 전체 결과 수) 추출"""
+        feed = ET.fromstring(content)
+        entries = feed.findall('atom:entry', ATOM_NAMESPACES)
+        
+        # 잘못된 검색어는 오류 내용을 담은 entry 하나로 응답됨
+        if len(entries) == 1 and '/api/errors' in (entries[0].findtext('atom:id', '', ATOM_NAMESPACES)):
+            raise ValueError(f"arXiv API error: {entries[0].findtext('atom:summary', '', ATOM_NAMESPACES).strip()}")
+        
+        total_results = int(feed.findtext('opensearch:totalResults', '0', ATOM_NAMESPACES) or 0)
+        return entries, total_results
+    
+    @staticmethod
+    def _parse_entry(entry: ET.Element) -> PaperRecord:
+        """Atom entry 하나를 논문 정보로 변환"""
+        pdf_url = None
+        for link in entry.findall('atom:link', ATOM_NAMESPACES):
+            if link.get('title') == 'pdf':
+                pdf_url = link.get('href')
+                break
+        
+        published = entry.findtext('atom:published', '', ATOM_NAMESPACES)
+        
+        return PaperRecord(
+            title=WHITESPACE_PATTERN.sub(' ', entry.findtext('atom:title', '', ATOM_NAMESPACES)).strip(),
+            authors=[
+                name.strip() for name in
+                (author.findtext('atom:name', '', ATOM_NAMESPACES) for author in entry.findall('atom:author', ATOM_NAMESPACES))
+                if name.strip()
+            ],
+            abstract=entry.findtext('atom:summary', '', ATOM_NAMESPACES).strip(),
+            url=entry.findtext('atom:id', '', ATOM_NAMESPACES).strip(),
+            pdf_url=pdf_url,
+            published_date=published[:10] if published else None,
+            keywords=[],  # arXiv는 키워드를 제공하지 않음
+            source='arxiv',
         )
     
-    async def search(self, query: str, max_results: int = 10, existing_urls: List[str] = None) -> List[Dict[str, Any]]:
-        """arXiv에서 논문 검색 (중복 제거 포함)"""
-        try:
-            # 기존 URL 목록이 없으면 빈 리스트로 초기화
-            if existing_urls is None:
-                existing_urls = []
+    async def iter_oai_pages(self, set_spec: str, from_date: Optional[str] = None, until_date: Optional[str] = None,
+                             resumption_token: Optional[str] = None,
+                             priority: int = PRIORITY_BULK) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        OAI-PMH ListRecords로 set 하나의 논문을 페이지 단위로 반환하는 비동기 제너레이터
+        - from_date/until_date: 'YYYY-MM-DD' (레코드 갱신일 기준, 양 끝 포함)
+        - resumption_token: 중단된 수집을 이어갈 토큰 (있으면 from/until은 토큰에 포함되어 있음)
+        - 반환: (논문 목록, 다음 페이지 토큰) - 토큰을 체크포인트로 저장하면 그 다음 페이지부터 재개 가능
+        - 논문에는 필터링용 'categories' 목록이 포함되고, 삭제된 레코드는 제외
+        """
+        while True:
+            if resumption_token:
+                params = {'verb': 'ListRecords', 'resumptionToken': resumption_token}
+            else:
+                params = {'verb': 'ListRecords', 'metadataPrefix': OAI_METADATA_PREFIX, 'set': set_spec}
+                if from_date:
+                    params['from'] = from_date
+                if until_date:
+                    params['until'] = until_date
             
-            # 더 많은 결과를 검색해서 중복을 제거한 후 원하는 개수만큼 반환
-            search_size = max_results * 3  # 충분한 새로운 논문을 찾기 위해 3배로 검색
+            try:
+                papers, resumption_token = self._parse_oai_page(await self._request(self.oai_url, params, priority))
+            except OaiPmhError as e:
+                if e.code == 'noRecordsMatch':
+                    return
+                raise
             
-            search = arxiv.Search(
-                query=query,
-                max_results=search_size,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
+            yield papers, resumption_token
+            if not resumption_token:
+                return
+    
+    @classmethod
+    def _parse_oai_page(cls, content: bytes) -> Tuple[List[PaperRecord], Optional[str]]:
+        """ListRecords 응답에서 (논문 목록, 다음 페이지 토큰) 추출"""
+        root = ET.fromstring(content)
+        error = root.find('oai:error', OAI_NAMESPACES)
+        if error is not None:
+            raise OaiPmhError(error.get('code', ''), (error.text or '').strip())
+        
+        papers = []
+        for record in root.iterfind('oai:ListRecords/oai:record', OAI_NAMESPACES):
+            paper = cls._parse_oai_record(record)
+            if paper is not None:
+                papers.append(paper)
+        
+        # 마지막 페이지는 빈 resumptionToken으로 끝남
+        token = root.findtext('oai:ListRecords/oai:resumptionToken', '', OAI_NAMESPACES).strip()
+        return papers, token or None
+    
+    @staticmethod
+    def _parse_oai_record(record: ET.Element) -> Optional[PaperRecord]:
+        """OAI 레코드(arXiv 메타데이터 형식) 하나를 논문 정보로 변환 (삭제된 레코드는 None)"""
+        header = record.find('oai:header', OAI_NAMESPACES)
+        metadata = record.find('oai:metadata/arxiv:arXiv', OAI_NAMESPACES)
+        if metadata is None or (header is not None and header.get('status') == 'deleted'):
+            return None
+        
+        arxiv_id = metadata.findtext('arxiv:id', '', OAI_NAMESPACES).strip()
+        if not arxiv_id:
+            return None
+        
+        authors = []
+        for author in metadata.iterfind('arxiv:authors/arxiv:author', OAI_NAMESPACES):
+            name = ' '.join(
+                part for part in (
+                    author.findtext('arxiv:forenames', '', OAI_NAMESPACES).strip(),
+                    author.findtext('arxiv:keyname', '', OAI_NAMESPACES).strip(),
+                    author.findtext('arxiv:suffix', '', OAI_NAMESPACES).strip(),
+                ) if part
             )
+            if name:
+                authors.append(name)
+        
+        # 여러 DOI가 공백으로 구분되어 올 수 있으므로 첫 번째만 사용
+        doi = metadata.findtext('arxiv:doi', '', OAI_NAMESPACES).split()
+        
+        return PaperRecord(
+            title=WHITESPACE_PATTERN.sub(' ', metadata.findtext('arxiv:title', '', OAI_NAMESPACES)).strip(),
+            authors=authors,
+            abstract=WHITESPACE_PATTERN.sub(' ', metadata.findtext('arxiv:abstract', '', OAI_NAMESPACES)).strip(),
+            url=f"http://arxiv.org/abs/{arxiv_id}",
+            pdf_url=f"http://arxiv.org/pdf/{arxiv_id}",
+            published_date=metadata.findtext('arxiv:created', '', OAI_NAMESPACES).strip() or None,
+            keywords=[],  # arXiv는 키워드를 제공하지 않음
+            source='arxiv',
+            doi=doi[0] if doi else None,
+            categories=metadata.findtext('arxiv:categories', '', OAI_NAMESPACES).split(),
+        )
+    
+    async def _collect(self, query: str, max_results: int, priority: int = PRIORITY_INTERACTIVE) -> List[Dict[str, Any]]:
+        """검색 결과를 최대 max_results개까지 목록으로 수집"""
+        papers = []
+        async with aclosing(self.iter_results(query, max_results, priority=priority)) as results:
+            async for paper in results:
+                papers.append(paper)
+        return papers
+    
+    async def search(self, query: str, max_results: int = 10, is_known: Optional[Callable[[str], bool]] = None,
+                     priority: int = PRIORITY_INTERACTIVE, watermark: Optional[Dict[str, Any]] = None,
+                     fetch_stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        arXiv에서 논문 검색 (중복 제거 포함)
+        - is_known: URL이 이미 저장되어 있는지 알려주는 함수 (O(1) 조회)
+        - priority: 공유 스케줄러에서의 우선순위 (PRIORITY_INTERACTIVE / PRIORITY_BULK)
+        - watermark: 이 검색어로 지난번에 본 가장 최신 제출일 {'newest_date'} (증분 수집)
+          - 그날 이후 제출된 논문만 요청하고, 최신순 결과에서 그날보다 오래된 논문이 나오면 중단
+            (다른 검색어로 이미 저장된 논문은 건너뛰기만 함)
+          - 지난 기준이나 결과 끝까지 읽었을 때만 이번에 본 가장 최신 제출일로 갱신
+            (max_results개를 채워 중간에 멈추면 기준을 유지해 다음 수집에서 남은 논문을 이어서 읽음)
+        - fetch_stats: 이 검색어의 과거 중복 비율 {'duplicate_ratio'}로 요청 크기를 정하고,
+          검색 후 읽은 결과 수를 'fetched'로 기록
+        """
+        try:
+            # 중복 확인 함수가 없으면 모든 논문을 새 논문으로 취급
+            if is_known is None:
+                is_known = lambda url: False
             
-            papers = []
+            # 중복 비율 이력으로 첫 요청 크기를 정하고, 새 논문이 모자라면 같은 크기로 다음 페이지 (최대 limit개)
+            page_size, limit = plan_fetch(max_results, (fetch_stats or {}).get('duplicate_ratio'))
+            
+            search_query = query
+            last_date = (watermark or {}).get('newest_date')
+            if last_date:
+                # 제출일 범위 (하루 겹치게 해서 같은 날 늦게 제출된 논문도 포함)
+                since = last_date.replace('-', '')
+                until = (datetime.utcnow() + timedelta(days=1)).strftime('%Y%m%d')
+                search_query = f"({query}) AND submittedDate:[{since}0000 TO {until}2359]"
+            
+            total_count = 0
             new_papers = []
+            newest_date = None
+            caught_up = False  # 지난 기준 또는 결과 끝까지 읽었는지
             
-            for result in self.client.results(search):
-                paper = {
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'abstract': result.summary,
-                    'url': result.entry_id,
-                    'pdf_url': result.pdf_url,
-                    'published_date': result.published.strftime('%Y-%m-%d') if result.published else None,
-                    'keywords': [],  # arXiv는 키워드를 제공하지 않음
-                    'source': 'arxiv'
-                }
-                papers.append(paper)
-                
-                # 중복이 아닌 새로운 논문만 추가
-                if result.entry_id not in existing_urls:
+            async with aclosing(self.iter_results(search_query, limit, priority=priority, page_size=page_size)) as results:
+                async for paper in results:
+                    total_count += 1
+                    if watermark is not None and paper['published_date']:
+                        if last_date and paper['published_date'] < last_date:
+                            # 증분 수집: 최신순이므로 이후 결과는 지난 수집 기준보다 오래된 논문
+                            logger.info(f"Reached last watermark, stopping: {paper['title']}")
+                            caught_up = True
+                            break
+                        newest_date = max(newest_date or '', paper['published_date'])
+                    
+                    # 중복이 아닌 새로운 논문만 추가
+                    if is_known(paper['url']):
+                        logger.info(f"Skipping existing paper: {paper['title']}")
+                        continue
+                    
                     new_papers.append(paper)
                     logger.info(f"New paper found: {paper['title']}")
                     
@@ -56,46 +311,134 @@ class ArxivCollector:
                     if len(new_papers) >= max_results:
                         break
                 else:
-                    logger.info(f"Skipping existing paper: {paper['title']}")
+                    caught_up = total_count < limit
             
-            logger.info(f"Found {len(papers)} total papers, {len(new_papers)} new papers from arXiv for query: {query}")
-            return new_papers
+            # 처음 수집이면 기준만 정하고, 아니면 남은 논문 없이 따라잡았을 때만 기준 전진
+            if watermark is not None and (caught_up or not last_date):
+                if newest_date:
+                    watermark['newest_date'] = max(last_date or '', newest_date)
+                watermark.pop('updated_at', None)
             
+            if fetch_stats is not None:
+                fetch_stats['fetched'] = total_count
+            logger.info(f"Found {total_count} total papers, {len(new_papers)} new papers from arXiv for query: {query}")
+            return new_papers
+        
         except Exception as e:
+            # 상위(수집기 레지스트리)에서 소스별 상태로 보고하도록 예외를 그대로 전달
             logger.error(f"Error searching arXiv: {e}")
-            return []
+            raise
+    
+    async def search_many(self, quotas: Dict[str, int], is_known: Optional[Callable[[str], bool]] = None,
+                          priority: int = PRIORITY_INTERACTIVE, watermarks: Optional[Dict[str, Dict[str, Any]]] = None,
+                          stats: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        여러 키워드를 한꺼번에 검색 (키워드마다 따로 검색하는 것보다 요청 수가 훨씬 적음)
+        - quotas: 키워드 -> 찾을 새 논문 수
+        - 키워드를 BATCH_GROUP_SIZE개씩 all:"a" OR all:"b" ... 검색어 하나로 묶어 최신순으로 읽고,
+          결과는 제목+초록에 들어 있는 키워드(들)로 분류 (키워드별 개수 제한 적용)
+        - 모든 키워드가 채워지거나 결과가 끝나거나 BATCH_MAX_RESULTS개를 읽으면 그 묶음은 중단
+        - watermarks: 키워드별 증분 수집 기준 {'newest_date'} (search와 같음, 키워드별로 갱신됨)
+          묶음의 모든 키워드에 기준이 있으면 그중 가장 이른 날짜 이후 제출된 논문만 요청
+          키워드의 기준은 묶음 결과가 그 기준보다 오래된 논문이나 결과 끝까지 내려갔고,
+          개수가 차서 남겨 둔 새 논문이 없을 때만 전진 (처음 수집이면 기준만 정함)
+        - stats: 검색 후 {'requests', 'fetched', 'unmatched'} 기록 (unmatched: 어느 키워드에도 분류되지 않은 결과 수)
+        - 반환: 키워드 -> 새 논문 목록 (한 논문이 여러 키워드에 들어갈 수 있음)
+        """
+        # 중복 확인 함수가 없으면 모든 논문을 새 논문으로 취급
+        if is_known is None:
+            is_known = lambda url: False
+        
+        keywords = [keyword for keyword, quota in quotas.items() if quota > 0 and keyword.strip()]
+        results: Dict[str, List[Dict[str, Any]]] = {keyword: [] for keyword in quotas}
+        totals = {'requests': 0, 'fetched': 0, 'unmatched': 0}
+        
+        for start in range(0, len(keywords), BATCH_GROUP_SIZE):
+            group = keywords[start:start + BATCH_GROUP_SIZE]
+            matcher = KeywordMatcher(group)
+            remaining = {keyword: quotas[keyword] for keyword in group}
+            
+            search_query = ' OR '.join(f'all:"{keyword.replace(chr(34), "")}"' for keyword in group)
+            last_dates = {keyword: ((watermarks or {}).get(keyword) or {}).get('newest_date') for keyword in group}
+            if watermarks is not None:
+                dates = list(last_dates.values())
+                if all(dates):
+                    since = min(dates).replace('-', '')
+                    until = (datetime.utcnow() + timedelta(days=1)).strftime('%Y%m%d')
+                    search_query = f"({search_query}) AND submittedDate:[{since}0000 TO {until}2359]"
+            
+            limit = min(BATCH_MAX_RESULTS, sum(remaining.values()) * MAX_OVERFETCH_FACTOR)
+            page_size = min(BATCH_PAGE_SIZE, limit)
+            fetched = 0
+            newest_dates: Dict[str, str] = {}
+            passed = set()     # 결과가 지난 기준보다 오래된 논문까지 내려간 키워드
+            left_over = set()  # 개수가 차서 새 논문을 남겨 둔 키워드
+            reached_end = False
+            
+            async with aclosing(self.iter_results(search_query, limit, priority=priority, page_size=page_size)) as papers:
+                async for paper in papers:
+                    fetched += 1
+                    published = paper['published_date']
+                    if watermarks is not None and published:
+                        passed.update(keyword for keyword, date in last_dates.items() if date and published < date)
+                    
+                    matched = matcher.match(f"{paper['title']} {paper['abstract']}")
+                    if not matched:
+                        totals['unmatched'] += 1
+                        continue
+                    
+                    if watermarks is not None and published:
+                        for keyword in matched:
+                            newest_dates[keyword] = max(newest_dates.get(keyword, ''), published)
+                    
+                    if is_known(paper['url']):
+                        continue
+                    
+                    # 아직 개수가 남은 키워드에만 분류
+                    for keyword in matched:
+                        if remaining.get(keyword, 0) > 0:
+                            results[keyword].append(paper)
+                            remaining[keyword] -= 1
+                        else:
+                            left_over.add(keyword)
+                    
+                    # 묶음의 모든 키워드가 채워지면 다음 페이지는 요청하지 않음
+                    if not any(remaining.values()):
+                        break
+                else:
+                    reached_end = fetched < limit
+            
+            if watermarks is not None:
+                for keyword in group:
+                    last_date = last_dates[keyword]
+                    if last_date and (keyword in left_over or not (reached_end or keyword in passed)):
+                        continue  # 남은 논문은 다음 수집에서 같은 기준으로 이어서 읽음
+                    if keyword not in newest_dates and keyword not in watermarks:
+                        continue
+                    watermark = watermarks.setdefault(keyword, {})
+                    if keyword in newest_dates:
+                        watermark['newest_date'] = max(last_date or '', newest_dates[keyword])
+                    watermark.pop('updated_at', None)
+            
+            totals['requests'] += max(1, math.ceil(fetched / page_size))
+            totals['fetched'] += fetched
+            unfilled = [keyword for keyword, count in remaining.items() if count > 0]
+            logger.info(f"arXiv batch of {len(group)} keywords: read {fetched} results, "
+                        f"{len(group) - len(unfilled)} keywords filled"
+                        f"{f', unfilled: {unfilled}' if unfilled else ''}")
+        
+        if stats is not None:
+            stats.update(totals)
+        return results
     
     async def search_by_category(self, category: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """특정 카테고리에서 논문 검색"""
         try:
             # arXiv 카테고리 검색
-            search = arxiv.Search(
-                query=f"cat:{category}",
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
-            papers = []
-            for result in self.client.results(search):
-                paper = {
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'abstract': result.summary,
-                    'url': result.entry_id,
-                    'pdf_url': result.pdf_url,
-                    'published_date': result.published.strftime('%Y-%m-%d') if result.published else None,
-                    'keywords': [],
-                    'source': 'arxiv'
-                }
-                papers.append(paper)
-                
-                if len(papers) >= max_results:
-                    break
-            
+            papers = await self._collect(f"cat:{category}", max_results)
             logger.info(f"Found {len(papers)} papers from arXiv category: {category}")
             return papers
-            
+        
         except Exception as e:
             logger.error(f"Error searching arXiv category {category}: {e}")
             return []
@@ -104,33 +447,10 @@ class ArxivCollector:
         """최근 논문들 가져오기"""
         try:
             # 최근 논문 검색
-            search = arxiv.Search(
-                query="",
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
-            papers = []
-            for result in self.client.results(search):
-                paper = {
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'abstract': result.summary,
-                    'url': result.entry_id,
-                    'pdf_url': result.pdf_url,
-                    'published_date': result.published.strftime('%Y-%m-%d') if result.published else None,
-                    'keywords': [],
-                    'source': 'arxiv'
-                }
-                papers.append(paper)
-                
-                if len(papers) >= max_results:
-                    break
-            
+            papers = await self._collect("", max_results)
             logger.info(f"Found {len(papers)} recent papers from arXiv")
             return papers
-            
+        
         except Exception as e:
             logger.error(f"Error getting recent papers from arXiv: {e}")
             return []
@@ -138,33 +458,10 @@ class ArxivCollector:
     async def search_by_author(self, author_name: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """특정 저자의 논문 검색"""
         try:
-            search = arxiv.Search(
-                query=f"au:\"{author_name}\"",
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
-            papers = []
-            for result in self.client.results(search):
-                paper = {
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'abstract': result.summary,
-                    'url': result.entry_id,
-                    'pdf_url': result.pdf_url,
-                    'published_date': result.published.strftime('%Y-%m-%d') if result.published else None,
-                    'keywords': [],
-                    'source': 'arxiv'
-                }
-                papers.append(paper)
-                
-                if len(papers) >= max_results:
-                    break
-            
+            papers = await self._collect(f"au:\"{author_name}\"", max_results)
             logger.info(f"Found {len(papers)} papers by {author_name} from arXiv")
             return papers
-            
+        
         except Exception as e:
             logger.error(f"Error searching papers by author {author_name}: {e}")
-            return [] 
\ No newline at end of file
+            return []
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from tools.arxiv_collector import ArxivCollector, OaiPmhError, oai_set_for_category
+from tools.rate_limiter import PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+# 체크포인트 이름 접두어 (harvest_checkpoints.name = 'arxiv-oai:<set>')
+CHECKPOINT_PREFIX = "arxiv-oai:"
+
+# 체크포인트도 from_date도 없을 때 수집할 최근 기간 (일). 전체 과거 데이터는 from_date를 지정해야 함
+DEFAULT_WINDOW_DAYS = 7
+
+# arXiv 카테고리 전체를 OAI-PMH로 수집해 데이터베이스에 저장
+class ArxivHarvester:
+    def __init__(self, collector: ArxivCollector, paper_db, default_days: int = DEFAULT_WINDOW_DAYS):
+        """
+        - 카테고리를 OAI set(아카이브) 단위로 묶어 set마다 한 번씩 수집 (cs.AI, cs.LG -> cs)
+        - 페이지(최대 수천 건)마다 해당 카테고리 논문을 일괄 저장하고,
+          같은 트랜잭션에 다음 페이지 토큰을 체크포인트로 기록
+        - 중단되면 다음 실행에서 저장된 토큰부터 재개, 완료되면 다음 실행은 마지막 until 날짜부터 증분 수집
+        - 처음 수집하는 set은 until 날짜 이전 default_days일만 수집 (set 전체는 수십만 건)
+        """
+        if default_days < 1:
+            raise ValueError("default_days must be at least 1")
+        self.collector = collector
+        self.paper_db = paper_db
+        self.default_days = default_days
+        self._lock = asyncio.Lock()
+    
+    async def harvest(self, categories: Iterable[str], from_date: Optional[str] = None,
+                      until_date: Optional[str] = None, priority: int = PRIORITY_BULK) -> Dict[str, Dict[str, Any]]:
+        """
+        카테고리 목록 수집
+        - from_date/until_date: 'YYYY-MM-DD' (없으면 체크포인트 이후 ~ 오늘(UTC))
+        - 체크포인트가 없으면 until 날짜 이전 default_days일부터 수집
+        - from_date를 지정하면 체크포인트와 관계없이 그 날짜부터 다시 수집 (과거 데이터 채우기는 from_date 필수)
+        - 반환: set별 {'from', 'until', 'resumed', 'requests', 'records', 'matched', 'added'}
+        """
+        for value in (from_date, until_date):
+            if value is not None:
+                datetime.strptime(value, '%Y-%m-%d')
+        
+        sets: Dict[str, List[str]] = {}
+        for category in categories:
+            sets.setdefault(oai_set_for_category(category), []).append(category)
+        if not sets:
+            raise ValueError("No categories to harvest")
+        
+        # 같은 set을 동시에 수집하면 체크포인트가 꼬이므로 한 번에 하나씩
+        async with self._lock:
+            summary = {}
+            for set_spec, set_categories in sets.items():
+                summary[set_spec] = await self._harvest_set(set_spec, set(set_categories), from_date, until_date, priority)
+            return summary
+    
+    async def _harvest_set(self, set_spec: str, categories: set, from_date: Optional[str],
+                           until_date: Optional[str], priority: int) -> Dict[str, Any]:
+        """set 하나를 체크포인트부터 수집"""
+        name = CHECKPOINT_PREFIX + set_spec
+        token = None
+        records = 0
+        checkpoint = await self.paper_db.get_harvest_checkpoint(name) if from_date is None else None
+        if checkpoint and checkpoint['resumption_token'] and until_date in (None, checkpoint['until_date']):
+            # 중단된 구간 이어서 수집
+            from_date, until_date = checkpoint['from_date'], checkpoint['until_date']
+            token, records = checkpoint['resumption_token'], checkpoint['records']
+        elif checkpoint:
+            # 완료된 구간의 마지막 날짜부터 (그날 늦게 갱신된 레코드를 놓치지 않도록 하루 겹침)
+            from_date = checkpoint['until_date']
+        until_date = until_date or datetime.utcnow().date().isoformat()
+        if from_date is None:
+            # 처음 수집하는 set: set 전체가 아니라 최근 기간만
+            from_date = (datetime.strptime(until_date, '%Y-%m-%d') - timedelta(days=self.default_days)).date().isoformat()
+        
+        result = {'from': from_date, 'until': until_date, 'resumed': token is not None,
+                  'requests': 0, 'records': 0, 'matched': 0, 'added': 0}
+        logger.info(f"Harvesting arXiv set {set_spec} ({from_date} ~ {until_date})"
+                    f"{' from checkpoint' if token else ''}")
+        
+        try:
+            await self._harvest_pages(name, set_spec, categories, from_date, until_date, token, records, priority, result)
+        except OaiPmhError as e:
+            if e.code != 'badResumptionToken' or not result['resumed'] or result['requests']:
+                raise
+            # 저장된 토큰이 만료됨: 같은 구간을 처음부터 다시 (이미 저장된 논문은 중복 제거됨)
+            logger.warning(f"Checkpoint token for {set_spec} expired, restarting window from {from_date}")
+            await self._harvest_pages(name, set_spec, categories, from_date, until_date, None, 0, priority, result)
+        
+        logger.info(f"Harvested arXiv set {set_spec}: {result['records']} records, "
+                    f"{result['matched']} in {', '.join(sorted(categories))}, {result['added']} new papers")
+        return result
+    
+    async def _harvest_pages(self, name: str, set_spec: str, categories: set, from_date: Optional[str],
+                             until_date: str, token: Optional[str], records: int, priority: int,
+                             result: Dict[str, Any]):
+        """페이지마다 논문 저장 + 체크포인트 갱신"""
+        is_known = self.paper_db.dedup_index.is_known
+        pages = self.collector.iter_oai_pages(set_spec, from_date, until_date, token, priority)
+        async with aclosing(pages):
+            async for papers, token in pages:
+                result['requests'] += 1
+                result['records'] += len(papers)
+                records += len(papers)
+                
+                # 설정된 카테고리에 속하고 아직 저장되지 않은 논문만
+                matched = [paper for paper in papers if categories.intersection(paper['categories'])]
+                result['matched'] += len(matched)
+                new_papers = [paper for paper in matched if not is_known(paper['url'])]
+                
+                added = await self.paper_db.add_papers(new_papers, checkpoint={
+                    'name': name, 'from_date': from_date, 'until_date': until_date,
+                    'resumption_token': token, 'records': records,
+                })
+                result['added'] += len(added)
+        
+        if result['requests'] == 0:
+            # 해당 구간에 레코드가 없음 (noRecordsMatch): 구간 완료로 기록
+            await self.paper_db.save_harvest_checkpoint(name, from_date, until_date, None, records)
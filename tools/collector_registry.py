@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tools.rate_limiter import PRIORITY_INTERACTIVE
+from tools.resilience import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# 소스별 기본 검색 제한 시간 (초)
+DEFAULT_SOURCE_TIMEOUT = 30.0
+
+# 여러 논문 소스(수집기)를 이름으로 등록하고 동시에 검색하는 레지스트리
+class CollectorRegistry:
+    def __init__(self, default_timeout: float = DEFAULT_SOURCE_TIMEOUT):
+        """
+        - 수집기는 search(query, max_results, is_known, priority, fetch_stats) 코루틴을 제공하면 됨
+          (증분 수집을 지원하려면 watermark 인자도 받음)
+        - 검색 시 모든 소스를 동시에 요청하므로 전체 지연 시간은 가장 느린 소스(최대 제한 시간)로 결정
+        - 소스 하나가 느리거나 실패해도 나머지 결과는 그대로 반환
+        """
+        self.default_timeout = default_timeout
+        self._collectors: Dict[str, Any] = {}
+        self._timeouts: Dict[str, float] = {}
+
+    def register(self, name: str, collector: Any, timeout: Optional[float] = None):
+        """수집기 등록 (timeout: 이 소스의 검색 제한 시간, 없으면 기본값)"""
+        self._collectors[name] = collector
+        self._timeouts[name] = timeout if timeout is not None else self.default_timeout
+
+    def get(self, name: str) -> Any:
+        return self._collectors[name]
+
+    def names(self) -> List[str]:
+        return list(self._collectors)
+
+    def resolve(self, source: str) -> List[str]:
+        """요청의 source 값을 검색할 소스 이름 목록으로 변환 ("all"은 등록된 전체)"""
+        if source == "all":
+            return self.names()
+        if source not in self._collectors:
+            raise ValueError(f"Unknown source: {source} (available: {', '.join(self.names())}, all)")
+        return [source]
+
+    async def search(self, query: str, max_results: int, source: str = "all",
+                     is_known: Optional[Callable[[str], bool]] = None, priority: int = PRIORITY_INTERACTIVE,
+                     watermarks: Optional[Dict[str, Dict[str, Any]]] = None,
+                     fetch_stats: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        선택한 소스들을 동시에 검색
+        - 반환: (등록 순서대로 합친 논문 목록, 소스별 상태)
+        - 상태: {'status': 'ok' | 'timeout' | 'unavailable' | 'error', 'count', 'fetched', 'efficiency', 'elapsed_ms', 'error'(실패 시)}
+          (unavailable: 외부 API 호스트가 차단 중, 'retry_after_seconds' 뒤에 다시 시도)
+          (fetched: 외부 API에서 읽은 결과 수, efficiency: 그중 새 논문 비율)
+        - fetch_stats: 소스별 과거 수집 효율 {'duplicate_ratio'} (요청 크기 결정에 사용)
+        - watermarks: 증분 수집 시 소스별 지난 수집 기준 (처음이면 빈 dict)
+          성공한 소스의 상태에는 갱신된 기준이 'watermark'로 들어감
+        """
+        names = self.resolve(source)
+        results = await asyncio.gather(*(
+            self._search_source(
+                name, query, max_results, is_known, priority,
+                dict(watermarks.get(name) or {}) if watermarks is not None else None,
+                {'duplicate_ratio': (fetch_stats or {}).get(name, {}).get('duplicate_ratio')}
+            )
+            for name in names
+        ))
+
+        papers = []
+        statuses = {}
+        for name, (source_papers, status) in zip(names, results):
+            papers.extend(source_papers)
+            statuses[name] = status
+        return papers, statuses
+
+    async def _search_source(self, name: str, query: str, max_results: int, is_known: Optional[Callable[[str], bool]],
+                             priority: int, watermark: Optional[Dict[str, Any]] = None,
+                             fetch_stats: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        소스 하나를 제한 시간 안에서 검색하고 결과와 상태 반환
+        - 대량 수집(priority > PRIORITY_INTERACTIVE)은 외부 API 스케줄러에서 차례를 기다려야 하므로 제한 시간 없음
+        """
+        timeout = self._timeouts[name] if priority <= PRIORITY_INTERACTIVE else None
+        start = time.perf_counter()
+        papers = []
+        fetch_stats = fetch_stats if fetch_stats is not None else {}
+        options = {'watermark': watermark} if watermark is not None else {}
+        try:
+            papers = await asyncio.wait_for(
+                self._collectors[name].search(query, max_results, is_known, priority, fetch_stats=fetch_stats, **options),
+                timeout
+            )
+            status = {'status': 'ok'}
+            if watermark is not None:
+                status['watermark'] = watermark
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} search timed out after {timeout}s for query: {query}")
+            status = {'status': 'timeout'}
+        except CircuitOpenError as e:
+            # 외부 API가 차단 중이면 기다리지 않고 바로 실패
+            logger.warning(f"{name} search skipped for query {query}: {e}")
+            status = {'status': 'unavailable', 'error': str(e), 'retry_after_seconds': round(e.retry_after, 1)}
+        except Exception as e:
+            logger.error(f"{name} search failed for query {query}: {e}")
+            status = {'status': 'error', 'error': str(e)}
+
+        status['count'] = len(papers)
+        if 'fetched' in fetch_stats:
+            status['fetched'] = fetch_stats['fetched']
+            status['efficiency'] = round(len(papers) / fetch_stats['fetched'], 3) if fetch_stats['fetched'] else None
+        status['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return papers, status
@@ -0,0 +1,99 @@
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from tools.resilience import CircuitBreakerTransport
+from tools.upstream_fixtures import FixtureStore, RecordingTransport, ReplayTransport, UpstreamRedirectTransport
+
+logger = logging.getLogger(__name__)
+
+# 외부 API 공용 HTTP 클라이언트 기본 설정
+DEFAULT_HTTP_SETTINGS = {
+    'timeout_seconds': 30.0,          # 읽기/쓰기 제한 시간
+    'connect_timeout_seconds': 10.0,  # 연결 제한 시간
+    'max_connections': 20,
+    'max_keepalive_connections': 10,
+    'upstream_mode': 'live',          # live | record | replay (tools/upstream_fixtures.py)
+    'fixtures_dir': 'fixtures/upstream',
+    'upstream_base_url': None,        # 설정하면 모든 요청을 가짜 서버로 보냄 (server/fake_upstream.py)
+}
+UPSTREAM_MODES = ('live', 'record', 'replay')
+USER_AGENT = "paperMCP/1.0"
+
+_settings: Dict[str, Any] = dict(DEFAULT_HTTP_SETTINGS)
+_client: Optional[httpx.AsyncClient] = None
+
+def http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (h2 패키지가 설치되어 있을 때만)"""
+    return importlib.util.find_spec("h2") is not None
+
+def configure_http_client(**settings):
+    """
+    공용 클라이언트 설정 변경 (config/settings.json의 http 항목)
+    - 이미 만들어진 클라이언트에는 적용되지 않으므로 서버 시작 시 한 번 호출
+    """
+    unknown = set(settings) - set(DEFAULT_HTTP_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown HTTP settings: {', '.join(sorted(unknown))}")
+    if settings.get('upstream_mode') not in (None,) + UPSTREAM_MODES:
+        raise ValueError(f"Unknown upstream mode: {settings['upstream_mode']}")
+    if _client is not None:
+        logger.warning("HTTP client already created; new settings apply after close_http_client()")
+    _settings.update((key, value) for key, value in settings.items() if value is not None)
+
+def _build_transport(http2: bool) -> httpx.AsyncBaseTransport:
+    """
+    설정에 따른 전송 계층
+    - upstream_base_url: 요청을 가짜 서버로 보냄
+    - record: 응답을 fixtures_dir에 기록 (원래 URL 기준으로 저장되도록 가장 바깥에 둠)
+    - replay: 네트워크 없이 fixtures_dir의 응답 반환
+    - 가장 바깥에서 호스트별 차단기 적용 (tools/resilience.py)
+    """
+    mode = _settings['upstream_mode']
+    if mode == 'replay':
+        logger.info(f"Replaying upstream responses from {_settings['fixtures_dir']}")
+        return CircuitBreakerTransport(ReplayTransport(FixtureStore(_settings['fixtures_dir'])))
+    
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=_settings['max_connections'],
+            max_keepalive_connections=_settings['max_keepalive_connections'],
+        ),
+    )
+    if _settings['upstream_base_url']:
+        logger.info(f"Sending upstream requests to {_settings['upstream_base_url']}")
+        transport = UpstreamRedirectTransport(transport, _settings['upstream_base_url'])
+    if mode == 'record':
+        logger.info(f"Recording upstream responses to {_settings['fixtures_dir']}")
+        transport = RecordingTransport(transport, FixtureStore(_settings['fixtures_dir']))
+    return CircuitBreakerTransport(transport)
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    프로세스 전체가 공유하는 비동기 HTTP 클라이언트
+    - keep-alive 연결 풀로 요청마다 TCP/TLS 연결을 새로 맺지 않음
+    - h2가 설치되어 있으면 HTTP/2 사용
+    - upstream_mode/upstream_base_url에 따라 기록, 재생, 가짜 서버 사용
+    """
+    global _client
+    if _client is None:
+        http2 = http2_available()
+        _client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(_settings['timeout_seconds'], connect=_settings['connect_timeout_seconds']),
+            transport=_build_transport(http2),
+            headers={'User-Agent': USER_AGENT},
+            follow_redirects=True,
+        )
+        logger.info(f"HTTP client created (HTTP/2: {http2}, upstream: {_settings['upstream_mode']})")
+    return _client
+
+async def close_http_client():
+    """공용 클라이언트 연결 정리 (서버 종료 시)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
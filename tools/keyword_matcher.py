@@ -0,0 +1,48 @@
+import re
+from typing import Dict, Iterable, List, Set
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# 여러 키워드를 정규식 하나로 컴파일해 텍스트에 들어 있는 키워드를 한 번에 찾는 매처
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]):
+        """
+        - 키워드마다 이름 있는 그룹을 만들고 전방 탐색(?=...)으로 묶어 겹치는 키워드도 찾음
+          ("deep learning" 안의 "learning"도 따로 찾음)
+        - 같은 위치에서 시작하는 키워드는 대안 중 첫 번째만 기록되므로 그 위치에서 나머지 키워드를 따로 확인
+          ("machine learning security"에서 "machine learning"과 "machine learning security" 모두)
+        - 대소문자 무시, 단어 사이 공백/하이픈 차이 무시, 복수형(-s, -es) 허용
+          (arXiv 검색은 어간 추출을 하므로 "neural networks"로 찾은 논문에 "neural network"만 있을 수 있음)
+        """
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        alternatives = []
+        self._patterns: Dict[int, re.Pattern] = {}
+        for index, keyword in enumerate(self.keywords):
+            words = WORD_PATTERN.findall(keyword.lower())
+            if not words:
+                continue
+            phrase = r'\W+'.join(re.escape(self._stem(word)) + r'(?:s|es)?' for word in words)
+            self._patterns[index] = re.compile(rf'\b{phrase}\b', re.IGNORECASE)
+            alternatives.append(rf'(?=(?P<k{index}>\b{phrase}\b))')
+        self._pattern = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+    
+    @staticmethod
+    def _stem(word: str) -> str:
+        """복수형 어미 제거 (networks -> network, analyses는 그대로)"""
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            return word[:-1]
+        return word
+    
+    def match(self, text: str) -> Set[str]:
+        """텍스트에 들어 있는 키워드 집합"""
+        if self._pattern is None or not text:
+            return set()
+        found = set()
+        for match in self._pattern.finditer(text):
+            found.add(int(match.lastgroup[1:]))
+            position = match.start()
+            found.update(
+                index for index, pattern in self._patterns.items()
+                if index not in found and pattern.match(text, position)
+            )
+        return {self.keywords[index] for index in found}
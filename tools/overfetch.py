@@ -0,0 +1,25 @@
+import math
+from typing import Optional, Tuple
+
+# 검색어별 중복 비율에 따른 요청 크기 결정
+# - 새 논문 max_results개를 얻으려면 (1 - 중복 비율)로 나눈 만큼 읽어야 함
+# - 이력이 없는 검색어는 기존과 같이 3배
+DEFAULT_OVERFETCH_FACTOR = 3
+MIN_NEW_RATIO = 0.05          # 새 논문 비율 추정치 하한 (첫 요청이 max_results의 20배를 넘지 않도록)
+FETCH_MARGIN = 1.2            # 추정이 조금 빗나가도 추가 요청이 필요 없도록 여유
+MAX_OVERFETCH_FACTOR = 20     # 한 번의 검색에서 읽는 최대 결과 수 (max_results 배수)
+
+def plan_fetch(max_results: int, duplicate_ratio: Optional[float] = None) -> Tuple[int, int]:
+    """
+    (첫 요청 크기, 최대로 읽을 결과 수) 계산
+    - duplicate_ratio: 이 검색어의 과거 중복 비율 (0~1, 없으면 기본 배수)
+    - 첫 요청에서 새 논문이 모자라면 같은 크기로 다음 페이지를 읽되 최대치까지만
+    """
+    max_results = max(1, max_results)
+    limit = max_results * MAX_OVERFETCH_FACTOR
+    if duplicate_ratio is None:
+        return max_results * DEFAULT_OVERFETCH_FACTOR, limit
+    
+    new_ratio = max(MIN_NEW_RATIO, 1.0 - duplicate_ratio)
+    size = math.ceil(max_results / new_ratio * FETCH_MARGIN)
+    return min(max(size, max_results), limit), limit
@@ -1,18 +1,26 @@
-import requests
 import os
 import asyncio
 import logging
 from typing import Dict, Any, Optional
 from urllib.parse import urlparse
+import httpx
 import PyPDF2
 from datetime import datetime
 
+from tools.http_client import get_http_client
+from tools.resilience import CircuitOpenError
+
 logger = logging.getLogger(__name__)
 
 class PDFProcessor:
-    def __init__(self, download_dir: str = "papers", time_folder: Optional[str] = None):
+    def __init__(self, download_dir: str = "papers", time_folder: Optional[str] = None,
+                 client: Optional[httpx.AsyncClient] = None):
+        """
+        - 요청은 공용 비동기 HTTP 클라이언트로 보냄 (이벤트 루프를 막지 않고, 기록/재생 설정도 그대로 적용)
+        """
         self.download_dir = download_dir
         self.time_folder = time_folder
+        self._client = client
         self._ensure_download_dir()
     
     def _ensure_download_dir(self):
@@ -91,6 +99,15 @@ class PDFProcessor:
                 'pdf_url': pdf_url
             }
             
+        except CircuitOpenError as e:
+            # 외부 호스트가 차단 중이면 제한 시간까지 기다리지 않고 바로 실패
+            logger.warning(f"Skipping download of {paper_url}: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'retry_after_seconds': round(e.retry_after, 1),
+                'paper_url': paper_url
+            }
         except Exception as e:
             logger.error(f"Error downloading and processing paper: {e}")
             return {
@@ -128,7 +145,7 @@ class PDFProcessor:
             
             # 기타 URL은 직접 요청하여 PDF 링크 찾기
             else:
-                response = requests.get(paper_url, timeout=10)
+                response = await (self._client or get_http_client()).get(paper_url, timeout=10)
                 response.raise_for_status()
                 
                 # HTML에서 PDF 링크 찾기
@@ -149,6 +166,8 @@ class PDFProcessor:
                 
                 return None
                 
+        except CircuitOpenError:
+            raise  # 차단된 호스트는 download_and_process에서 바로 실패로 응답
         except Exception as e:
             logger.error(f"Error extracting PDF URL from {paper_url}: {e}")
             return None
@@ -159,7 +178,7 @@ class PDFProcessor:
             logger.info(f"DOI 링크에서 PDF 추출 시도: {doi_url}")
             
             # DOI 링크로 접속
-            response = requests.get(doi_url, timeout=15)
+            response = await (self._client or get_http_client()).get(doi_url, timeout=15)
             response.raise_for_status()
             
             from bs4 import BeautifulSoup
@@ -210,6 +229,8 @@ class PDFProcessor:
             logger.warning(f"DOI 페이지에서 PDF 링크를 찾을 수 없음: {doi_url}")
             return None
             
+        except CircuitOpenError:
+            raise  # 차단된 호스트는 download_and_process에서 바로 실패로 응답
         except Exception as e:
             logger.error(f"DOI에서 PDF 추출 중 오류: {e}")
             return None
@@ -217,7 +238,7 @@ class PDFProcessor:
     async def _extract_doi_from_pubmed(self, pubmed_url: str) -> Optional[str]:
         """PubMed URL에서 DOI 추출"""
         try:
-            response = requests.get(pubmed_url, timeout=10)
+            response = await (self._client or get_http_client()).get(pubmed_url, timeout=10)
             response.raise_for_status()
             
             from bs4 import BeautifulSoup
@@ -235,6 +256,8 @@ class PDFProcessor:
             
             return None
             
+        except CircuitOpenError:
+            raise  # 차단된 호스트는 download_and_process에서 바로 실패로 응답
         except Exception as e:
             logger.error(f"PubMed에서 DOI 추출 중 오류: {e}")
             return None
@@ -269,26 +292,28 @@ class PDFProcessor:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(pdf_url, headers=headers, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            # 파일 크기 확인
-            content_length = response.headers.get('content-length')
-            if content_length:
-                file_size = int(content_length)
-                if file_size > 100 * 1024 * 1024:  # 100MB 제한
-                    logger.warning(f"File too large: {file_size} bytes")
-                    return False
-            
-            # 파일 저장
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            async with (self._client or get_http_client()).stream('GET', pdf_url, headers=headers, timeout=30) as response:
+                response.raise_for_status()
+                
+                # 파일 크기 확인
+                content_length = response.headers.get('content-length')
+                if content_length:
+                    file_size = int(content_length)
+                    if file_size > 100 * 1024 * 1024:  # 100MB 제한
+                        logger.warning(f"File too large: {file_size} bytes")
+                        return False
+                
+                # 파일 저장
+                with open(file_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(chunk_size=8192):
+                        if chunk:
+                            f.write(chunk)
             
             logger.info(f"Successfully downloaded: {file_path}")
             return True
             
+        except CircuitOpenError:
+            raise  # 차단된 호스트는 download_and_process에서 바로 실패로 응답
         except Exception as e:
             logger.error(f"Error downloading PDF: {e}")
             return False
@@ -1,115 +1,330 @@
-import requests
 import asyncio
 import logging
-from typing import List, Dict, Any
-from datetime import datetime
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
 import xml.etree.ElementTree as ET
 
+import httpx
+
+from database.paper_record import PaperRecord
+from tools.http_client import get_http_client
+from tools.overfetch import MAX_OVERFETCH_FACTOR, plan_fetch
+from tools.rate_limiter import PRIORITY_INTERACTIVE, PriorityRateLimiter, get_rate_limiter
+from tools.resilience import check_circuit, send_with_retries
+
 logger = logging.getLogger(__name__)
 
+# NCBI E-utilities 초당 요청 한도 (API 키가 있으면 10, 없으면 3)
+NCBI_RATE_WITH_KEY = 10
+NCBI_RATE_WITHOUT_KEY = 3
+NCBI_TOOL_NAME = "paperMCP"
+NCBI_NUM_RETRIES = 2
+
+# efetch 한 번에 요청할 최대 논문 수와 미리 받아 둘 요청 수
+EFETCH_CHUNK_SIZE = 200
+EFETCH_PREFETCH = 3
+
+# 증분 수집의 esearch 정렬 (기본 정렬은 relevance라 명시, 결과 순서에는 의존하지 않음)
+INCREMENTAL_SORT = 'pub_date'
+
 class PubMedCollector:
-    def __init__(self):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None,
+                 scheduler: Optional[PriorityRateLimiter] = None, num_retries: int = NCBI_NUM_RETRIES):
+        """
+        - 요청은 공용 비동기 HTTP 클라이언트(연결 재사용)로 보냄
+        - api_key: config/settings.json의 sources.pubmed.api_key
+        - 프로세스 전체가 공유하는 NCBI 제한기로 초당 3건(API 키가 있으면 10건)을 넘지 않음
+        - esearch 등 GET 요청은 일시적인 실패 시 num_retries번까지 재시도 (공유 재시도 예산 안에서)
+        """
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
         self.search_url = f"{self.base_url}esearch.fcgi"
         self.fetch_url = f"{self.base_url}efetch.fcgi"
         self.summary_url = f"{self.base_url}esummary.fcgi"
+        self.api_key = api_key
+        self.num_retries = num_retries
+        self._client = client
+        self.scheduler = scheduler or get_rate_limiter(
+            "ncbi", rate=NCBI_RATE_WITH_KEY if api_key else NCBI_RATE_WITHOUT_KEY
+        )
     
-    async def search(self, query: str, max_results: int = 10, existing_urls: List[str] = None) -> List[Dict[str, Any]]:
-        """PubMed에서 논문 검색 (중복 제거 포함)"""
-        try:
-            # 기존 URL 목록이 없으면 빈 리스트로 초기화
-            if existing_urls is None:
-                existing_urls = []
-            
-            # 더 많은 결과를 검색해서 중복을 제거한 후 원하는 개수만큼 반환
-            search_size = max_results * 3  # 충분한 새로운 논문을 찾기 위해 3배로 검색
-            
-            # 1단계: 검색하여 ID 목록 가져오기
-            search_params = {
-                'db': 'pubmed',
-                'term': query,
-                'retmax': search_size,
-                'retmode': 'xml',
-                'sort': 'date'
-            }
-            
-            response = requests.get(self.search_url, params=search_params)
+    def _with_credentials(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """E-utilities 공통 파라미터 (tool, api_key) 추가"""
+        params = dict(params, tool=NCBI_TOOL_NAME)
+        if self.api_key:
+            params['api_key'] = self.api_key
+        return params
+    
+    async def _get(self, url: str, params: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE) -> httpx.Response:
+        """
+        E-utilities 요청 (초당 요청 한도 안에서 차례를 기다린 뒤 전송)
+        - NCBI 호스트가 차단 중이면 기다리지 않고 바로 CircuitOpenError
+        """
+        async def send() -> httpx.Response:
+            await self.scheduler.acquire(priority)
+            response = await (self._client or get_http_client()).get(url, params=self._with_credentials(params))
             response.raise_for_status()
+            return response
+        
+        return await send_with_retries(send, url, self.num_retries, "PubMed")
+    
+    async def search(self, query: str, max_results: int = 10, is_known: Optional[Callable[[str], bool]] = None,
+                     priority: int = PRIORITY_INTERACTIVE, watermark: Optional[Dict[str, Any]] = None,
+                     fetch_stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        PubMed에서 논문 검색 (중복 제거 포함)
+        - is_known: URL이 이미 저장되어 있는지 알려주는 함수 (O(1) 조회)
+        - priority: 공유 NCBI 제한기에서의 우선순위 (PRIORITY_INTERACTIVE / PRIORITY_BULK)
+        - 새 논문이 max_results개 모일 때까지 iter_search로 다음 페이지를 계속 읽음
+        - watermark: 이 검색어로 지난번에 본 가장 큰 PMID와 수집 시각 {'newest_id', 'updated_at'} (증분 수집)
+          - 지난 수집일 이후 PubMed에 추가된 논문만 요청하고, 지난번에 본 PMID 이하는 건너뜀
+            (정렬 순서와 관계없이 같은 결과가 되도록 중간에 멈추지 않음)
+          - 결과 끝까지 읽었을 때만 이번에 본 가장 큰 PMID와 수집 시각으로 갱신
+            (max_results개를 채워 중간에 멈추면 기준을 유지해 다음 수집에서 남은 논문을 이어서 읽음)
+        - fetch_stats: 이 검색어의 과거 중복 비율 {'duplicate_ratio'}로 페이지 크기를 정하고,
+          검색 후 읽은 결과 수를 'fetched'로 기록
+        """
+        try:
+            # 중복 확인 함수가 없으면 모든 논문을 새 논문으로 취급
+            if is_known is None:
+                is_known = lambda url: False
             
-            # XML 파싱
-            root = ET.fromstring(response.content)
-            id_list = root.find('.//IdList')
-            
-            if id_list is None:
-                logger.warning("No results found in PubMed")
-                return []
-            
-            pmids = [id_elem.text for id_elem in id_list.findall('Id')]
-            
-            if not pmids:
-                logger.warning("No PMIDs found")
-                return []
+            # 중복 비율 이력으로 페이지 크기를 정하고, 새 논문이 모자라면 다음 페이지 (최대 limit개)
+            page_size, limit = plan_fetch(max_results, (fetch_stats or {}).get('duplicate_ratio'))
+            batch_size = min(EFETCH_CHUNK_SIZE, page_size)
             
-            # 2단계: 상세 정보 가져오기
-            all_papers = await self._fetch_paper_details(pmids)
+            search_options = {}
+            newest_pmid = 0
+            if watermark is not None:
+                newest_pmid = int(watermark.get('newest_id') or 0)
+                search_options['sort'] = INCREMENTAL_SORT
+                if watermark.get('updated_at'):
+                    # Entrez 등록일 범위 (지난 수집일 포함)
+                    search_options.update(
+                        datetype='edat',
+                        mindate=watermark['updated_at'][:10].replace('-', '/'),
+                        maxdate=(datetime.utcnow() + timedelta(days=1)).strftime('%Y/%m/%d'),
+                    )
             
-            # 중복 제거: 새로운 논문들만 필터링
+            fetched = 0
             new_papers = []
-            for paper in all_papers:
-                if paper['url'] not in existing_urls:
-                    new_papers.append(paper)
-                    logger.info(f"New PubMed paper found: {paper['title']}")
+            newest_seen = 0
+            caught_up = False  # 결과 끝까지 읽었는지
+            # 첫 페이지로 대개 충분하므로 다음 페이지는 필요할 때만 요청
+            async with aclosing(self.iter_search(query, None, None, batch_size, priority, limit=limit, prefetch=1,
+                                                 **search_options)) as papers:
+                async for paper in papers:
+                    fetched += 1
+                    if watermark is not None:
+                        pmid = int(paper['url'].rstrip('/').rsplit('/', 1)[-1])
+                        if pmid <= newest_pmid:
+                            # 지난 수집 때 이미 본 논문 (등록일 범위가 지난 수집일과 겹침)
+                            logger.info(f"Skipping PubMed paper seen in last run: {paper['title']}")
+                            continue
+                        newest_seen = max(newest_seen, pmid)
                     
-                    # 원하는 개수만큼 새로운 논문을 찾으면 중단
+                    if is_known(paper['url']):
+                        logger.info(f"Skipping existing PubMed paper: {paper['title']}")
+                        continue
+                    
+                    new_papers.append(paper)
+                    # 원하는 개수만큼 새로운 논문을 찾으면 중단 (미리 받던 다음 페이지도 취소)
                     if len(new_papers) >= max_results:
                         break
                 else:
-                    logger.info(f"Skipping existing PubMed paper: {paper['title']}")
+                    caught_up = fetched < limit
             
-            logger.info(f"Found {len(all_papers)} total papers, {len(new_papers)} new papers from PubMed for query: {query}")
-            return new_papers
+            # 처음 수집이면 기준만 정하고, 아니면 남은 논문 없이 따라잡았을 때만 기준 전진
+            # (updated_at을 지우면 저장 시각으로 갱신되고, 남겨 두면 다음 수집도 같은 등록일부터 읽음)
+            if watermark is not None and (caught_up or not newest_pmid):
+                if newest_seen:
+                    watermark['newest_id'] = str(max(newest_pmid, newest_seen))
+                watermark.pop('updated_at', None)
             
+            if fetch_stats is not None:
+                fetch_stats['fetched'] = fetched
+            logger.info(f"Found {fetched} total papers, {len(new_papers)} new papers from PubMed for query: {query}")
+            return new_papers
+        
         except Exception as e:
+            # 상위(수집기 레지스트리)에서 소스별 상태로 보고하도록 예외를 그대로 전달
             logger.error(f"Error searching PubMed: {e}")
-            return []
+            raise
+    
+    async def iter_search(self, query: str, max_results: Optional[int] = None,
+                          is_known: Optional[Callable[[str], bool]] = None, batch_size: int = EFETCH_CHUNK_SIZE,
+                          priority: int = PRIORITY_INTERACTIVE, mindate: Optional[str] = None,
+                          maxdate: Optional[str] = None, reldate: Optional[int] = None, datetype: str = 'pdat',
+                          sort: Optional[str] = 'date', limit: Optional[int] = None,
+                          prefetch: int = EFETCH_PREFETCH) -> AsyncIterator[Dict[str, Any]]:
+        """
+        검색 결과 중 새 논문만 한 건씩 반환하는 비동기 제너레이터
+        - esearch는 한 번만 (usehistory=y) 호출하고, 결과는 NCBI 히스토리 서버에 보관
+        - efetch는 WebEnv/query_key와 retstart로 batch_size개씩 페이지를 읽음 (PMID 목록을 다시 보내지 않음)
+        - max_results개의 새 논문을 찾거나 결과가 끝나면 중단 (None이면 끝까지)
+          중복이 많은 검색어로 결과 전체를 읽지 않도록 limit이 없으면 max_results의 MAX_OVERFETCH_FACTOR배까지만 읽음
+        - mindate/maxdate('YYYY/MM/DD') 또는 reldate(최근 N일)로 날짜 범위 제한
+          (datetype: 'pdat' 발행일, 'edat' PubMed 등록일)
+        - sort: 'date'는 발행일 최신순, None은 PubMed 기본 정렬 (relevance)
+        - limit: 검색 결과 중 앞에서부터 최대로 읽을 개수 (max_results와 limit이 모두 None이면 전체)
+        - prefetch: 미리 받아 둘 efetch 요청 수 (1이면 다음 페이지가 필요할 때만 요청)
+        """
+        # 중복 확인 함수가 없으면 모든 논문을 새 논문으로 취급
+        if is_known is None:
+            is_known = lambda url: False
+        if limit is None and max_results is not None:
+            limit = max(1, max_results) * MAX_OVERFETCH_FACTOR
+        
+        count, webenv, query_key = await self._esearch_history(query, priority, mindate, maxdate, reldate, datetype, sort)
+        if not count:
+            logger.warning(f"No results found in PubMed for query: {query}")
+            return
+        
+        end = min(count, limit or count)
+        pages = [
+            {'WebEnv': webenv, 'query_key': query_key, 'retstart': retstart, 'retmax': min(batch_size, end - retstart)}
+            for retstart in range(0, end, batch_size)
+        ]
+        
+        total_count = 0
+        new_count = 0
+        async with aclosing(self._iter_efetch(pages, priority, prefetch)) as papers:
+            async for paper in papers:
+                total_count += 1
+                if is_known(paper['url']):
+                    logger.info(f"Skipping existing PubMed paper: {paper['title']}")
+                    continue
+                
+                logger.info(f"New PubMed paper found: {paper['title']}")
+                yield paper
+                new_count += 1
+                
+                # 원하는 개수만큼 새로운 논문을 찾으면 중단 (미리 받던 다음 페이지도 취소)
+                if max_results is not None and new_count >= max_results:
+                    break
+        
+        logger.info(f"Read {total_count} of {count} PubMed results, {new_count} new for query: {query}")
+    
+    async def _esearch_history(self, query: str, priority: int, mindate: Optional[str] = None,
+                               maxdate: Optional[str] = None, reldate: Optional[int] = None,
+                               datetype: str = 'pdat', sort: Optional[str] = 'date'):
+        """esearch 결과를 히스토리 서버에 저장하고 (전체 개수, WebEnv, query_key) 반환"""
+        search_params = {
+            'db': 'pubmed',
+            'term': query,
+            'usehistory': 'y',
+            'retmax': 0,
+            'retmode': 'xml',
+        }
+        if sort:
+            search_params['sort'] = sort
+        if mindate or maxdate or reldate:
+            search_params['datetype'] = datetype
+            for key, value in (('mindate', mindate), ('maxdate', maxdate), ('reldate', reldate)):
+                if value:
+                    search_params[key] = value
+        
+        response = await self._get(self.search_url, search_params, priority)
+        
+        # XML 파싱
+        root = ET.fromstring(response.content)
+        error = root.findtext('ERROR')
+        if error:
+            raise ValueError(f"PubMed esearch error: {error}")
+        
+        return int(root.findtext('Count') or 0), root.findtext('WebEnv'), root.findtext('QueryKey')
+    
+    async def _fetch_paper_details(self, pmids: List[str], priority: int = PRIORITY_INTERACTIVE) -> List[Dict[str, Any]]:
+        """PMID 목록으로 상세 정보 가져오기 (iter_paper_details 결과를 목록으로)"""
+        papers = []
+        async with aclosing(self.iter_paper_details(pmids, priority)) as details:
+            async for paper in details:
+                papers.append(paper)
+        return papers
+    
+    async def iter_paper_details(self, pmids: List[str], priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        PMID 목록의 상세 정보를 한 건씩 반환하는 비동기 제너레이터
+        - EFETCH_CHUNK_SIZE개씩 나눠 요청 한도 안에서 동시에 efetch
+        - 응답은 받는 대로 파싱하므로 PubmedArticle 하나가 끝나면 바로 반환 (입력 PMID 순서 유지)
+        - 중간에 멈추면 남은 요청은 취소
+        """
+        chunks = [
+            {'id': ','.join(pmids[start:start + EFETCH_CHUNK_SIZE])}
+            for start in range(0, len(pmids), EFETCH_CHUNK_SIZE)
+        ]
+        async with aclosing(self._iter_efetch(chunks, priority)) as papers:
+            async for paper in papers:
+                yield paper
     
-    async def _fetch_paper_details(self, pmids: List[str]) -> List[Dict[str, Any]]:
-        """PMID 목록으로 상세 정보 가져오기"""
+    async def _iter_efetch(self, requests: List[Dict[str, Any]], priority: int,
+                           prefetch: int = EFETCH_PREFETCH) -> AsyncIterator[Dict[str, Any]]:
+        """
+        efetch 요청 목록을 순서대로 반환
+        - 최대 prefetch개 요청을 미리 동시에 받아 두고, 하나를 다 읽으면 다음 요청 시작
+        - 중간에 멈추면 받던 요청은 취소
+        """
+        queues: Dict[int, asyncio.Queue] = {}
+        tasks = []
+        
+        async def pump(params: Dict[str, Any], queue: asyncio.Queue):
+            try:
+                async for paper in self._stream_efetch(params, priority):
+                    queue.put_nowait(paper)
+                queue.put_nowait(None)
+            except Exception as e:
+                queue.put_nowait(e)
+        
+        def start(index: int):
+            if index < len(requests):
+                queues[index] = asyncio.Queue()
+                tasks.append(asyncio.create_task(pump(requests[index], queues[index])))
+        
+        for index in range(max(1, prefetch)):
+            start(index)
         try:
-            # 여러 PMID를 쉼표로 구분
-            pmid_string = ','.join(pmids)
-            
-            # 상세 정보 요청
-            fetch_params = {
-                'db': 'pubmed',
-                'id': pmid_string,
-                'retmode': 'xml',
-                'rettype': 'abstract'
-            }
-            
-            response = requests.get(self.fetch_url, params=fetch_params)
+            for index in range(len(requests)):
+                queue = queues.pop(index)
+                while (item := await queue.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+                start(index + max(1, prefetch))
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _stream_efetch(self, params: Dict[str, Any], priority: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        efetch 한 번 (PMID 목록 또는 WebEnv/query_key 페이지, URL 길이 제한이 없도록 POST 본문으로 전송)
+        - XMLPullParser로 받은 부분까지 바로 파싱하고, 처리한 PubmedArticle은 트리에서 제거
+        """
+        fetch_params = self._with_credentials(dict(params, db='pubmed', retmode='xml', rettype='abstract'))
+        
+        # 응답을 읽는 도중에는 재시도할 수 없으므로 차단 여부만 먼저 확인
+        check_circuit(self.fetch_url)
+        await self.scheduler.acquire(priority)
+        async with (self._client or get_http_client()).stream('POST', self.fetch_url, data=fetch_params) as response:
             response.raise_for_status()
             
-            # XML 파싱
-            root = ET.fromstring(response.content)
-            papers = []
-            
-            for article in root.findall('.//PubmedArticle'):
-                try:
-                    paper = self._parse_article(article)
-                    if paper:
-                        papers.append(paper)
-                except Exception as e:
-                    logger.error(f"Error parsing article: {e}")
-                    continue
-            
-            return papers
-            
-        except Exception as e:
-            logger.error(f"Error fetching paper details: {e}")
-            return []
+            parser = ET.XMLPullParser(events=('start', 'end'))
+            root = None
+            async for data in response.aiter_bytes():
+                parser.feed(data)
+                for event, elem in parser.read_events():
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                    elif elem.tag == 'PubmedArticle':
+                        paper = self._parse_article(elem)
+                        if paper:
+                            yield paper
+                        elem.clear()
+                        if elem in root:
+                            root.remove(elem)
+            parser.close()
     
-    def _parse_article(self, article_elem) -> Dict[str, Any]:
+    def _parse_article(self, article_elem) -> Optional[PaperRecord]:
         """개별 논문 파싱"""
         try:
             # 기본 정보 추출
@@ -141,15 +356,13 @@ class PubMedCollector:
             pmid_elem = medline_citation.find('PMID')
             pmid = pmid_elem.text if pmid_elem is not None else ""
             
-            # DOI 추출 (ArticleIdList에서)
+            # DOI 추출 (PubmedData의 ArticleIdList, 없으면 Article의 ELocationID)
             doi = None
-            article_id_list = medline_citation.find('.//ArticleIdList')
-            if article_id_list is not None:
-                for article_id in article_id_list.findall('ArticleId'):
-                    id_type = article_id.get('IdType')
-                    if id_type == 'doi':
-                        doi = article_id.text
-                        break
+            for doi_elem in (article_elem.find('PubmedData/ArticleIdList/ArticleId[@IdType="doi"]'),
+                             medline_citation.find('Article/ELocationID[@EIdType="doi"]')):
+                if doi_elem is not None and doi_elem.text and doi_elem.text.strip():
+                    doi = doi_elem.text.strip()
+                    break
             
             # 발행일
             pub_date_elem = medline_citation.find('.//PubDate')
@@ -178,18 +391,18 @@ class PubMedCollector:
             if doi:
                 doi_url = f"https://doi.org/{doi}"
             
-            return {
-                'title': title,
-                'authors': authors,
-                'abstract': abstract,
-                'url': url,
-                'pdf_url': doi_url,  # DOI URL을 PDF URL로 사용
-                'doi': doi,  # DOI 정보 추가
-                'published_date': published_date,
-                'keywords': keywords,
-                'source': 'pubmed'
-            }
-            
+            return PaperRecord(
+                title=title,
+                authors=authors,
+                abstract=abstract,
+                url=url,
+                pdf_url=doi_url,  # DOI URL을 PDF URL로 사용
+                doi=doi,  # DOI 정보 추가
+                published_date=published_date,
+                keywords=keywords,
+                source='pubmed',
+            )
+        
         except Exception as e:
             logger.error(f"Error parsing article element: {e}")
             return None
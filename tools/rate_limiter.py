@@ -0,0 +1,132 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0   # 사용자가 기다리는 검색
+PRIORITY_BULK = 10         # 자동 수집 등 대량 작업
+PRIORITIES = {'interactive': PRIORITY_INTERACTIVE, 'bulk': PRIORITY_BULK}
+
+# 외부 API 요청 간격을 지키는 우선순위 토큰 버킷
+class PriorityRateLimiter:
+    def __init__(self, name: str, rate: float, burst: int = 1):
+        """
+        - rate: 초당 허용 요청 수, burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+        - 토큰이 없으면 우선순위 큐에서 기다렸다가 우선순위 -> 도착 순서대로 진행
+        - 요청이 실패하지 않고 허용 한도까지 줄을 서서 처리됨
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []  # (priority, 순번, future, 대기 시작 시각)
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # 대기 시간 지표
+        self._granted: Dict[int, int] = {}
+        self._total_wait: Dict[int, float] = {}
+        self._max_wait: Dict[int, float] = {}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _record(self, priority: int, waited: float):
+        self._granted[priority] = self._granted.get(priority, 0) + 1
+        self._total_wait[priority] = self._total_wait.get(priority, 0.0) + waited
+        self._max_wait[priority] = max(self._max_wait.get(priority, 0.0), waited)
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE):
+        """요청 하나를 보낼 수 있을 때까지 대기"""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._record(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future, time.monotonic()))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 이미 토큰을 받은 뒤 취소되었으면 다음 대기자에게 넘김
+            if future.done() and not future.cancelled():
+                self._tokens += 1
+                self._dispatch()
+            raise
+
+    def _schedule(self):
+        """다음 토큰이 생기는 시각에 대기자 처리 예약"""
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        """쌓인 토큰만큼 우선순위가 높은 대기자부터 진행시킴"""
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            priority, _, future, enqueued = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # 대기 중 취소된 요청
+            self._tokens -= 1
+            self._record(priority, time.monotonic() - enqueued)
+            future.set_result(None)
+
+        # 취소된 대기자만 남았으면 정리
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule()
+
+    def metrics(self) -> Dict[str, Any]:
+        """큐 길이와 우선순위별 대기 시간 지표"""
+        self._refill()
+        names = {value: key for key, value in PRIORITIES.items()}
+        waiting: Dict[str, int] = {}
+        for priority, _, future, _ in self._waiters:
+            if not future.done():
+                label = names.get(priority, str(priority))
+                waiting[label] = waiting.get(label, 0) + 1
+
+        by_priority = {}
+        for priority, granted in self._granted.items():
+            by_priority[names.get(priority, str(priority))] = {
+                'granted': granted,
+                'avg_wait_ms': round(self._total_wait[priority] / granted * 1000, 1),
+                'max_wait_ms': round(self._max_wait[priority] * 1000, 1),
+            }
+
+        return {
+            'rate_per_second': self.rate,
+            'burst': self.burst,
+            'tokens': round(self._tokens, 3),
+            'queue_depth': sum(waiting.values()),
+            'queue_depth_by_priority': waiting,
+            'by_priority': by_priority,
+        }
+
+
+# 프로세스 전체에서 공유하는 외부 API별 제한기
+_limiters: Dict[str, PriorityRateLimiter] = {}
+
+def get_rate_limiter(name: str, rate: float, burst: int = 1) -> PriorityRateLimiter:
+    """이름별 공유 제한기 반환 (처음 요청할 때 생성, 이후에는 같은 인스턴스)"""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = _limiters[name] = PriorityRateLimiter(name, rate, burst)
+        logger.info(f"Rate limiter '{name}': {rate:.3f} req/s, burst {burst}")
+    return limiter
+
+def rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """모든 공유 제한기의 지표"""
+    return {name: limiter.metrics() for name, limiter in _limiters.items()}
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 외부 API 장애 대응 기본 설정 (config/settings.json의 resilience 항목)
+DEFAULT_RESILIENCE_SETTINGS = {
+    'breaker_failure_threshold': 5,     # 연속 실패가 이만큼이면 호스트 차단
+    'breaker_reset_seconds': 30.0,      # 차단 후 이 시간이 지나면 요청 하나로 회복 확인
+    'retry_budget_ratio': 0.2,          # 요청 1건당 쌓이는 재시도 토큰 (전체 요청의 20%까지 재시도)
+    'retry_budget_min_per_second': 0.5, # 요청이 적을 때도 허용하는 초당 재시도 수
+    'retry_budget_max_tokens': 10,
+    'retry_backoff_base_seconds': 0.5,  # 재시도 대기: 0 ~ min(max, base * 2^시도) 사이 임의 값
+    'retry_backoff_max_seconds': 10.0,
+}
+MAX_RETRY_AFTER_SECONDS = 300  # 서버가 요구한 Retry-After도 이 이상은 기다리지 않음
+
+_settings: Dict[str, Any] = dict(DEFAULT_RESILIENCE_SETTINGS)
+
+T = TypeVar('T')
+
+def configure_resilience(**settings):
+    """차단기/재시도 설정 변경 (이미 만들어진 호스트 차단기와 재시도 예산에는 적용되지 않으므로 서버 시작 시 한 번 호출)"""
+    unknown = set(settings) - set(DEFAULT_RESILIENCE_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown resilience settings: {', '.join(sorted(unknown))}")
+    _settings.update((key, value) for key, value in settings.items() if value is not None)
+
+class CircuitOpenError(Exception):
+    """차단된 호스트로 요청하려 할 때 (기다리지 않고 바로 실패)"""
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Upstream {host} is unavailable (circuit open, retry in {retry_after:.0f}s)")
+        self.host = host
+        self.retry_after = retry_after
+
+# 호스트별 차단기
+class CircuitBreaker:
+    def __init__(self, host: str, failure_threshold: int, reset_seconds: float):
+        """
+        - closed: 정상, 연속 실패가 failure_threshold번이면 open
+        - open: reset_seconds 동안 요청을 보내지 않고 CircuitOpenError
+        - half_open: 요청 하나만 보내 보고 성공하면 closed, 실패하면 다시 open
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = 'closed'
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        
+        # 상태 지표
+        self._successes = 0
+        self._failures = 0
+        self._rejected = 0
+        self._opened = 0
+        self._last_error: Optional[str] = None
+    
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+    
+    def check(self):
+        """차단 중이면 CircuitOpenError (회복 확인 요청 자리는 차지하지 않음, 스케줄러에서 기다리기 전에 확인)"""
+        if self.state == 'open' and self._retry_after() > 0:
+            self._rejected += 1
+            raise CircuitOpenError(self.host, self._retry_after())
+    
+    def before_request(self):
+        """요청을 보내기 직전 호출, 보낼 수 없으면 CircuitOpenError"""
+        if self.state == 'open':
+            retry_after = self._retry_after()
+            if retry_after > 0:
+                self._rejected += 1
+                raise CircuitOpenError(self.host, retry_after)
+            self.state = 'half_open'
+            logger.info(f"Circuit half-open for {self.host}, sending probe request")
+        if self.state == 'half_open':
+            if self._probe_in_flight:
+                self._rejected += 1
+                raise CircuitOpenError(self.host, 1.0)
+            self._probe_in_flight = True
+    
+    def record_success(self):
+        self._successes += 1
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != 'closed':
+            logger.info(f"Circuit closed for {self.host}")
+            self.state = 'closed'
+    
+    def record_failure(self, error: str):
+        self._failures += 1
+        self._consecutive_failures += 1
+        self._last_error = error
+        self._probe_in_flight = False
+        if self.state == 'half_open' or self._consecutive_failures >= self.failure_threshold:
+            if self.state != 'open':
+                self._opened += 1
+                logger.warning(f"Circuit opened for {self.host} after {self._consecutive_failures} failures: {error}")
+            self.state = 'open'
+            self._opened_at = time.monotonic()
+    
+    def release(self):
+        """결과 없이 끝난 요청 (취소 등), 회복 확인 자리만 돌려줌"""
+        self._probe_in_flight = False
+    
+    def metrics(self) -> Dict[str, Any]:
+        """상태와 누적 횟수"""
+        return {
+            'state': self.state,
+            'consecutive_failures': self._consecutive_failures,
+            'retry_in_seconds': round(self._retry_after(), 1) if self.state == 'open' else 0.0,
+            'successes': self._successes,
+            'failures': self._failures,
+            'rejected': self._rejected,
+            'opened': self._opened,
+            'last_error': self._last_error,
+        }
+
+# 재시도 예산: 장애 때 모든 호출자가 재시도를 쌓아 부하를 몇 배로 만드는 것을 막음
+class RetryBudget:
+    def __init__(self, ratio: float, min_per_second: float, max_tokens: float):
+        """
+        - 요청 1건마다 ratio만큼, 시간이 지나면 초당 min_per_second만큼 토큰이 쌓임 (최대 max_tokens)
+        - 재시도 1번에 토큰 1개, 토큰이 없으면 재시도하지 않고 바로 실패
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._updated = time.monotonic()
+        self._requests = 0
+        self._retries = 0
+        self._exhausted = 0
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+    
+    def record_request(self):
+        self._requests += 1
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+    
+    def try_spend(self) -> bool:
+        """재시도 하나를 허용하면 True"""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self._retries += 1
+            return True
+        self._exhausted += 1
+        return False
+    
+    def metrics(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            'tokens': round(self._tokens, 2),
+            'ratio': self.ratio,
+            'requests': self._requests,
+            'retries': self._retries,
+            'exhausted': self._exhausted,
+        }
+
+
+# 프로세스 전체에서 공유하는 호스트별 차단기와 재시도 예산
+_breakers: Dict[str, CircuitBreaker] = {}
+_retry_budget: Optional[RetryBudget] = None
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """호스트별 공유 차단기 (처음 요청할 때 생성)"""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(
+            host, _settings['breaker_failure_threshold'], _settings['breaker_reset_seconds']
+        )
+    return breaker
+
+def get_retry_budget() -> RetryBudget:
+    global _retry_budget
+    if _retry_budget is None:
+        _retry_budget = RetryBudget(
+            _settings['retry_budget_ratio'], _settings['retry_budget_min_per_second'], _settings['retry_budget_max_tokens']
+        )
+    return _retry_budget
+
+def check_circuit(url: str):
+    """URL의 호스트가 차단 중이면 CircuitOpenError (요청 스케줄러에서 차례를 기다리기 전에 호출)"""
+    breaker = _breakers.get(httpx.URL(url).host)
+    if breaker is not None:
+        breaker.check()
+
+def upstream_health() -> Dict[str, Any]:
+    """호스트별 차단기 상태와 재시도 예산"""
+    return {
+        'breakers': {host: breaker.metrics() for host, breaker in _breakers.items()},
+        'retry_budget': get_retry_budget().metrics(),
+    }
+
+def is_retryable_status(status_code: int) -> bool:
+    """일시적인 실패로 보고 재시도하는 응답 (5xx, 429)"""
+    return status_code >= 500 or status_code == 429
+
+def retry_delay(attempt: int, retry_after: float = 0) -> float:
+    """
+    재시도 전 대기 시간
+    - 서버가 Retry-After를 주면 그만큼 (최대 MAX_RETRY_AFTER_SECONDS)
+    - 아니면 지수 백오프에 full jitter (여러 호출자가 같은 순간에 몰리지 않도록)
+    """
+    if retry_after:
+        return min(retry_after, MAX_RETRY_AFTER_SECONDS)
+    cap = min(_settings['retry_backoff_max_seconds'], _settings['retry_backoff_base_seconds'] * 2 ** attempt)
+    return random.uniform(0, cap)
+
+async def send_with_retries(send: Callable[[], Awaitable[T]], url: str, num_retries: int, name: str) -> T:
+    """
+    요청 하나를 재시도와 함께 실행 (send: 스케줄러 대기 + 요청 + raise_for_status)
+    - 호스트가 차단 중이면 스케줄러에서 기다리지 않고 바로 CircuitOpenError
+    - 네트워크 오류와 5xx/429는 num_retries번까지, 공유 재시도 예산이 남아 있을 때만 재시도
+    """
+    last_error: Optional[Exception] = None
+    for attempt in range(1 + num_retries):
+        check_circuit(url)
+        
+        retry_after = 0
+        try:
+            return await send()
+        except httpx.HTTPStatusError as e:
+            if not is_retryable_status(e.response.status_code):
+                raise
+            last_error = e
+            header = e.response.headers.get('Retry-After', '')
+            if header.isdigit():
+                retry_after = int(header)
+        except httpx.TransportError as e:
+            last_error = e
+        logger.warning(f"{name} request failed (attempt {attempt + 1}/{1 + num_retries}): {last_error}")
+        
+        if attempt == num_retries:
+            break
+        if not get_retry_budget().try_spend():
+            logger.warning(f"{name} retry skipped: retry budget exhausted")
+            break
+        await asyncio.sleep(retry_delay(attempt, retry_after))
+    
+    raise last_error
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """
+    모든 외부 요청에 호스트별 차단기 적용 (공용 HTTP 클라이언트의 가장 바깥 전송 계층)
+    - 네트워크 오류와 5xx는 실패, 그 밖의 응답은 성공으로 기록
+    - 429와 Retry-After가 있는 503은 흐름 제어이므로 기록하지 않음
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get_circuit_breaker(request.url.host)
+        breaker.before_request()
+        get_retry_budget().record_request()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        
+        if response.status_code == 429 or (response.status_code == 503 and 'retry-after' in response.headers):
+            breaker.release()  # 살아 있는 서버의 흐름 제어 (Retry-After만큼 기다렸다가 재시도)
+        elif response.status_code >= 500:
+            breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            breaker.record_success()
+        return response
+    
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 외부 API 요청/응답 기록과 재생
+# - 기록: RecordingTransport가 실제 요청의 응답을 fixtures_dir에 저장
+# - 재생: ReplayTransport(프로세스 안) 또는 server/fake_upstream.py(로컬 HTTP 서버)가 저장된 응답 반환
+# - 가짜 서버로 보내기: UpstreamRedirectTransport가 https://host/path를 {base_url}/host/path로 바꿈
+
+# 키 계산과 저장에서 제외하는 인증 파라미터 (fixture에 API 키가 남지 않도록)
+SCRUBBED_PARAMS = frozenset({'api_key', 'email', 'tool'})
+
+# 응답에서 저장하는 헤더 (나머지는 재생할 때 다시 계산됨)
+RECORDED_HEADERS = ('content-type', 'location', 'retry-after')
+
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+
+def _scrub_pairs(pairs) -> List[Tuple[str, str]]:
+    return sorted((key, value) for key, value in pairs if key not in SCRUBBED_PARAMS)
+
+def request_key(method: str, url: httpx.URL, body: bytes = b'', content_type: str = '') -> Tuple[str, str, bytes]:
+    """
+    요청 하나의 fixture 키 계산, (키, 정리된 대상 'host/path?query', 정리된 본문) 반환
+    - scheme은 무시 (가짜 서버는 http로 받음), 쿼리와 form 본문은 정렬하고 인증 파라미터 제거
+    """
+    query = urlencode(_scrub_pairs(url.params.multi_items()))
+    target = f"{url.host}{url.path}" + (f"?{query}" if query else '')
+    if body and content_type.startswith(FORM_CONTENT_TYPE):
+        body = urlencode(_scrub_pairs(parse_qsl(body.decode('utf-8'), keep_blank_values=True))).encode('utf-8')
+    digest = hashlib.sha1(f"{method.upper()} {target}\n".encode('utf-8') + body).hexdigest()[:24]
+    return digest, target, body
+
+class FixtureStore:
+    """
+    기록된 요청/응답 저장소
+    - {directory}/{host}/{key}.json (요청 정보, 상태 코드, 헤더) + {key}.body (응답 본문)
+    - match='path': 정확히 같은 요청이 없으면 같은 method/host/path의 기록을 돌아가며 사용
+      (쿼리만 다른 요청으로 처리량을 측정할 때)
+    """
+    def __init__(self, directory: str, match: str = 'exact'):
+        if match not in ('exact', 'path'):
+            raise ValueError(f"Unknown fixture match mode: {match}")
+        self.directory = Path(directory)
+        self.match = match
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._by_path: Dict[Tuple[str, str], List[str]] = {}
+        self._cursor: Dict[Tuple[str, str], int] = {}
+    
+    @staticmethod
+    def _path_key(method: str, target: str) -> Tuple[str, str]:
+        return method.upper(), target.split('?', 1)[0]
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """디렉터리의 fixture 목록을 처음 한 번 읽음"""
+        if self._index is None:
+            index = {}
+            for meta_path in sorted(self.directory.glob('*/*.json')):
+                try:
+                    with open(meta_path, 'r', encoding='utf-8') as f:
+                        meta = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable fixture {meta_path}: {e}")
+                    continue
+                meta['body_path'] = str(meta_path.with_suffix('.body'))
+                index[meta_path.stem] = meta
+                self._by_path.setdefault(self._path_key(meta['method'], meta['target']), []).append(meta_path.stem)
+            self._index = index
+            logger.info(f"Loaded {len(index)} upstream fixtures from {self.directory}")
+        return self._index
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+    
+    def save(self, request: httpx.Request, body: bytes, status_code: int, headers: httpx.Headers, content: bytes):
+        """요청 하나의 응답 저장 (같은 요청은 덮어씀)"""
+        key, target, scrubbed_body = request_key(request.method, request.url, body, request.headers.get('content-type', ''))
+        host_dir = self.directory / request.url.host
+        host_dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            'method': request.method,
+            'target': target,
+            'request_body': scrubbed_body.decode('utf-8', errors='replace'),
+            'status_code': status_code,
+            'headers': {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            (host_dir / f"{key}.body").write_bytes(content)
+            with open(host_dir / f"{key}.json", 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            if self._index is not None:
+                meta['body_path'] = str(host_dir / f"{key}.body")
+                if key not in self._index:
+                    self._by_path.setdefault(self._path_key(request.method, target), []).append(key)
+                self._index[key] = meta
+    
+    def lookup(self, method: str, url: httpx.URL, body: bytes = b'', content_type: str = '') -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """기록된 (상태 코드, 헤더, 본문) 반환, 없으면 None"""
+        key, target, _ = request_key(method, url, body, content_type)
+        with self._lock:
+            index = self._load_index()
+            meta = index.get(key)
+            if meta is None and self.match == 'path':
+                path_key = self._path_key(method, target)
+                candidates = self._by_path.get(path_key)
+                if candidates:
+                    cursor = self._cursor.get(path_key, 0)
+                    meta = index[candidates[cursor % len(candidates)]]
+                    self._cursor[path_key] = cursor + 1
+        if meta is None:
+            return None
+        return meta['status_code'], meta['headers'], Path(meta['body_path']).read_bytes()
+
+def missing_fixture_response(request: httpx.Request) -> httpx.Response:
+    """기록이 없는 요청의 응답 (404, 어떤 요청이 빠졌는지 본문에 표시)"""
+    return httpx.Response(
+        404, headers={'content-type': 'text/plain', 'x-fixture-missing': '1'},
+        content=f"No recorded fixture for {request.method} {request.url}".encode('utf-8'), request=request,
+    )
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """실제 전송 계층으로 요청을 보내고 응답을 FixtureStore에 기록 (응답은 전부 읽은 뒤 반환)"""
+    def __init__(self, transport: httpx.AsyncBaseTransport, store: FixtureStore):
+        self.transport = transport
+        self.store = store
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        # 일시적인 실패(5xx, 429)는 기록하지 않음 (이미 기록된 정상 응답을 덮어쓰지 않도록)
+        if response.status_code < 500 and response.status_code != 429:
+            self.store.save(request, body, response.status_code, response.headers, content)
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+    
+    async def aclose(self):
+        await self.transport.aclose()
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """네트워크 없이 FixtureStore의 응답 반환 (기록이 없으면 404)"""
+    def __init__(self, store: FixtureStore):
+        self.store = store
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        recorded = self.store.lookup(request.method, request.url, body, request.headers.get('content-type', ''))
+        if recorded is None:
+            logger.warning(f"No recorded fixture for {request.method} {request.url}")
+            return missing_fixture_response(request)
+        status_code, headers, content = recorded
+        return httpx.Response(status_code, headers=headers, content=content, request=request)
+
+class UpstreamRedirectTransport(httpx.AsyncBaseTransport):
+    """모든 요청을 가짜 서버로 보냄: https://host/path?query → {base_url}/host/path?query"""
+    def __init__(self, transport: httpx.AsyncBaseTransport, base_url: str):
+        self.transport = transport
+        self.base_url = httpx.URL(base_url.rstrip('/'))
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = self.base_url.copy_with(
+            path=f"{self.base_url.path.rstrip('/')}/{request.url.host}{request.url.path}",
+            query=request.url.query or None,
+        )
+        headers = request.headers.copy()
+        headers['host'] = url.netloc.decode('ascii')
+        # 클라이언트는 원래 요청을 응답에 연결하므로 리다이렉트와 오류 메시지는 원래 URL 기준
+        redirected = httpx.Request(request.method, url, headers=headers, stream=request.stream,
+                                   extensions=request.extensions)
+        return await self.transport.handle_async_request(redirected)
+    
+    async def aclose(self):
+        await self.transport.aclose()